@@ -12,7 +12,7 @@ except ImportError:
 
 from pypet.environment import Environment, MultiprocContext
 from pypet.trajectory import Trajectory, load_trajectory
-from pypet.storageservice import HDF5StorageService, LazyStorageService
+from pypet.storageservice import HDF5StorageService, LazyStorageService, LazyArray
 from pypet.naturalnaming import ParameterGroup, DerivedParameterGroup, ConfigGroup,\
     ResultGroup, NNGroupNode, NNLeafNode, KnowsTrajectory
 from pypet.parameter import Parameter, ArrayParameter, SparseParameter,\
@@ -39,6 +39,7 @@ __all__ = [
     MultiprocContext.__name__,
     HDF5StorageService.__name__,
     LazyStorageService.__name__,
+    LazyArray.__name__,
     ParameterGroup.__name__,
     DerivedParameterGroup.__name__,
     ConfigGroup.__name__,
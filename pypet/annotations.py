@@ -190,7 +190,8 @@ class WithAnnotations(HasLogger):
     __slots__ = ('_annotations',)
 
     def __init__(self):
-        self._annotations = Annotations()  # The annotation object to handle annotations
+        # The annotation object to handle annotations, created on first access
+        self._annotations = None
 
     @property
     def v_annotations(self):
@@ -203,15 +204,21 @@ class WithAnnotations(HasLogger):
         .. _attributes: http://pytables.github.io/usersguide/libref/declarative_classes.html#the-attributeset-class
 
         """
+        if self._annotations is None:
+            self._annotations = Annotations()
         return self._annotations
 
+    def _has_annotations(self):
+        """Checks if there are annotations without creating the annotation object"""
+        return self._annotations is not None and not self._annotations.f_is_empty()
+
     def f_set_annotations(self, *args, **kwargs):
         """Sets annotations
 
         Equivalent to calling `v_annotations.f_set(*args,**kwargs)`
 
         """
-        self._annotations.f_set(*args, **kwargs)
+        self.v_annotations.f_set(*args, **kwargs)
 
     def f_get_annotations(self, *args):
         """Returns annotations
@@ -219,7 +226,7 @@ class WithAnnotations(HasLogger):
         Equivalent to `v_annotations.f_get(*args)`
 
         """
-        return self._annotations.f_get(*args)
+        return self.v_annotations.f_get(*args)
 
     def f_ann_to_str(self):
         """Returns annotations as string
@@ -227,4 +234,4 @@ class WithAnnotations(HasLogger):
         Equivalent to `v_annotations.f_ann_to_str()`
 
         """
-        return self._annotations.f_ann_to_str()
+        return self.v_annotations.f_ann_to_str()
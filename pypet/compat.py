@@ -48,6 +48,10 @@ if python_major == 2:
     xrange = xrange
     # Returns the iterator function range
 
+    _builtin_intern = intern
+    def intern(string): return _builtin_intern(string) if isinstance(string, str) else string
+    # Interns byte strings, unicode strings cannot be interned in python 2
+
 elif python_major == 3:
 
     int_types = (int,)
@@ -72,6 +76,8 @@ elif python_major == 3:
 
     xrange = range
 
+    intern = sys.intern
+
 else:
 
     raise RuntimeError('You shall not pass!')
\ No newline at end of file
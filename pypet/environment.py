@@ -29,6 +29,8 @@ import hashlib
 import time
 import datetime
 import inspect
+import pickle
+import tempfile
 
 try:
     from sumatra.projects import load_project
@@ -74,14 +76,17 @@ from pypet.utils.mpwrappers import QueueStorageServiceWriter, LockWrapper, \
     PipeStorageServiceSender, PipeStorageServiceWriter, ReferenceWrapper, \
     ReferenceStore, QueueStorageServiceSender, LockerServer, LockerClient, \
     ForkAwareLockerClient, TimeOutLockerServer, QueuingClient, QueuingServer, \
-    ForkAwareQueuingClient
+    ForkAwareQueuingClient, ThreadQueueStorageServiceSender
 from pypet.utils.siginthandling import sigint_handling
 from pypet.utils.gitintegration import make_git_commit
 from pypet._version import __version__ as VERSION
 from pypet.utils.decorators import deprecated, kwargs_api_change, prefix_naming
 from pypet.utils.helpful_functions import is_debug, result_sort, format_time, port_to_tcp, \
-    racedirs
+    racedirs, make_digest
 from pypet.utils.storagefactory import storage_factory
+from pypet.utils.helpful_classes import Journal
+from pypet.utils.runcache import make_run_cache, DirectoryRunCache
+from pypet.utils.explore import find_unique_points
 from pypet.utils.configparsing import parse_config
 from pypet.parameter import Parameter
 
@@ -135,25 +140,28 @@ def _process_single_run(kwargs):
     result_queue.close()
 
 
+def _delete_old_scoop_rev_data(old_scoop_rev):
+    """Deletes the shared SCOOP data of an old revolution"""
+    if old_scoop_rev is not None:
+        try:
+            elements = shared.elements
+            for key in elements:
+                var_dict = elements[key]
+                if old_scoop_rev in var_dict:
+                    del var_dict[old_scoop_rev]
+            logging.getLogger('pypet.scoop').debug('Deleted old SCOOP data from '
+                                                   'revolution `%s`.' % old_scoop_rev)
+        except AttributeError:
+            logging.getLogger('pypet.scoop').error('Could not delete old SCOOP data from '
+                                                   'revolution `%s`.' % old_scoop_rev)
+
+
 def _configure_frozen_scoop(kwargs):
     """Wrapper function that configures a frozen SCOOP set up.
 
     Deletes of data if necessary.
 
     """
-    def _delete_old_scoop_rev_data(old_scoop_rev):
-        if old_scoop_rev is not None:
-            try:
-                elements = shared.elements
-                for key in elements:
-                    var_dict = elements[key]
-                    if old_scoop_rev in var_dict:
-                        del var_dict[old_scoop_rev]
-                logging.getLogger('pypet.scoop').debug('Deleted old SCOOP data from '
-                                                       'revolution `%s`.' % old_scoop_rev)
-            except AttributeError:
-                logging.getLogger('pypet.scoop').error('Could not delete old SCOOP data from '
-                                                       'revolution `%s`.' % old_scoop_rev)
     scoop_rev = kwargs.pop('scoop_rev')
     # Check if we need to reconfigure SCOOP
     try:
@@ -188,6 +196,24 @@ def _frozen_scoop_single_run(kwargs):
         raise
 
 
+def _get_scoop_skeleton(skeleton_rev):
+    """Returns the skeleton of the trajectory shared by all SCOOP runs.
+
+    The skeleton is received only once per worker and revolution and is reused by
+    all runs executed by the worker.
+
+    """
+    try:
+        old_skeleton_rev = _scoop_single_run.skeleton_rev
+    except AttributeError:
+        old_skeleton_rev = None
+    if old_skeleton_rev != skeleton_rev:
+        _scoop_single_run.skeleton = shared.getConst(skeleton_rev, timeout=424.2)
+        _scoop_single_run.skeleton_rev = skeleton_rev
+        _delete_old_scoop_rev_data(old_skeleton_rev)
+    return _scoop_single_run.skeleton
+
+
 def _scoop_single_run(kwargs):
     """Wrapper function for scoop, that does not configure logging"""
     try:
@@ -198,6 +224,9 @@ def _scoop_single_run(kwargs):
             # in this case scoop uses default `map` function, i.e.
             # the main process
             is_origin = True
+        traj = _get_scoop_skeleton(kwargs.pop('skeleton_rev'))
+        traj._set_run_state(kwargs.pop('run_state'))
+        kwargs['traj'] = traj
         if not is_origin:
             # configure logging and niceness if not the main process:
             _configure_niceness(kwargs)
@@ -285,6 +314,12 @@ def _single_run(kwargs):
 
         result_queue: A queue object to store results into in case a pool is used, otherwise None
 
+        run_cache: The cache of runs or None
+
+        run_cache_key: Key of the current run in the cache, None if the run is not cached
+
+        cached_run: Data of the run found in the cache, None if the run has to be computed
+
     :return:
 
         Results computed by the user's job function which are not stored into the trajectory.
@@ -311,8 +346,17 @@ def _single_run(kwargs):
     # Measure start time
     traj.f_start_run(turn_into_run=True)
 
-    # Run the job function of the user
-    result = runfunc(traj, *runargs, **kwrunparams)
+    cached_run = kwargs.get('cached_run', None)
+    if cached_run is not None:
+        # The run was computed before, so we only add the cached data
+        result = _replay_cached_run(traj, cached_run)
+    else:
+        # Run the job function of the user
+        result = runfunc(traj, *runargs, **kwrunparams)
+        run_cache = kwargs.get('run_cache', None)
+        run_cache_key = kwargs.get('run_cache_key', None)
+        if run_cache is not None and run_cache_key is not None:
+            _cache_run(traj, run_cache, run_cache_key, result)
 
     # Store data if desired
     if automatic_storing:
@@ -339,6 +383,56 @@ def _single_run(kwargs):
     return result
 
 
+def _to_wildcard_name(traj, full_name):
+    """Replaces the names of the current run and run set in `full_name` by wildcards"""
+    replacements = {traj.v_crun: '$', traj.f_wildcard('$set'): '$set'}
+    return '.'.join(replacements.get(name, name) for name in full_name.split('.'))
+
+
+def _from_wildcard_name(traj, full_name):
+    """Replaces the run and run set wildcards in `full_name` by the names of the current run"""
+    replacements = {'$': traj.v_crun, '$set': traj.f_wildcard('$set')}
+    return '.'.join(replacements.get(name, name) for name in full_name.split('.'))
+
+
+def _cache_run(traj, run_cache, key, result):
+    """Adds the leaves and links created by the current run and its `result` to the cache"""
+    pypet_root_logger = logging.getLogger('pypet')
+    runtime = time.time() - traj.f_get_run_information(traj.v_idx, copy=False)['timestamp']
+    # All nodes added during the run are listed, not only the top-most ones
+    leaves = [node for _, node in compat.itervalues(traj._new_nodes) if node.v_is_leaf]
+    links = [(_to_wildcard_name(traj, parent_name + '.' + link),
+              _to_wildcard_name(traj, target.v_full_name))
+             for (parent_name, link), (_, target) in traj._new_links.items()]
+    if any(getattr(leaf, 'KNOWS_TRAJECTORY', False) for leaf in leaves):
+        pypet_root_logger.warning('Run `%s` is not cached because it contains items '
+                                  'that know the trajectory.' % traj.v_crun)
+        return
+    try:
+        data = pickle.dumps({'result': result,
+                             'leaves': [(_to_wildcard_name(traj, leaf.v_full_name), leaf)
+                                        for leaf in leaves],
+                             'links': links,
+                             'runtime': runtime}, protocol=2)
+    except Exception:
+        pypet_root_logger.exception('Run `%s` could not be pickled and is '
+                                    'not cached.' % traj.v_crun)
+        return
+    run_cache.put(key, data)
+
+
+def _replay_cached_run(traj, cached_run):
+    """Adds the leaves and links of a cached run to the trajectory and returns its result"""
+    for name, leaf in cached_run['leaves']:
+        leaf._rename(_from_wildcard_name(traj, name))
+        leaf._stored = False
+        traj.f_add_leaf(leaf)
+    for name, target in cached_run['links']:
+        target_node = traj.f_get(_from_wildcard_name(traj, target), shortcuts=False)
+        traj.f_add_link(_from_wildcard_name(traj, name), target_node)
+    return cached_run['result']
+
+
 def _wrap_handling(kwargs):
     """ Starts running a queue handler and creates a log file for the queue."""
     _configure_logging(kwargs, extract=False)
@@ -714,8 +808,9 @@ class Environment(HasLogger):
         you can resume your trajectory after the last single run that was still
         successfully stored via your storage service.
 
-        The environment will create several `.ecnt` and `.rcnt` files in a folder that you specify
-        (see below).
+        The environment will create an `environment.ecnt` file and a `results.jcnt` journal
+        in a folder that you specify (see below). The journal is a single append-only file to
+        which the results of all single runs are added one by one.
         Using this data you can resume crashed trajectories.
 
         In order to resume trajectories use :func:`~pypet.environment.Environment.resume`.
@@ -820,6 +915,49 @@ class Environment(HasLogger):
         immediately. Instead, active single runs will be finished and stored before
         shutdown. Hitting CTRL+C twice will raise a KeyboardInterrupt as usual.
 
+    :param async_storage:
+
+        If ``True`` and ``multiproc=False``, data is stored by a background thread.
+        Single runs hand references to the nodes and links they added over a queue
+        to the thread and the next run can start immediately.
+        Hence, do not modify data after storing it within a run.
+        Hence, simulating a run overlaps with compressing and writing the data
+        of the previous one. The size of the queue is bounded by ``queue_maxsize``.
+        If the queue is full, storing blocks until the thread caught up.
+        Loading data during single runs is not supported in this mode.
+
+    :param run_cache:
+
+        Path to a persistent cache of single runs shared among trajectories,
+        either a directory or an SQLite file (ending with `.db`, `.sqlite`, or `.sqlite3`).
+        Before a run is started, the cache is searched for a previous run with the very
+        same values of all parameters, explored or not, the same ``code_version``,
+        the same run function (identified by its module and name), and the same further
+        arguments passed to :func:`~pypet.environment.Environment.run`.
+        If any of these cannot be pickled, runs are not cached. If such a run is found, the results and derived parameters it added to the
+        trajectory as well as the returned result are added to the current run instead of
+        calling your run function. Otherwise, the run is computed and added to the cache.
+        Items that know the trajectory, like shared data, prevent caching.
+        Hits, misses, and the saved computation time are logged after all runs.
+        Cannot be combined with `run_map` or `pipeline_map`.
+
+    :param code_version:
+
+        Tag of the version of your code that is part of the keys of the ``run_cache``.
+        Change the tag whenever changes to your code alter the results of your runs.
+
+    :param deduplicate_runs:
+
+        If runs with identical values of the explored parameters should only be computed
+        once. This requires your run function to be deterministic.
+        One run of every unique parameter point is started first and all duplicates
+        afterwards. The duplicates are taken from the ``run_cache``, i.e. they
+        get copies of the results and derived parameters and the returned result
+        of their representative and are marked as completed.
+        If no ``run_cache`` is given, a temporary one is used.
+        In case of multiprocessing, a duplicate whose representative is still running
+        is computed again.
+
     :param lazy_debug:
 
         If ``lazy_debug=True`` and in case you debug your code (aka you use pydevd and
@@ -1050,6 +1188,10 @@ class Environment(HasLogger):
                  sumatra_label=None,
                  do_single_runs=True,
                  graceful_exit=False,
+                 async_storage=False,
+                 run_cache=None,
+                 code_version=None,
+                 deduplicate_runs=False,
                  lazy_debug=False,
                  **kwargs):
 
@@ -1072,6 +1214,10 @@ class Environment(HasLogger):
         if wrap_mode == pypetconstants.WRAP_MODE_NETLOCK and zmq is None:
             raise ValueError('You need to install `zmq` for `NETLOCK` wrapping.')
 
+        if async_storage and multiproc:
+            raise ValueError('Asynchronous storage is only supported without '
+                             'multiprocessing, please use `QUEUE` wrapping instead.')
+
         if (use_pool or use_scoop) and immediate_postproc:
             raise ValueError('You CANNOT perform immediate post-processing if you DO '
                              'use a pool or scoop.')
@@ -1287,6 +1433,7 @@ class Environment(HasLogger):
         self._resume_folder = resume_folder
         self._resume_path = resume_path
         self._delete_resume = delete_resume
+        self._result_journal = None
 
         # Check multiproc
         self._multiproc = multiproc
@@ -1309,6 +1456,12 @@ class Environment(HasLogger):
         self._freeze_input = freeze_input
         self._gc_interval = gc_interval
         self._multiproc_wrapper = None # The wrapper Service
+        self._async_storage = async_storage
+        self._run_cache = make_run_cache(run_cache) if run_cache is not None else None
+        self._run_cache_path = run_cache
+        self._code_version = code_version
+        self._run_cache_stats = None
+        self._deduplicate_runs = deduplicate_runs
 
         self._do_single_runs = do_single_runs
         self._automatic_storing = automatic_storing
@@ -1452,6 +1605,17 @@ class Environment(HasLogger):
                                         comment='Intervals with which ``gc.collect()`` '
                                                 'is called.').f_lock()
 
+            elif self._async_storage:
+                config_name = 'environment.%s.async_storage' % self.name
+                self._traj.f_add_config(Parameter, config_name, self._async_storage,
+                                        comment='Whether data of single runs is stored '
+                                                'by a background thread.').f_lock()
+
+                config_name = 'environment.%s.queue_maxsize' % self.name
+                self._traj.f_add_config(Parameter, config_name, self._queue_maxsize,
+                                        comment='Maximum size of the queue of the '
+                                                'storage thread').f_lock()
+
 
             config_name = 'environment.%s.clean_up_runs' % self._name
             self._traj.f_add_config(Parameter, config_name, self._clean_up_runs,
@@ -1472,6 +1636,22 @@ class Environment(HasLogger):
                                     comment='Whether or not to allow graceful handling '
                                             'of `SIGINT` (`CTRL+C`).').f_lock()
 
+            if self._run_cache is not None:
+                config_name = 'environment.%s.run_cache' % self._name
+                self._traj.f_add_config(Parameter, config_name, self._run_cache_path,
+                                        comment='Cache of single runs shared '
+                                                'among trajectories').f_lock()
+
+                config_name = 'environment.%s.code_version' % self._name
+                self._traj.f_add_config(Parameter, config_name, str(self._code_version),
+                                        comment='Code version tag of cached '
+                                                'runs').f_lock()
+
+            config_name = 'environment.%s.deduplicate_runs' % self._name
+            self._traj.f_add_config(Parameter, config_name, self._deduplicate_runs,
+                                    comment='Whether runs with identical parameter '
+                                            'values are only computed once').f_lock()
+
         config_name = 'environment.%s.trajectory.name' % self.name
         self._traj.f_add_config(Parameter, config_name, self.trajectory.v_name,
                                 comment='Name of trajectory').f_lock()
@@ -1983,9 +2163,15 @@ class Environment(HasLogger):
                           load_results=pypetconstants.LOAD_NOTHING,
                           load_other_data=pypetconstants.LOAD_NOTHING)
 
-        # Now we have to reconstruct previous results
-        result_list = []
-        full_filename_list = []
+        # Now we have to reconstruct previous results by streaming the journal once
+        new_result_list = []
+        for record in self._get_result_journal():
+            result_tuple = dill.loads(record)
+            run_information = result_tuple[1]
+            self._traj._update_run_information(run_information)
+            new_result_list.append(result_tuple[0])
+
+        # Results of older versions were stored in one file per run
         for filename in os.listdir(self._resume_path):
             _, ext = os.path.splitext(filename)
 
@@ -1994,14 +2180,9 @@ class Environment(HasLogger):
 
             full_filename = os.path.join(self._resume_path, filename)
             cnt_file = open(full_filename, 'rb')
-            result_list.append(dill.load(cnt_file))
+            result_tuple = dill.load(cnt_file)
             cnt_file.close()
-            full_filename_list.append(full_filename)
-
-        new_result_list = []
-        for result_tuple in result_list:
-            run_information = result_tuple[1]
-            self._traj._update_run_information(run_information)
+            self._traj._update_run_information(result_tuple[1])
             new_result_list.append(result_tuple[0])
         result_sort(new_result_list)
 
@@ -2116,7 +2297,8 @@ class Environment(HasLogger):
                        'automatic_storing': self._automatic_storing,
                        'wrap_mode': self._wrap_mode,
                        'niceness': self._niceness,
-                       'graceful_exit': self._graceful_exit}
+                       'graceful_exit': self._graceful_exit,
+                       'run_cache': self._run_cache}
         result_dict.update(kwargs)
         if self._multiproc:
             if self._use_pool or self._use_scoop:
@@ -2130,30 +2312,164 @@ class Environment(HasLogger):
                     if self._map_arguments:
                         del result_dict['runargs']
                         del result_dict['runkwargs']
-                else:
+                elif self._use_pool:
+                    # Every run receives its own copy of the trajectory,
+                    # whereas SCOOP workers reuse the skeleton and need to clean up
                     result_dict['clean_up_runs'] = False
-                    if self._use_pool:
-                        # Needs only be deleted in case of using a pool but necessary for scoop
-                        del result_dict['logging_manager']
-                        del result_dict['niceness']
+                    # Needs only be deleted in case of using a pool but necessary for scoop
+                    del result_dict['logging_manager']
+                    del result_dict['niceness']
             else:
                 result_dict['clean_up_runs'] = False
         return result_dict
 
-    def _make_index_iterator(self, start_run_idx):
-        """Returns an iterator over the run indices that are not completed"""
+    def _make_index_iterator(self, start_run_idx, kwargs=None):
+        """Returns an iterator over the run indices that are not completed
+
+        If a run cache is used, the cache is searched for every run before the index is
+        yielded and the key and cached data (or `None`) are put into the `kwargs`.
+
+        If runs are deduplicated, one run of every unique parameter point is yielded first
+        and all duplicates afterwards, such that the latter can be taken from the cache.
+
+        """
         total_runs = len(self._traj)
-        for n in compat.xrange(start_run_idx, total_runs):
-            self._current_idx = n + 1
+        point_keys = None  # None means all runs are keyed by the digests of their parameters
+        if self._deduplicate_runs:
+            run_indices, first_duplicate, point_runs = \
+                self._order_duplicate_runs(start_run_idx)
+            if self._run_cache_path is None:
+                # A temporary cache only needs to contain runs that have duplicates.
+                # These are keyed by the first run of their parameter point as found by
+                # `find_unique_points`, which stays the same if the trajectory is expanded.
+                point_keys = dict((idx, 'run_%d' % first_run) for idx, first_run in
+                                  compat.iteritems(point_runs))
+        else:
+            run_indices, first_duplicate = compat.xrange(start_run_idx, total_runs), total_runs
+        if self._run_cache is not None and point_keys is None:
+            # Values of parameters that are not explored are the same in all runs,
+            # so are the job function and its arguments. The postprocessing does not
+            # change the cached data of a run and is not considered.
+            try:
+                static_digests = dict((name, make_digest(param.f_get())) for name, param in
+                                      compat.iteritems(self._traj._parameters)
+                                      if name not in self._traj._explored_parameters)
+                static_digests['__runfunc__'] = self._make_runfunc_digest()
+                static_digests['__args__'] = make_digest(self._args)
+                static_digests['__kwargs__'] = make_digest(self._kwargs)
+            except TypeError as exc:
+                self._logger.warning('Runs cannot be cached: %s' % str(exc))
+                static_digests = None
+        for n in run_indices:
+            # Continuing from the current index must not skip deferred duplicates
+            self._current_idx = min(n + 1, first_duplicate)
             if self._stop_iteration:
                 self._logger.debug('I am stopping new run iterations now!')
                 break
             if not self._traj._is_completed(n):
                 self._traj.f_set_crun(n)
+                if self._run_cache is not None:
+                    if point_keys is None:
+                        key = self._make_run_cache_key(static_digests)
+                    else:
+                        key = point_keys.get(n, None)
+                    self._lookup_run_cache(key, kwargs)
                 yield n
             else:
                 self._logger.debug('Run `%d` has already been completed, I am skipping it.' % n)
 
+    def _order_duplicate_runs(self, start_run_idx):
+        """Orders the run indices starting from `start_run_idx` such that one run
+        of every unique parameter point comes first and all duplicates afterwards.
+
+        :return:
+
+            List of run indices, the smallest index of a duplicate, and a dictionary
+            mapping the indices of all runs that share their parameter point with other runs
+            to the first run (of the whole trajectory) with this point
+
+        """
+        total_runs = len(self._traj)
+        explored_parameters = [param for param in
+                               compat.itervalues(self._traj._explored_parameters)
+                               if param is not None]
+        if not explored_parameters:
+            return compat.xrange(start_run_idx, total_runs), total_runs, {}
+        unique_runs = []
+        duplicate_runs = []
+        point_runs = {}
+        for _, positions in find_unique_points(explored_parameters):
+            first_run = min(positions)
+            positions = [idx for idx in positions if idx >= start_run_idx]
+            unique_runs.extend(positions[:1])
+            duplicate_runs.extend(positions[1:])
+            if len(positions) > 1:
+                for idx in positions:
+                    point_runs[idx] = first_run
+        unique_runs.sort()
+        duplicate_runs.sort()
+        if duplicate_runs:
+            self._logger.info('%d runs are duplicates of other runs and will be '
+                              'taken from the run cache.' % len(duplicate_runs))
+            first_duplicate = duplicate_runs[0]
+        else:
+            first_duplicate = total_runs
+        return unique_runs + duplicate_runs, first_duplicate, point_runs
+
+    def _make_runfunc_digest(self):
+        """Returns a digest of the job function based on its module and qualified name.
+
+        Callables without a name, like partial functions, are digested via a pickle dump.
+
+        :raises: TypeError if the job function can neither be named nor pickled
+
+        """
+        module = getattr(self._runfunc, '__module__', None)
+        name = getattr(self._runfunc, '__qualname__', getattr(self._runfunc, '__name__', None))
+        if module is None or name is None:
+            return make_digest(self._runfunc)
+        return make_digest('%s.%s' % (module, name))
+
+    def _make_run_cache_key(self, static_digests):
+        """Returns the key of the current run in the run cache.
+
+        Returns `None` if the run cannot be cached because any parameter value cannot
+        be digested, i.e. if `static_digests` is `None` or an explored value
+        cannot be pickled.
+
+        """
+        if static_digests is None:
+            return None
+        digests = static_digests.copy()
+        try:
+            for name, param in compat.iteritems(self._traj._explored_parameters):
+                if param is not None:
+                    digests[name] = make_digest(param.f_get())
+        except TypeError as exc:
+            self._logger.warning('Run `%s` cannot be cached: %s' % (self._traj.v_crun, str(exc)))
+            return None
+        key_list = ['code_version=%r' % self._code_version]
+        key_list.extend('%s=%s' % (name, digests[name]) for name in sorted(digests))
+        return hashlib.sha1(compat.tobytes(';'.join(key_list))).hexdigest()
+
+    def _lookup_run_cache(self, key, kwargs):
+        """Searches the run cache for the run with `key` and puts the results into `kwargs`.
+
+        Runs with key `None` are neither looked up nor cached.
+
+        """
+        cached_run = None
+        if key is not None:
+            data = self._run_cache.get(key)
+            if data is None:
+                self._run_cache_stats['misses'] += 1
+            else:
+                cached_run = pickle.loads(data)
+                self._run_cache_stats['hits'] += 1
+                self._run_cache_stats['saved'] += cached_run['runtime']
+        kwargs['run_cache_key'] = key
+        kwargs['cached_run'] = cached_run
+
     def _make_iterator(self, start_run_idx, copy_data=False, **kwargs):
         """ Returns an iterator over all runs and yields the keyword arguments """
         if (not self._freeze_input) or (not self._multiproc):
@@ -2166,7 +2482,7 @@ class Environment(HasLogger):
                 for key in compat.listkeys(self._kwargs):
                     self._kwargs[key] = iter(self._kwargs[key])
 
-                for idx in self._make_index_iterator(start_run_idx):
+                for idx in self._make_index_iterator(start_run_idx, kwargs):
                     iter_args = tuple(next(x) for x in self._args)
                     iter_kwargs = {}
                     for key in self._kwargs:
@@ -2179,21 +2495,25 @@ class Environment(HasLogger):
                     if copy_data:
                         copied_kwargs = kwargs.copy()
                         if not self._freeze_input:
-                            copied_kwargs['traj'] = self._traj.f_copy(copy_leaves='explored',
-                                                                  with_links=True)
+                            # The skeleton of the trajectory is shared beforehand,
+                            # so a run only carries what distinguishes it from the others
+                            del copied_kwargs['traj']
+                            copied_kwargs['run_state'] = self._traj._get_run_state()
                         yield copied_kwargs
                     else:
                         yield kwargs
             else:
-                for idx in self._make_index_iterator(start_run_idx):
+                for idx in self._make_index_iterator(start_run_idx, kwargs):
                     if self._freeze_input:
                         # Frozen pool needs current run index
                         kwargs['idx'] = idx
                     if copy_data:
                         copied_kwargs = kwargs.copy()
                         if not self._freeze_input:
-                            copied_kwargs['traj'] = self._traj.f_copy(copy_leaves='explored',
-                                                                  with_links=True)
+                            # The skeleton of the trajectory is shared beforehand,
+                            # so a run only carries what distinguishes it from the others
+                            del copied_kwargs['traj']
+                            copied_kwargs['run_state'] = self._traj._get_run_state()
                         yield copied_kwargs
                     else:
                         yield kwargs
@@ -2313,6 +2633,11 @@ class Environment(HasLogger):
             raise ValueError('You cannot use `run_map` or `pipeline_map` in combination '
                              'with continuing option.')
 
+        if self._map_arguments and (self._run_cache is not None or self._deduplicate_runs):
+            raise ValueError('You cannot use `run_map` or `pipeline_map` in combination '
+                             'with a run cache or deduplication of runs.')
+        self._run_cache_stats = {'hits': 0, 'misses': 0, 'saved': 0.0}
+
         if self._sumatra_project is not None:
             self._prepare_sumatra()
 
@@ -2326,13 +2651,30 @@ class Environment(HasLogger):
             self._traj._run_by_environment = True
             if self._graceful_exit:
                 sigint_handling.start()
+            tmp_cache_path = None
+            if self._deduplicate_runs and self._run_cache is None:
+                tmp_cache_path = tempfile.mkdtemp(prefix='pypet_run_cache_')
+                self._run_cache = DirectoryRunCache(tmp_cache_path)
             try:
                 self._inner_run_loop(results)
             finally:
                 self._traj._run_by_environment = False
+                if self._result_journal is not None:
+                    self._result_journal.close()
+                    self._result_journal = None
                 self._stop_iteration = False
                 if self._graceful_exit:
                     sigint_handling.finalize()
+                if tmp_cache_path is not None:
+                    self._run_cache = None
+                    shutil.rmtree(tmp_cache_path, ignore_errors=True)
+
+            if self._run_cache is not None or tmp_cache_path is not None:
+                saved = datetime.timedelta(seconds=self._run_cache_stats['saved'])
+                self._logger.info('Run cache had %d hits and %d misses and saved about '
+                                  '%s of computation.' % (self._run_cache_stats['hits'],
+                                                          self._run_cache_stats['misses'],
+                                                          str(saved)))
 
         self._add_wildcard_config()
 
@@ -2462,17 +2804,23 @@ class Environment(HasLogger):
             if self._multiproc:
                 expanded_by_postproc = self._execute_multiprocessing(start_run_idx, results)
             else:
-                # Create a generator to generate the tasks
-                iterator = self._make_iterator(start_run_idx)
+                if self._async_storage:
+                    self._start_storage_thread()
+                try:
+                    # Create a generator to generate the tasks
+                    iterator = self._make_iterator(start_run_idx)
 
-                n = start_run_idx
-                total_runs = len(self._traj)
-                # Signal start of progress calculation
-                self._show_progress(n - 1, total_runs)
-                for task in iterator:
-                    result = _sigint_handling_single_run(task)
-                    n = self._check_result_and_store_references(result, results,
-                                                                        n, total_runs)
+                    n = start_run_idx
+                    total_runs = len(self._traj)
+                    # Signal start of progress calculation
+                    self._show_progress(n - 1, total_runs)
+                    for task in iterator:
+                        result = _sigint_handling_single_run(task)
+                        n = self._check_result_and_store_references(result, results,
+                                                                            n, total_runs)
+                finally:
+                    if self._async_storage:
+                        self._stop_storage_thread()
 
             repeat = False
             if self._postproc is not None:
@@ -2498,6 +2846,7 @@ class Environment(HasLogger):
 
         if self._resumable and self._delete_resume:
             # We remove all resume files if the simulation was successfully completed
+            self._get_result_journal().close()
             shutil.rmtree(self._resume_path)
 
         if expanded_by_postproc:
@@ -2507,6 +2856,23 @@ class Environment(HasLogger):
                                         comment='Added if trajectory was expanded '
                                                 'by postprocessing.')
 
+    def _start_storage_thread(self):
+        """Replaces the storage service of the trajectory by a sender that hands
+        the data to store to a background thread"""
+        self._logger.info('Starting the Storage Thread!')
+        self._multiproc_wrapper = ThreadQueueStorageServiceSender(self._storage_service,
+                                                                  self._queue_maxsize,
+                                                                  self._gc_interval)
+        self._multiproc_wrapper.start()
+        self._traj.v_storage_service = self._multiproc_wrapper
+
+    def _stop_storage_thread(self):
+        """Waits for the background thread to store all data and restores the service"""
+        self._logger.info('Waiting for the Storage Thread to store the remaining data.')
+        self._multiproc_wrapper.finalize()
+        self._traj.v_storage_service = self._storage_service
+        self._multiproc_wrapper = None
+
     def _get_results_from_queue(self, result_queue, results, n, total_runs):
         """Extract all available results from the queue and returns the increased n"""
         # Get all results from the result queue
@@ -2532,28 +2898,21 @@ class Environment(HasLogger):
         n += 1
         return n
 
+    def _get_result_journal(self):
+        """Returns the journal of result snapshots, creates it if necessary"""
+        if self._result_journal is None:
+            journal_filename = os.path.join(self._resume_path, 'results.jcnt')
+            self._result_journal = Journal(journal_filename)
+        return self._result_journal
+
     def _trigger_result_snapshot(self, result):
         """ Triggers a snapshot of the results for continuing
 
         :param result: Currently computed result
 
         """
-        timestamp = result[1]['finish_timestamp']
-        timestamp_str = repr(timestamp).replace('.', '_')
-        filename = 'result_%s' % timestamp_str
-        extension = '.ncnt'
-        dump_filename = os.path.join(self._resume_path, filename + extension)
-
-        dump_file = open(dump_filename, 'wb')
-        dill.dump(result, dump_file, protocol=2)
-        dump_file.flush()
-        dump_file.close()
-
-        # We rename the file to be certain that the trajectory did not crash during taking
-        # the snapshot!
-        extension = '.rcnt'
-        rename_filename = os.path.join(self._resume_path, filename + extension)
-        shutil.move(dump_filename, rename_filename)
+        # A snapshot torn by a crash is detected and discarded by the journal on resuming
+        self._get_result_journal().append(dill.dumps(result, protocol=2))
 
     def _execute_multiprocessing(self, start_run_idx, results):
         """Performs multiprocessing and signals expansion by postproc"""
@@ -2666,8 +3025,15 @@ class Environment(HasLogger):
 
                     target = _frozen_scoop_single_run
                 else:
+                    # Workers receive the skeleton of the trajectory only once
+                    skeleton = self._traj.f_copy(copy_leaves='explored', with_links=True)
+                    skeleton_rev = (self.name + '_skeleton_' +
+                                    str(time.time()).replace('.', '_'))
+                    shared.setConst(**{skeleton_rev: skeleton})
+
                     iterator = self._make_iterator(start_run_idx,
-                                                   copy_data=True)
+                                                   copy_data=True,
+                                                   skeleton_rev=skeleton_rev)
                     target = _scoop_single_run
 
                 try:
@@ -52,6 +52,8 @@ import warnings
 import keyword
 import itertools as itools
 import re
+import weakref
+import bisect
 from collections import deque
 
 from pypet.utils.decorators import deprecated, kwargs_api_change
@@ -59,7 +61,7 @@ import pypet.pypetexceptions as pex
 import pypet.compat as compat
 import pypet.pypetconstants as pypetconstants
 from pypet.annotations import WithAnnotations
-from pypet.utils.helpful_classes import ChainMap, IteratorChain
+from pypet.utils.helpful_classes import ChainMap, EMPTY_DICT
 from pypet.utils.helpful_functions import is_debug
 from pypet.pypetlogging import HasLogger, DisableAllLogging
 from pypet.slots import HasSlots
@@ -98,6 +100,10 @@ SUBTREE_MAPPING = {'config': (CONFIG_GROUP, CONFIG),
 # a slow search with a full tree traversal is initiated.
 FAST_UPPER_BOUND = 3
 
+# Maximum number of search results that are remembered
+# before the search cache is emptied again.
+SEARCH_CACHE_SIZE = 10000
+
 SHORTCUT_SET = set(['dpar', 'par', 'conf', 'res'])
 
 CHECK_REGEXP = re.compile(r'^[A-Za-z0-9_-]+$')
@@ -296,7 +302,8 @@ class NNTreeNode(WithAnnotations):
         """Renames the tree node"""
         self._full_name = full_name
         if full_name:
-            self._name = full_name.rsplit('.', 1)[-1]
+            # Short names are interned because the same names reoccur all over the tree
+            self._name = compat.intern(full_name.rsplit('.', 1)[-1])
 
     def _set_details(self, depth, branch, run_branch):
         """Sets some details for internal handling."""
@@ -496,6 +503,20 @@ class NaturalNamingInterface(HasLogger):
         self._nodes_and_leaves_runs_sorted = {}
         self._links_count =  {} # Dictionary of how often a link exists
 
+        # Dictionary of previous search results. Keys are tuples of the id of the start node,
+        # the searched name and the search settings. Values are weak references to the found
+        # node and its depth. The cache is emptied whenever nodes or links are added or removed.
+        self._search_cache = {}
+
+        # Incremented whenever nodes or links are added or removed
+        self._tree_version = 0
+
+        # Dictionary with names (not full names) as keys and sorted lists of the full names
+        # of all nodes and leaves carrying this name as values. All descendants of a node
+        # with a given name are found by bisection of the corresponding list.
+        # Lists are created on demand by `_get_sorted_full_names` and afterwards kept up to date.
+        self._sorted_full_names = {}
+
         # Context Manager to disable logging for auto-loading
         self._disable_logging = DisableAllLogging()
 
@@ -504,6 +525,13 @@ class NaturalNamingInterface(HasLogger):
         self._not_admissible_names = set(dir(self)) | set(dir(self._root_instance))
         self._python_keywords = set(keyword.kwlist)
 
+    def __getstate__(self):
+        """The search cache and the sorted full names are not pickled"""
+        state_dict = super(NaturalNamingInterface, self).__getstate__()
+        state_dict['_search_cache'] = {}
+        state_dict['_sorted_full_names'] = {}
+        return state_dict
+
 
     def _map_type_to_dict(self, type_name):
         """ Maps a an instance type representation string (e.g. 'RESULT')
@@ -787,6 +815,9 @@ class NaturalNamingInterface(HasLogger):
             # You cannot delete root
             return
 
+        # Previous search results might point to the deleted node
+        self._tree_changed()
+
         if node.v_is_leaf:
             if full_name in root._parameters:
                 del root._parameters[full_name]
@@ -847,6 +878,10 @@ class NaturalNamingInterface(HasLogger):
         del self._nodes_and_leaves[name][full_name]
         if len(self._nodes_and_leaves[name]) == 0:
             del self._nodes_and_leaves[name]
+            self._sorted_full_names.pop(name, None)
+        elif name in self._sorted_full_names:
+            sorted_names = self._sorted_full_names[name]
+            del sorted_names[bisect.bisect_left(sorted_names, full_name)]
 
         del self._nodes_and_leaves_runs_sorted[name][run_name][full_name]
         if len(self._nodes_and_leaves_runs_sorted[name][run_name]) == 0:
@@ -1091,6 +1126,57 @@ class NaturalNamingInterface(HasLogger):
         else:
             return type_tuple[0], type_tuple[0]
 
+    @staticmethod
+    def _parse_add_args(args, kwargs, add_link=False):
+        """Determines name, instance, and constructor of an item to add from the arguments.
+
+        See :func:`~pypet.naturalnaming.NaturalNamingInterface._add_generic` for how the
+        arguments are interpreted. The name is removed from `kwargs` if it is given there.
+
+        :return: Tuple of name, instance (or None), constructor (or None), and the list of
+            remaining arguments passed on to the constructor.
+
+        """
+        args = list(args)
+        create_new = True
+        name = ''
+        instance = None
+        constructor = None
+
+        # First check if the item is already a given instance or we want to add a link
+        if add_link:
+            name = args[0]
+            instance = args[1]
+            create_new = False
+        elif len(args) == 1 and len(kwargs) == 0:
+            item = args[0]
+            try:
+                name = item.v_full_name
+                instance = item
+
+                create_new = False
+            except AttributeError:
+                pass
+
+        # If the item is not an instance yet, check if args[0] is a class and args[1] is
+        # a string describing the new name of the instance.
+        # If args[0] is not a class it is assumed to be the name of the new instance.
+        if create_new:
+            if len(args) > 0 and inspect.isclass(args[0]):
+                constructor = args.pop(0)
+            if len(args) > 0 and isinstance(args[0], compat.base_type):
+                name = args.pop(0)
+            elif 'name' in kwargs:
+                name = kwargs.pop('name')
+            elif 'full_name' in kwargs:
+                name = kwargs.pop('full_name')
+            else:
+                raise ValueError('Could not determine a name of the new item you want to add. '
+                                 'Either pass the name as positional argument or as a keyword '
+                                 'argument `name`.')
+
+        return name, instance, constructor, args
+
     def _add_generic(self, start_node, type_name, group_type_name, args, kwargs,
                      add_prefix=True, check_naming=True):
         """Adds a given item to the tree irrespective of the subtree.
@@ -1144,45 +1230,9 @@ class NaturalNamingInterface(HasLogger):
         :return: The new added instance
 
         """
-        args = list(args)
-        create_new = True
-        name = ''
-        instance = None
-        constructor = None
-
         add_link = type_name == LINK
 
-        # First check if the item is already a given instance or we want to add a link
-        if add_link:
-            name = args[0]
-            instance = args[1]
-            create_new = False
-        elif len(args) == 1 and len(kwargs) == 0:
-            item = args[0]
-            try:
-                name = item.v_full_name
-                instance = item
-
-                create_new = False
-            except AttributeError:
-                pass
-
-        # If the item is not an instance yet, check if args[0] is a class and args[1] is
-        # a string describing the new name of the instance.
-        # If args[0] is not a class it is assumed to be the name of the new instance.
-        if create_new:
-            if len(args) > 0 and inspect.isclass(args[0]):
-                constructor = args.pop(0)
-            if len(args) > 0 and isinstance(args[0], compat.base_type):
-                name = args.pop(0)
-            elif 'name' in kwargs:
-                name = kwargs.pop('name')
-            elif 'full_name' in kwargs:
-                name = kwargs.pop('full_name')
-            else:
-                raise ValueError('Could not determine a name of the new item you want to add. '
-                                 'Either pass the name as positional argument or as a keyword '
-                                 'argument `name`.')
+        name, instance, constructor, args = self._parse_add_args(args, kwargs, add_link)
 
         split_names = name.split('.')
         if check_naming:
@@ -1230,6 +1280,147 @@ class NaturalNamingInterface(HasLogger):
         return self._add_to_tree(start_node, split_names, type_name, group_type_name, instance,
                                  constructor, args, kwargs)
 
+    def _add_leaves_bulk(self, start_node, items):
+        """Adds many leaves below `start_node` at once.
+
+        Equivalent to adding every item via
+        :func:`~pypet.naturalnaming.NaturalNamingInterface._add_generic` with
+        `type_name=LEAF` and `group_type_name=GROUP`. However, all names are checked
+        before anything is added and every distinct name is checked only once.
+        If adding fails nonetheless, for instance, because a constructor raises an error or
+        a name is used twice, all groups and leaves added so far are removed again.
+        Intermediate groups are created once and the sorted full names used for searching
+        are rebuilt only once afterwards instead of being updated for every new leaf.
+
+        :param start_node: The parental node the adding was initiated from
+
+        :param items:
+
+            Iterable of leaf instances or of tuples with arguments as passed to
+            :func:`~pypet.naturalnaming.NNGroupNode.f_add_leaf`.
+
+        :return: List of the new leaves in the order of `items`
+
+        """
+        root = self._root_instance
+
+        # First parse and check all items before we change the tree
+        entries = []
+        checked_names = {}  # Maps names to their translations and naming violations
+        types = {}
+        for item in items:
+            if isinstance(item, (tuple, list)):
+                args = item
+            else:
+                args = (item,)
+            name, instance, constructor, args = self._parse_add_args(args, {})
+
+            split_names = name.split('.')
+            faulty_names = ''
+            if start_node.v_is_root and split_names[0] == 'overview':
+                faulty_names = ' `overview` cannot be added directly under the root node ' \
+                               'this is a reserved keyword,'
+            for idx, name in enumerate(split_names):
+                try:
+                    translated_name, faulty_name = checked_names[name]
+                except KeyError:
+                    translated_shortcut, translated_name = self._translate_shortcut(name)
+                    replaced, translated_name = self._replace_wildcards(translated_name)
+                    faulty_name = self._check_name(translated_name)
+                    checked_names[name] = translated_name, faulty_name
+                split_names[idx] = translated_name
+                faulty_names += faulty_name
+            name = split_names[-1]
+            if len(name) >= pypetconstants.HDF5_STRCOL_MAX_NAME_LENGTH:
+                faulty_names = '%s `%s` is too long the name can only have %d characters but ' \
+                               'it has %d,' % \
+                               (faulty_names, name, len(name),
+                                pypetconstants.HDF5_STRCOL_MAX_NAME_LENGTH)
+
+            if faulty_names:
+                full_name = '.'.join(split_names)
+                raise ValueError(
+                    'Your Parameter/Result/Node `%s` contains the following not admissible names: '
+                    '%s please choose other names.' % (full_name, faulty_names))
+
+            first_name = split_names[0] if start_node.v_is_root else None
+            if first_name not in types:
+                group_type_name, type_name = self._determine_types(start_node, split_names[0],
+                                                                   True, False)
+                if root._is_run and type_name in SENSITIVE_TYPES:
+                    raise TypeError('You are not allowed to add config or parameter data or '
+                                    'groups during a single run.')
+                types[first_name] = group_type_name, type_name
+            group_type_name, type_name = types[first_name]
+
+            entries.append((split_names, group_type_name, type_name, instance, constructor, args))
+
+        # Previous search results, including failed ones, might no longer be valid
+        self._tree_changed()
+        # The sorted full names are rebuilt on demand after all leaves are added
+        for name, _ in checked_names.values():
+            self._sorted_full_names.pop(name, None)
+
+        groups = {(): start_node}  # Groups we already walked through or created
+        new_leaves = []
+        added = []  # Parents and names of all new nodes to roll back on failure
+        try:
+            for split_names, group_type_name, type_name, instance, constructor, args in entries:
+                group_names = tuple(split_names[:-1])
+                idx = len(group_names)
+                while group_names[:idx] not in groups:
+                    idx -= 1
+                act_node = groups[group_names[:idx]]
+                for idx in compat.xrange(idx, len(group_names)):
+                    name = group_names[idx]
+                    if name not in act_node._children:
+                        new_node = self._create_any_group(act_node, name, group_type_name)
+                        added.append((act_node, name))
+                        self._register_new_node(act_node, name, new_node)
+                    elif name in act_node._links:
+                        raise AttributeError('You cannot hop over links when adding '
+                                             'data to the tree. '
+                                             'There is a link called `%s` under `%s`.' %
+                                             (name, act_node.v_full_name))
+                    elif name in act_node._leaves:
+                        raise AttributeError('You cannot add data below the leaf `%s` '
+                                             'under `%s`.' % (name, act_node.v_full_name))
+                    act_node = act_node._children[name]
+                    groups[group_names[:idx + 1]] = act_node
+
+                name = split_names[-1]
+                if name in act_node._children:
+                    if root._no_clobber:
+                        self._logger.warning('You already have a group/instance/link `%s` '
+                                             'under `%s`. '
+                                             'However, you set `v_no_clobber=True`, '
+                                             'so I will ignore your addition of '
+                                             'data.' % (name, act_node.v_full_name))
+                        new_leaves.append(act_node._children[name])
+                        continue
+                    else:
+                        raise AttributeError('You already have a group/instance/link `%s` '
+                                             'under `%s`' % (name, act_node.v_full_name))
+
+                new_node = self._create_any_param_or_result(act_node, name, type_name,
+                                                            instance, constructor, args, {})
+                added.append((act_node, name))
+                self._flat_leaf_storage_dict[new_node.v_full_name] = new_node
+                self._register_new_node(act_node, name, new_node)
+                new_leaves.append(new_node)
+        except:
+            self._logger.error('Failed adding `%s` under `%s`, removing all items added '
+                               'so far.' % (name, start_node.v_full_name))
+            # Children are removed before their new parent groups
+            for act_node, name in reversed(added):
+                if name in act_node._children:
+                    act_node.f_remove_child(name, recursive=True)
+                root._new_nodes.pop((act_node.v_full_name, name), None)
+            self._tree_changed()
+            raise
+
+        return new_leaves
+
     def _replace_wildcards(self, name, run_idx=None):
         """Replaces the $ wildcards and returns True/False in case it was replaced"""
         if self._root_instance.f_is_wildcard(name):
@@ -1245,6 +1436,9 @@ class NaturalNamingInterface(HasLogger):
         if not name in self._nodes_and_leaves:
             self._nodes_and_leaves[name] = {full_name: new_node}
         else:
+            if (name in self._sorted_full_names and
+                    full_name not in self._nodes_and_leaves[name]):
+                bisect.insort(self._sorted_full_names[name], full_name)
             self._nodes_and_leaves[name][full_name] = new_node
 
         if not name in self._nodes_and_leaves_runs_sorted:
@@ -1307,6 +1501,9 @@ class NaturalNamingInterface(HasLogger):
 
         """
 
+        # Previous search results, including failed ones, might no longer be valid
+        self._tree_changed()
+
         # Then walk iteratively from the start node as specified by the new name and create
         # new empty groups on the fly
         try:
@@ -1345,15 +1542,7 @@ class NaturalNamingInterface(HasLogger):
                                                           group_type_name)
 
 
-                    if name in self._root_instance._run_information:
-                        self._root_instance._run_parent_groups[act_node.v_full_name] = act_node
-                    if self._root_instance._is_run:
-                        if link_added:
-                            self._root_instance._new_links[(act_node.v_full_name, name)] = \
-                                (act_node, new_node)
-                        else:
-                            self._root_instance._new_nodes[(act_node.v_full_name, name)] = \
-                                (act_node, new_node)
+                    self._register_new_node(act_node, name, new_node, link_added)
                 else:
                     if name in act_node._links:
                         raise AttributeError('You cannot hop over links when adding '
@@ -1377,7 +1566,25 @@ class NaturalNamingInterface(HasLogger):
                                (name, start_node.v_full_name))
             raise
 
+    def _register_new_node(self, act_node, name, new_node, is_link=False):
+        """Remembers run groups and the nodes that are added during a single run"""
+        if name in self._root_instance._run_information:
+            self._root_instance._run_parent_groups[act_node.v_full_name] = act_node
+        if self._root_instance._is_run:
+            if is_link:
+                self._root_instance._new_links[(act_node.v_full_name, name)] = \
+                    (act_node, new_node)
+            else:
+                self._root_instance._new_nodes[(act_node.v_full_name, name)] = \
+                    (act_node, new_node)
+
+    def _tree_changed(self):
+        """Invalidates previous search results and flat views of the tree"""
+        self._search_cache.clear()
+        self._tree_version += 1
+
     def _remove_link(self, act_node, name):
+        self._tree_changed()
         linked_node = act_node._links[name]
         full_name = linked_node.v_full_name
         linking = self._root_instance._linked_by[full_name]
@@ -1399,7 +1606,12 @@ class NaturalNamingInterface(HasLogger):
     def _create_link(self, act_node, name, instance):
         """Creates a link and checks if names are appropriate
         """
+        name = compat.intern(name)
 
+        if act_node._links is EMPTY_DICT:
+            act_node._links = {}
+        if act_node._children is EMPTY_DICT:
+            act_node._children = {}
         act_node._links[name] = instance
         act_node._children[name] = instance
 
@@ -1420,6 +1632,41 @@ class NaturalNamingInterface(HasLogger):
                                          instance.v_full_name))
         return instance
 
+    def _check_name(self, split_name, faulty_names=''):
+        """Checks a single name and appends a description of violations to `faulty_names`"""
+        if len(split_name) == 0:
+            faulty_names = '%s `%s` contains no characters, please use at least 1,' % (
+                faulty_names, split_name)
+
+        elif split_name.startswith('_'):
+            faulty_names = '%s `%s` starts with a leading underscore,' % (
+                faulty_names, split_name)
+
+        elif re.match(CHECK_REGEXP, split_name) is None:
+            faulty_names = '%s `%s` contains non-admissible characters ' \
+                           '(use only [A-Za-z0-9_-]),' % \
+                           (faulty_names, split_name)
+
+        elif '$' in split_name:
+            if split_name not in self._root_instance._wildcard_keys:
+                faulty_names = '%s `%s` contains `$` but has no associated ' \
+                               'wildcard function,' % (faulty_names, split_name)
+
+        elif split_name in self._not_admissible_names:
+            warnings.warn('`%s` is a method/attribute of the '
+                          'trajectory/treenode/naminginterface, you may not be '
+                          'able to access it via natural naming but only by using '
+                          '`[]` square bracket notation. ' % split_name,
+                          category=SyntaxWarning)
+
+        elif split_name in self._python_keywords:
+            warnings.warn('`%s` is a python keyword, you may not be '
+                          'able to access it via natural naming but only by using '
+                          '`[]` square bracket notation. ' % split_name,
+                          category=SyntaxWarning)
+
+        return faulty_names
+
     def _check_names(self, split_names, parent_node=None):
         """Checks if a list contains strings with invalid names.
 
@@ -1441,37 +1688,7 @@ class NaturalNamingInterface(HasLogger):
                            'this is a reserved keyword,' % (faulty_names)
 
         for split_name in split_names:
-
-            if len(split_name) == 0:
-                faulty_names = '%s `%s` contains no characters, please use at least 1,' % (
-                    faulty_names, split_name)
-
-            elif split_name.startswith('_'):
-                faulty_names = '%s `%s` starts with a leading underscore,' % (
-                    faulty_names, split_name)
-
-            elif re.match(CHECK_REGEXP, split_name) is None:
-                faulty_names = '%s `%s` contains non-admissible characters ' \
-                               '(use only [A-Za-z0-9_-]),' % \
-                               (faulty_names, split_name)
-
-            elif '$' in split_name:
-                if split_name not in self._root_instance._wildcard_keys:
-                    faulty_names = '%s `%s` contains `$` but has no associated ' \
-                                   'wildcard function,' % (faulty_names, split_name)
-
-            elif split_name in self._not_admissible_names:
-                warnings.warn('`%s` is a method/attribute of the '
-                              'trajectory/treenode/naminginterface, you may not be '
-                              'able to access it via natural naming but only by using '
-                              '`[]` square bracket notation. ' % split_name,
-                              category=SyntaxWarning)
-
-            elif split_name in self._python_keywords:
-                warnings.warn('`%s` is a python keyword, you may not be '
-                              'able to access it via natural naming but only by using '
-                              '`[]` square bracket notation. ' % split_name,
-                              category=SyntaxWarning)
+            faulty_names = self._check_name(split_name, faulty_names)
 
         name = split_names[-1]
         if len(name) >= pypetconstants.HDF5_STRCOL_MAX_NAME_LENGTH:
@@ -1492,6 +1709,7 @@ class NaturalNamingInterface(HasLogger):
         if kwargs is None:
             kwargs = {}
 
+        name = compat.intern(name)
         full_name = self._make_full_name(parent_node.v_full_name, name)
 
         if instance is None:
@@ -1556,6 +1774,10 @@ class NaturalNamingInterface(HasLogger):
         instance._nn_interface = self
         self._root_instance._all_groups[instance.v_full_name] = instance
         self._add_to_nodes_and_leaves(instance)
+        if parent_node._children is EMPTY_DICT:
+            parent_node._children = {}
+        if parent_node._groups is EMPTY_DICT:
+            parent_node._groups = {}
         parent_node._children[name] = instance
         parent_node._groups[name] = instance
 
@@ -1601,6 +1823,7 @@ class NaturalNamingInterface(HasLogger):
 
         """
         root = self._root_instance
+        name = compat.intern(name)
         full_name = self._make_full_name(parent_node.v_full_name, name)
         if instance is None:
             if constructor is None:
@@ -1632,6 +1855,10 @@ class NaturalNamingInterface(HasLogger):
 
         where_dict[full_name] = instance
         self._add_to_nodes_and_leaves(instance)
+        if parent_node._children is EMPTY_DICT:
+            parent_node._children = {}
+        if parent_node._leaves is EMPTY_DICT:
+            parent_node._leaves = {}
         parent_node._children[name] = instance
         parent_node._leaves[name] = instance
 
@@ -1730,10 +1957,13 @@ class NaturalNamingInterface(HasLogger):
             predicate = lambda x: _run_predicate(x, run_name_set)
 
         if recursive:
-            return NaturalNamingInterface._recursive_traversal_bfs(node,
-                                            self._root_instance._linked_by,
-                                            max_depth, with_links,
-                                            in_search, predicate)
+            iterator = self._traverse(node, self._root_instance._linked_by,
+                                      max_depth=max_depth, with_links=with_links,
+                                      predicate=predicate, revisit_links=in_search)
+            if in_search:
+                return (x[:3] for x in iterator)  # Here we return tuples: (depth, name, object)
+            else:
+                return (x[2] for x in iterator)  # Here we only want the objects themselves
         else:
             iterator = (x for x in self._make_child_iterator(node, with_links) if
                         predicate(x[2]))
@@ -1820,55 +2050,89 @@ class NaturalNamingInterface(HasLogger):
         return iterator
 
     @staticmethod
-    def _recursive_traversal_bfs(node, linked_by=None,
-                                 max_depth=float('inf'),
-                                 with_links=True, in_search=False, predicate=None):
-        """Iterator function traversing the tree below `node` in breadth first search manner.
+    def _traverse(node, linked_by=None, max_depth=float('inf'), with_links=True,
+                  predicate=None, depth_first=False, follow_links=True, revisit_links=False):
+        """Iterates over the tree below `node` without recursion.
 
-        If `run_name` is given only sub branches of this run are considered and the rest is
-        blinded out.
+        Nodes to visit are kept in an explicit queue (breadth first search) or
+        stack (depth first search). Children of a node are only expanded after the
+        node has been handed to the caller, so the caller can prepare
+        (for instance create the corresponding HDF5 group) before children are visited.
 
-        """
+        :param node: The start node, which is not yielded itself
 
-        if predicate is None:
-            predicate = lambda x: True
+        :param linked_by:
+
+            Dictionary of full names of linked nodes (`_linked_by` of the root), these nodes
+            are only expanded once even if they can be reached via several links
+
+        :param max_depth: Maximum depth relative to `node`
+
+        :param with_links: If links should be considered at all
+
+        :param predicate:
+
+            Evaluated before a node is yielded and its children are expanded, hence,
+            whole branches are pruned if a group does not fulfil the predicate
+
+        :param depth_first: If nodes are visited depth first instead of breadth first
 
-        iterator_queue = IteratorChain([(0, node.v_name, node)])
-        #iterator_queue = iter([(0, node.v_name, node)])
-        start = True
-        visited_linked_nodes = set([])
+        :param follow_links: If links are yielded but their children are not expanded
 
+        :param revisit_links:
+
+            If nodes reached again via another link are yielded again
+            (without expanding their children), needed by the search to detect
+            non-unique matches
+
+        :return: Iterator over tuples of depth, name, node, and parent node
+
+        """
+        if linked_by is None:
+            linked_by = {}
+
+        pending = deque()
+        pop = pending.pop if depth_first else pending.popleft
+        visited_linked_nodes = set()
+        if node._full_name in linked_by:
+            visited_linked_nodes.add(node._full_name)
+
+        depth = 0
+        item = node
+        expand = not item._is_leaf
         while True:
-            try:
-                depth, name, item = next(iterator_queue)
-                full_name = item._full_name
-                if start or predicate(item):
-                    if full_name in visited_linked_nodes:
-                        if in_search:
-                            # We need to return the node again to check if a link to the node
-                            # has to be found
-                            yield depth, name, item
-                    elif depth <= max_depth:
-                        if start:
-                            start = False
-                        else:
-                            if in_search:
-                                yield depth, name, item
-                            else:
-                                yield item
-
-                        if full_name in linked_by:
-                            visited_linked_nodes.add(full_name)
-
-                        if not item._is_leaf and depth < max_depth:
-                            child_iterator = NaturalNamingInterface._make_child_iterator(item,
-                                                                        with_links,
-                                                                        current_depth=depth)
-                            iterator_queue.add(child_iterator)
-                            #iterator_queue = itools.chain(iterator_queue, child_iterator)
-            except StopIteration:
+            if expand and depth < max_depth:
+                new_depth = depth + 1
+                if with_links:
+                    children = compat.iteritems(item._children)
+                else:
+                    children = itools.chain(compat.iteritems(item._groups),
+                                            compat.iteritems(item._leaves))
+                for child_name, child in children:
+                    pending.append((new_depth, child_name, child, item))
+
+            if not pending:
                 break
 
+            depth, name, item, parent = pop()
+            if predicate is not None and not predicate(item):
+                expand = False
+                continue
+
+            full_name = item._full_name
+            if full_name in visited_linked_nodes:
+                if revisit_links:
+                    yield depth, name, item, parent
+                expand = False
+                continue
+
+            yield depth, name, item, parent
+
+            if full_name in linked_by:
+                visited_linked_nodes.add(full_name)
+            expand = (not item._is_leaf and
+                      (follow_links or name not in parent._links))
+
     def _get_candidate_dict(self, key, crun, use_upper_bound=True):
         # First find all nodes where the key matches the (short) name of the node
         try:
@@ -1893,10 +2157,49 @@ class NaturalNamingInterface(HasLogger):
             # We end up here if `key` is actually a link
             return {}
 
+    def _get_sorted_full_names(self, key):
+        """Returns the sorted list of full names of all nodes and leaves named `key`.
+
+        The list is created on first request and updated by
+        :func:`~pypet.naturalnaming.NaturalNamingInterface._add_to_nodes_and_leaves` and
+        :func:`~pypet.naturalnaming.NaturalNamingInterface._remove_from_nodes_and_leaves`.
+
+        """
+        try:
+            return self._sorted_full_names[key]
+        except KeyError:
+            if key not in self._nodes_and_leaves:
+                return []
+            sorted_names = sorted(self._nodes_and_leaves[key])
+            self._sorted_full_names[key] = sorted_names
+            return sorted_names
+
+    def _iter_descendant_names(self, key, parent_full_name):
+        """Iterates over the full names of all nodes named `key` below `parent_full_name`.
+
+        Instead of checking every candidate, the range of descendants is found by
+        bisection of the sorted full names. All full names starting with `parent.`
+        lie between `parent.` and `parent/` since `/` directly follows `.` in ASCII.
+
+        """
+        sorted_names = self._get_sorted_full_names(key)
+        if parent_full_name == '':
+            return iter(sorted_names)
+        lower = parent_full_name + '.'
+        upper = parent_full_name + '/'
+        start = bisect.bisect_left(sorted_names, lower)
+        stop = bisect.bisect_left(sorted_names, upper, start)
+        return itools.islice(sorted_names, start, stop)
+
     def _very_fast_search(self, node, key, max_depth, with_links, crun):
         """Fast search for a node in the tree.
 
         The tree is not traversed but the reference dictionaries are searched.
+        Without `crun` the descendants of `node` are found by a range query
+        over the sorted full names (see
+        :func:`~pypet.naturalnaming.NaturalNamingInterface._iter_descendant_names`).
+        Among all descendants within `max_depth` the shallowest one is returned,
+        as a breadth first search would do.
 
         :param node:
 
@@ -1914,6 +2217,7 @@ class NaturalNamingInterface(HasLogger):
 
             If we work with links than we can only be sure to found the node in case we
             have a single match. Otherwise the other match might have been linked as well.
+            This only matters if the tree contains links at all.
 
         :param crun:
 
@@ -1930,7 +2234,7 @@ class NaturalNamingInterface(HasLogger):
 
             NotUniqueNodeError:
 
-                If several nodes match the key criterion
+                If several nodes match the key criterion within the same depth
 
         """
 
@@ -1939,31 +2243,43 @@ class NaturalNamingInterface(HasLogger):
 
         parent_full_name = node.v_full_name
         starting_depth = node.v_depth
-        candidate_dict = self._get_candidate_dict(key, crun)
 
-        # If there are to many potential candidates sequential search might be too slow
-        if with_links:
-            upper_bound = 1
+        if with_links and self._links_count:
+            # Another match might be reachable via a link and shallower,
+            # so we can only be sure in case of a single candidate
+            candidate_dict = self._get_candidate_dict(key, crun)
+            if len(candidate_dict) > 1:
+                raise pex.TooManyGroupsError('Too many nodes')
+            goal_names = (goal_name for goal_name in candidate_dict
+                          if goal_name.startswith(parent_full_name))
+        elif crun is not None:
+            candidate_dict = self._get_candidate_dict(key, crun, use_upper_bound=False)
+            if parent_full_name == '':
+                goal_names = iter(candidate_dict)
+            else:
+                prefix = parent_full_name + '.'
+                goal_names = (goal_name for goal_name in candidate_dict
+                              if goal_name.startswith(prefix))
         else:
-            upper_bound = FAST_UPPER_BOUND
-        if len(candidate_dict) > upper_bound:
-            raise pex.TooManyGroupsError('Too many nodes')
+            candidate_dict = self._nodes_and_leaves.get(key, {})
+            goal_names = self._iter_descendant_names(key, parent_full_name)
 
-        # Next check if the found candidates could be reached from the parent node
+        # Next check which of the found candidates are within reach and the shallowest
         result_node = None
-        for goal_name in candidate_dict:
-
-            # Check if we have found a matching node
-            if goal_name.startswith(parent_full_name):
-                candidate = candidate_dict[goal_name]
-                if candidate.v_depth - starting_depth <= max_depth:
-                    # In case of several solutions raise an error:
-                    if result_node is not None:
-                        raise pex.NotUniqueNodeError('Node `%s` has been found more than once, '
-                                                     'full name of first occurrence is `%s` and of'
-                                                     'second `%s`'
-                                                     % (key, goal_name, result_node.v_full_name))
-                    result_node = candidate
+        result_depth = float('inf')
+        for goal_name in goal_names:
+            candidate = candidate_dict[goal_name]
+            depth = candidate.v_depth - starting_depth
+            if depth > max_depth or depth > result_depth:
+                continue
+            if depth == result_depth:
+                # In case of several solutions within the same depth raise an error:
+                raise pex.NotUniqueNodeError('Node `%s` has been found more than once, '
+                                             'full name of first occurrence is `%s` and of'
+                                             'second `%s`'
+                                             % (key, goal_name, result_node.v_full_name))
+            result_node = candidate
+            result_depth = depth
 
         if result_node is not None:
             return result_node, result_node.v_depth
@@ -1999,6 +2315,34 @@ class NaturalNamingInterface(HasLogger):
         if key in node._children and (with_links or key not in node._links):
             return node._children[key], 1
 
+        # Next check if we have searched for the very same thing before
+        cache_key = (id(node), key, max_depth, with_links, crun)
+        try:
+            node_ref, depth = self._search_cache[cache_key]
+            if node_ref is None:
+                return None, depth
+            result_node = node_ref()
+            if result_node is not None:
+                return result_node, depth
+        except KeyError:
+            pass
+
+        result_node, depth = self._search_below(node, key, max_depth, with_links, crun)
+
+        if len(self._search_cache) >= SEARCH_CACHE_SIZE:
+            self._search_cache.clear()
+        # We only keep weak references to not interfere with the deletion of nodes
+        node_ref = None if result_node is None else weakref.ref(result_node)
+        self._search_cache[cache_key] = (node_ref, depth)
+        return result_node, depth
+
+    def _search_below(self, node, key, max_depth, with_links, crun):
+        """Searches for an item below `node` that is not one of its direct children.
+
+        See :func:`~pypet.naturalnaming.NaturalNamingInterface._search`
+        for a description of the parameters.
+
+        """
         # First the very fast search is tried that does not need tree traversal.
         try:
             result = self._very_fast_search(node, key, max_depth, with_links, crun)
@@ -2447,10 +2791,12 @@ class NNGroupNode(NNTreeNode, KnowsTrajectory):
 
     def __init__(self, full_name='', trajectory=None, comment=''):
         super(NNGroupNode, self).__init__(full_name, comment=comment, is_leaf=False)
-        self._children = {}
-        self._links = {}
-        self._groups = {}
-        self._leaves = {}
+        # Empty groups share a single read-only dictionary, new dictionaries
+        # are only created once the first child is added
+        self._children = EMPTY_DICT
+        self._links = EMPTY_DICT
+        self._groups = EMPTY_DICT
+        self._leaves = EMPTY_DICT
         self._kids = None
         if trajectory is not None:
             self._nn_interface = trajectory._nn_interface
@@ -2570,7 +2916,7 @@ class NNGroupNode(NNTreeNode, KnowsTrajectory):
 
         debug_tree = Bunch()
 
-        if not self.v_annotations.f_is_empty():
+        if self._has_annotations():
             debug_tree.v_annotations = self.v_annotations
         if not self.v_comment == '':
             debug_tree.v_comment = self.v_comment
@@ -2684,6 +3030,24 @@ class NNGroupNode(NNTreeNode, KnowsTrajectory):
                                                args=args, kwargs=kwargs,
                                                add_prefix=False)
 
+    def f_add_leaves_bulk(self, items):
+        """Adds many leaves under the current node at once.
+
+        Equivalent to calling :func:`~pypet.naturalnaming.NNGroupNode.f_add_leaf` for
+        every item, but considerably faster for many items. All names are checked before
+        anything is added to the tree, so a single invalid name leaves the tree untouched.
+
+        Every item is either a leaf instance or a tuple of the (non-keyword) arguments
+        you would pass to `f_add_leaf`:
+
+        >>> traj.par.f_add_leaves_bulk([('group1.x', 42, 'Example!'),
+        ...                             (PickleParameter, 'group1.y', [1, 2, 3])])
+
+        :return: List of the added leaves in the order of the items
+
+        """
+        return self._nn_interface._add_leaves_bulk(self, items)
+
     def f_links(self):
         """Returns the number of links of the group"""
         return len(self._links)
@@ -149,6 +149,11 @@ class BaseParameter(NNLeafNode):
 
     __slots__ = ('_locked', '_full_copy', '_explored')
 
+    # Number of times any parameter has been unlocked. Values of locked parameters cannot change
+    # apart from the parameter access set by the trajectory, so cached values of locked
+    # parameters are valid as long as this number stays the same.
+    _unlock_count = 0
+
     def __init__(self, full_name, comment=''):
         super(BaseParameter, self).__init__(full_name, comment, is_parameter=True)
 
@@ -423,6 +428,7 @@ class BaseParameter(NNLeafNode):
 
         """
         self._locked = False
+        BaseParameter._unlock_count += 1
 
     def f_lock(self):
         """Locks the parameter and forbids further manipulation.
@@ -556,6 +562,15 @@ class BaseParameter(NNLeafNode):
         """
         raise NotImplementedError("Should have implemented this.")
 
+    def _stores_incrementally(self):
+        """Whether data of an expanded range can be appended to the data on disk.
+
+        If `False` the trajectory removes the parameter from disk on expansion
+        and it is stored anew.
+
+        """
+        return False
+
     def _set_parameter_access(self, idx=0):
         """Sets the current value according to the `idx` in the exploration range.
 
@@ -721,6 +736,14 @@ class Parameter(BaseParameter):
 
     __slots__ = ('_data', '_default', '_explored_range')
 
+    RANGE_DTYPES = {bool: np.bool_,
+                    int: np.int64,
+                    compat.long_type: np.int64,
+                    float: np.float64,
+                    complex: np.complex128,
+                    compat.unicode_type: np.unicode_}
+    """Mapping from python types of default values to numpy types of typed ranges"""
+
     def __init__(self, full_name, data=None, comment=''):
         super(Parameter, self).__init__(full_name, comment)
         self._data = None
@@ -850,7 +873,12 @@ class Parameter(BaseParameter):
             raise ValueError('You try to access data item No. %d in the parameter range, '
                              'yet there are only %d potential items.' % (idx, len(self)))
         elif self.f_has_range():
-            self._data = self._explored_range[idx]
+            data = self._explored_range[idx]
+            if (isinstance(self._explored_range, np.ndarray) and
+                    not isinstance(self._default, np.generic)):
+                # Typed ranges of python natives need to return the python type
+                data = data.item()
+            self._data = data
         else:
             self._logger.warning('You try to change the access to a parameter range of parameter'
                                  ' `%s`. The parameter has no range, your setting has no'
@@ -984,11 +1012,72 @@ class Parameter(BaseParameter):
         if not self.f_has_range():
             raise TypeError('Your parameter `%s` is not array, so cannot return array.' %
                             self.v_full_name)
+        elif isinstance(self._explored_range, np.ndarray):
+            # Typed ranges are always turned into a new list
+            return self._range_to_list(self._explored_range)
         elif copy:
             return self._explored_range[:]
         else:
             return self._explored_range
 
+    def _range_to_list(self, explore_range):
+        """Turns a (typed) exploration range into a list of the type of the default value"""
+        if not isinstance(explore_range, np.ndarray):
+            return list(explore_range)
+        elif isinstance(self._default, np.generic):
+            return list(explore_range)
+        else:
+            return explore_range.tolist()
+
+    def _get_range_dtype(self):
+        """Returns the numpy type to keep the exploration range as a typed array.
+
+        Only numeric, boolean, and string scalar default values allow typed ranges,
+        otherwise `None` is returned.
+
+        """
+        default_type = type(self._default)
+        if default_type in Parameter.RANGE_DTYPES:
+            return Parameter.RANGE_DTYPES[default_type]
+        elif issubclass(default_type, np.generic) and np.dtype(default_type).kind in 'biufcU':
+            return default_type
+        else:
+            return None
+
+    def _make_typed_range(self, explore_iterable):
+        """Turns `explore_iterable` into a typed numpy array if possible.
+
+        All items need to be of the exact type of the default value.
+        Returns `None` if the data cannot be kept as a typed array.
+
+        """
+        dtype = self._get_range_dtype()
+        if dtype is None:
+            return None
+
+        default_type = type(self._default)
+        if isinstance(explore_iterable, np.ndarray):
+            if explore_iterable.ndim == 1 and explore_iterable.dtype.type is default_type:
+                # Numpy types are already checked by the dtype of the array
+                return explore_iterable.copy()
+            explore_iterable = list(explore_iterable)
+        elif not isinstance(explore_iterable, list):
+            explore_iterable = list(explore_iterable)
+
+        if len(explore_iterable) == 0:
+            return None
+        # Vectorized type check, we need the exact same type as the default value
+        if set(map(type, explore_iterable)) != set([default_type]):
+            return None
+        try:
+            typed_range = np.array(explore_iterable, dtype=dtype)
+        except (OverflowError, ValueError, TypeError):
+            # For instance, python integers that do not fit into 64 bit
+            return None
+        if typed_range.ndim != 1:
+            return None
+        return typed_range
+
 
     def _explore(self, explore_iterable):
         """Explores the parameter according to the iterable.
@@ -1064,7 +1153,14 @@ class Parameter(BaseParameter):
 
         data_list = self._data_sanity_checks(explore_iterable)
 
-        self._explored_range.extend(data_list)
+        if (isinstance(self._explored_range, np.ndarray) and
+                isinstance(data_list, np.ndarray)):
+            self._explored_range = np.concatenate((self._explored_range, data_list))
+        elif isinstance(self._explored_range, np.ndarray) or isinstance(data_list, np.ndarray):
+            self._explored_range = (self._range_to_list(self._explored_range) +
+                                    self._range_to_list(data_list))
+        else:
+            self._explored_range.extend(data_list)
         self.f_lock()
 
     def _data_sanity_checks(self, explore_iterable):
@@ -1073,7 +1169,17 @@ class Parameter(BaseParameter):
         Checks if the data values are supported by the parameter and if the values are of the same
         type as the default value.
 
+        Homogeneous numeric, boolean, or string data is checked at once and returned
+        as a typed numpy array, everything else is checked item by item and returned as a list.
+
         """
+        if not isinstance(explore_iterable, (list, np.ndarray)):
+            explore_iterable = list(explore_iterable)
+
+        typed_range = self._make_typed_range(explore_iterable)
+        if typed_range is not None:
+            return typed_range
+
         data_list = []
 
         for val in explore_iterable:
@@ -1108,7 +1214,11 @@ class Parameter(BaseParameter):
             store_dict = {'data': ObjectTable(data={'data': [self._data]})}
 
         if self.f_has_range():
-            store_dict['explored_data'] = ObjectTable(data={'data': self._explored_range})
+            if isinstance(self._explored_range, np.ndarray):
+                # Typed ranges are handed over without any conversion
+                store_dict['explored_data'] = self._explored_range
+            else:
+                store_dict['explored_data'] = ObjectTable(data={'data': self._explored_range})
 
         self._locked = True
 
@@ -1133,7 +1243,16 @@ class Parameter(BaseParameter):
                                  'I did not find any data on disk.' % self.v_full_name)
 
         if 'explored_data' in load_dict:
-            self._explored_range = [x for x in load_dict['explored_data']['data'].tolist()]
+            explored_data = load_dict['explored_data']
+            if isinstance(explored_data, np.ndarray):
+                self._explored_range = explored_data
+            else:
+                data_list = [x for x in explored_data['data'].tolist()]
+                typed_range = self._make_typed_range(data_list)
+                if typed_range is not None:
+                    self._explored_range = typed_range
+                else:
+                    self._explored_range = data_list
             self._explored = True
 
         self._locked = True
@@ -1190,13 +1309,83 @@ class ArrayParameter(Parameter):
     Since the ArrayParameter inherits from :class:`~pypet.parameter.Parameter` it also
     supports all other native python types.
 
+    If the exploration range is expanded, only the new arrays are hashed and stored.
+    Arrays already on disk are not rewritten and the index of the range is extended
+    in place.
+
     """
 
-    __slots__ = ()
+    __slots__ = ('_smart_range', '_smart_dict', '_smart_idx', '_smart_first')
 
     IDENTIFIER = '__rr__'
     """Identifier to mark stored data as an array"""
 
+    def __init__(self, full_name, data=None, comment=''):
+        self._smart_range = None  # The exploration range the following caches belong to
+        self._smart_dict = None  # Maps hashable elements to the index of their array
+        self._smart_idx = None  # Index of the array for every entry of the range
+        self._smart_first = None  # Position in the range where each array occurred first
+        super(ArrayParameter, self).__init__(full_name, data, comment)
+
+    def __getstate__(self):
+        """Omits the hashing caches if the exploration range is not pickled either"""
+        result = super(ArrayParameter, self).__getstate__()
+        if not self._full_copy:
+            result['_smart_range'] = None
+            result['_smart_dict'] = None
+            result['_smart_idx'] = None
+            result['_smart_first'] = None
+        return result
+
+    def _stores_incrementally(self):
+        """Arrays of an expanded range can be appended on disk"""
+        return type(self._data) in (np.ndarray, tuple, np.matrix, list)
+
+    def _store_flags(self):
+        """The range index is stored as an extendable array"""
+        return {'explored_data' + ArrayParameter.IDENTIFIER: pypetconstants.EARRAY}
+
+    def _smart_hash_range(self):
+        """Assigns every entry of the exploration range the index of its array.
+
+        Results are cached and only entries appended to the range since the last call
+        are hashed. The cache is discarded if the range was replaced or shrunk.
+
+        """
+        if (self._smart_range is not self._explored_range or
+                len(self._smart_idx) > len(self._explored_range)):
+            self._smart_range = self._explored_range
+            self._smart_dict = {}
+            self._smart_idx = []
+            self._smart_first = []
+
+        smart_dict = self._smart_dict
+        for idx in range(len(self._smart_idx), len(self._explored_range)):
+            hash_elem = self._hashable(self._explored_range[idx])
+
+            # Check if we have used the array before,
+            # i.e. element can be found in the dictionary
+            try:
+                name_idx = smart_dict[hash_elem]
+            except KeyError:
+                name_idx = len(smart_dict)
+                smart_dict[hash_elem] = name_idx
+                self._smart_first.append(idx)
+            self._smart_idx.append(name_idx)
+
+    @staticmethod
+    def _hashable(elem):
+        """Returns a hashable part of an element of the exploration range"""
+        # First we need to distinguish between tuples and array and extract a
+        # hashable part of the array
+        if isinstance(elem, np.ndarray):
+            # You cannot hash numpy arrays themselves, but if they are read only
+            # you can hash array.data
+            return HashArray(elem)
+        elif isinstance(elem, list):
+            return tuple(elem)
+        else:
+            return elem
 
     def _store(self):
         """Creates a storage dictionary for the storage service.
@@ -1210,10 +1399,13 @@ class ArrayParameter(Parameter):
         'xa__rr__XXXXXXXX' where 'XXXXXXXX' is the index of the array. Note if an array
         is used more than once in an exploration range (for example, due to cartesian product
         exploration), the array is stored only once.
-        Moreover, an :class:`~pypet.parameter.ObjectTable` containing the references
+        Moreover, an integer array containing the references
         is stored under the name 'explored_data__rr__' in order to recall
         the order of the arrays later on.
 
+        Array names only depend on the order of first occurrence, so expanding the range
+        leaves the names of arrays already stored untouched.
+
         """
         if type(self._data) not in (np.ndarray, tuple, np.matrix, list):
             return super(ArrayParameter, self)._store()
@@ -1221,47 +1413,15 @@ class ArrayParameter(Parameter):
             store_dict = {'data' + ArrayParameter.IDENTIFIER: self._data}
 
             if self.f_has_range():
-                # Supports smart storage by hashable arrays
-                # Keys are the hashable arrays or tuples and values are the indices
-                smart_dict = {}
+                self._smart_hash_range()
 
+                # Store the references to the arrays
                 store_dict['explored_data' + ArrayParameter.IDENTIFIER] = \
-                    ObjectTable(columns=['idx'], index=list(range(len(self))))
-
-                count = 0
-                for idx, elem in enumerate(self._explored_range):
-
-                    # First we need to distinguish between tuples and array and extract a
-                    # hashable part of the array
-                    if isinstance(elem, np.ndarray):
-                        # You cannot hash numpy arrays themselves, but if they are read only
-                        # you can hash array.data
-                        hash_elem = HashArray(elem)
-                    elif isinstance(elem, list):
-                        hash_elem = tuple(elem)
-                    else:
-                        hash_elem = elem
-
-                    # Check if we have used the array before,
-                    # i.e. element can be found in the dictionary
-                    if hash_elem in smart_dict:
-                        name_idx = smart_dict[hash_elem]
-                        add = False
-                    else:
-                        name_idx = count
-                        add = True
-
-                    name = self._build_name(name_idx)
-                    # Store the reference to the array
-                    store_dict['explored_data' + ArrayParameter.IDENTIFIER]['idx'][idx] = \
-                        name_idx
+                    np.array(self._smart_idx, dtype=np.int64)
 
-                    # Only if the array was not encountered before,
-                    # store the array and remember the index
-                    if add:
-                        store_dict[name] = elem
-                        smart_dict[hash_elem] = name_idx
-                        count += 1
+                # Every array is stored only once
+                for name_idx, idx in enumerate(self._smart_first):
+                    store_dict[self._build_name(name_idx)] = self._explored_range[idx]
 
             self._locked = True
 
@@ -1298,7 +1458,11 @@ class ArrayParameter(Parameter):
             if 'explored_data' + ArrayParameter.IDENTIFIER in load_dict:
                 explore_table = load_dict['explored_data' + ArrayParameter.IDENTIFIER]
 
-                idx = explore_table['idx']
+                if isinstance(explore_table, np.ndarray):
+                    idx = explore_table
+                else:
+                    # For backwards compatibility, references were stored as a table
+                    idx = explore_table['idx']
 
                 explore_list = []
 
@@ -1348,6 +1512,14 @@ class SparseParameter(ArrayParameter):
 
     Uses similar memory management as its parent class.
 
+    If all explored matrices share the same data type, the exploration range is packed:
+    The `data`, `indices` (or `offsets`), and `indptr` arrays of all matrices are
+    concatenated into three arrays and an offset table (see
+    :const:`~pypet.parameter.SparseParameter.PACKED_META_COLUMNS`) remembers where
+    each matrix starts and ends. Accordingly, storing and loading
+    requires only a handful of nodes regardless of the length of the range,
+    and expansions of the range are simply appended.
+
     """
 
     IDENTIFIER = '__spsp__'
@@ -1358,6 +1530,19 @@ class SparseParameter(ArrayParameter):
     OTHER_NAME_LIST = ['format', 'data', 'indices', 'indptr', 'shape']
     """Data names for serialization of csr, csc, and bsr matrices"""
 
+    PACKED_NAME_LIST = ['data', 'indices', 'indptr', 'meta']
+    """Data names of a packed exploration range"""
+    PACKED_FORMATS = ('csr', 'csc', 'bsr', 'dia')
+    """Matrix formats, the index into this tuple is stored in the offset table"""
+    PACKED_META_COLUMNS = ('format', 'rows', 'cols', 'data_end', 'indices_end', 'indptr_end',
+                           'dim_1', 'dim_2')
+    """Columns of the offset table of a packed exploration range.
+
+    `dim_1` and `dim_2` are the block size of bsr matrices and the shape of the data of dia
+    matrices.
+
+    """
+
     __slots__ = ()
 
     def _values_of_same_type(self, val1, val2):
@@ -1492,6 +1677,118 @@ class SparseParameter(ArrayParameter):
         else:
             return SparseParameter.OTHER_NAME_LIST
 
+    def _hashable(self, elem):
+        """Sparse matrices are hashed via their serialization"""
+        if self._is_supported_matrix(elem):
+            return self._serialize_matrix(elem)[2]
+        else:
+            return super(SparseParameter, self)._hashable(elem)
+
+    def _is_packable(self):
+        """Checks if the exploration range can be packed, i.e. all data has the same type"""
+        return len(set(matrix.dtype for matrix in self._explored_range)) == 1
+
+    def _stores_incrementally(self):
+        """Packed ranges of matrices can be appended on disk"""
+        if self._is_supported_matrix(self._data):
+            return self._is_packable()
+        else:
+            return super(SparseParameter, self)._stores_incrementally()
+
+    def _store_flags(self):
+        """Packed data and the range index are stored as extendable arrays"""
+        if self._is_supported_matrix(self._data):
+            if self.f_has_range() and self._is_packable():
+                store_flags = dict((name, pypetconstants.EARRAY) for name in
+                                   self._build_packed_names())
+                store_flags['explored_data' + SparseParameter.IDENTIFIER] = \
+                    pypetconstants.EARRAY
+                return store_flags
+            else:
+                return {}
+        else:
+            return super(SparseParameter, self)._store_flags()
+
+    @staticmethod
+    def _build_packed_names():
+        """Returns the names of the packed data, index and offset table"""
+        return tuple('explored%s.packed_%s' % (SparseParameter.IDENTIFIER, name)
+                     for name in SparseParameter.PACKED_NAME_LIST)
+
+    @staticmethod
+    def _pack_matrices(matrices):
+        """Concatenates the arrays of several sparse matrices.
+
+        :return:
+
+            Tuple of the concatenated `data`, the concatenated `indices` (or `offsets` of
+            dia matrices), the concatenated `indptr`, and the offset table.
+
+        """
+        data_list = []
+        indices_list = []
+        indptr_list = []
+        meta = np.zeros((len(matrices), len(SparseParameter.PACKED_META_COLUMNS)),
+                        dtype=np.int64)
+        data_end = indices_end = indptr_end = 0
+        for irow, matrix in enumerate(matrices):
+            dims = (0, 0)
+            if spsp.isspmatrix_dia(matrix):
+                indices = matrix.offsets
+                indptr = ()
+                dims = matrix.data.shape
+            else:
+                indices = matrix.indices
+                indptr = matrix.indptr
+                if spsp.isspmatrix_bsr(matrix):
+                    dims = matrix.blocksize
+            data_list.append(matrix.data.ravel())
+            indices_list.append(indices)
+            indptr_list.append(indptr)
+            data_end += matrix.data.size
+            indices_end += len(indices)
+            indptr_end += len(indptr)
+            meta[irow] = ((SparseParameter.PACKED_FORMATS.index(matrix.format),) +
+                          matrix.shape + (data_end, indices_end, indptr_end) + tuple(dims))
+
+        packed_data = np.concatenate(data_list)
+        packed_indices = np.concatenate(indices_list).astype(np.int64)
+        packed_indptr = np.concatenate(indptr_list).astype(np.int64)
+        return packed_data, packed_indices, packed_indptr, meta
+
+    @staticmethod
+    def _unpack_matrices(packed_data, packed_indices, packed_indptr, meta):
+        """Reconstructs the matrices packed with
+        :func:`~pypet.parameter.SparseParameter._pack_matrices`
+
+        """
+        matrices = []
+        data_start = indices_start = indptr_start = 0
+        for row in meta:
+            (format_idx, rows, cols, data_end, indices_end,
+                indptr_end, dim_1, dim_2) = [int(x) for x in row]
+            matrix_format = SparseParameter.PACKED_FORMATS[format_idx]
+            data = packed_data[data_start:data_end]
+            indices = packed_indices[indices_start:indices_end]
+            indptr = packed_indptr[indptr_start:indptr_end]
+            shape = (rows, cols)
+            if matrix_format == 'csr':
+                matrix = spsp.csr_matrix((data, indices, indptr), shape=shape)
+            elif matrix_format == 'csc':
+                matrix = spsp.csc_matrix((data, indices, indptr), shape=shape)
+            elif matrix_format == 'bsr':
+                data = data.reshape((-1, dim_1, dim_2))
+                matrix = spsp.bsr_matrix((data, indices, indptr), shape=shape,
+                                         blocksize=(dim_1, dim_2))
+            elif matrix_format == 'dia':
+                data = data.reshape((dim_1, dim_2))
+                matrix = spsp.dia_matrix((data, indices), shape=shape)
+            else:
+                raise RuntimeError('You shall not pass!')
+            matrices.append(matrix)
+            data_start, indices_start, indptr_start = data_end, indices_end, indptr_end
+        return matrices
+
     def _store(self):
         """Creates a storage dictionary for the storage service.
 
@@ -1510,6 +1807,10 @@ class SparseParameter(ArrayParameter):
         The :class:`~pypet.parameter.ObjectTable` `explored_data__spsp__` stores the order
         of the matrices and whether the corresponding matrix is dia or not.
 
+        If all explored matrices share the same data type, they are packed instead,
+        see :func:`~pypet.parameter.SparseParameter._pack_matrices`. Then `explored_data__spsp__`
+        is an integer array storing the order of the matrices.
+
         """
         if not self._is_supported_matrix(self._data):
             return super(SparseParameter, self)._store()
@@ -1527,41 +1828,38 @@ class SparseParameter(ArrayParameter):
 
             if self.f_has_range():
                 # # Supports smart storage by hashing
-                smart_dict = {}
-
-                store_dict['explored_data' + SparseParameter.IDENTIFIER] = \
-                    ObjectTable(columns=['idx', 'is_dia'],
-                                index=list(range(len(self))))
-
-                count = 0
-                for idx, elem in enumerate(self._explored_range):
+                self._smart_hash_range()
 
-                    data_list, name_list, hash_tuple = self._serialize_matrix(elem)
+                if self._is_packable():
+                    store_dict['explored_data' + SparseParameter.IDENTIFIER] = \
+                        np.array(self._smart_idx, dtype=np.int64)
 
-                    # Use the hash_tuple as a key for the smart_dict
-                    if hash_tuple in smart_dict:
-                        name_idx = smart_dict[hash_tuple]
-                        add = False
-                    else:
-                        name_idx = count
-                        add = True
-
-                    is_dia = int(len(name_list) == 4)
-                    rename_list = self._build_names(name_idx, is_dia)
+                    matrices = [self._explored_range[idx] for idx in self._smart_first]
+                    packed_list = self._pack_matrices(matrices)
+                    for name, packed in zip(self._build_packed_names(), packed_list):
+                        store_dict[name] = packed
+                else:
+                    store_dict['explored_data' + SparseParameter.IDENTIFIER] = \
+                        ObjectTable(columns=['idx', 'is_dia'],
+                                    index=list(range(len(self))))
 
-                    store_dict['explored_data' + SparseParameter.IDENTIFIER]['idx'][idx] = name_idx
+                    for idx, name_idx in enumerate(self._smart_idx):
+                        elem = self._explored_range[idx]
+                        is_dia = int(spsp.isspmatrix_dia(elem))
 
-                    store_dict['explored_data' + SparseParameter.IDENTIFIER]['is_dia'][
-                        idx] = is_dia
+                        store_dict['explored_data' + SparseParameter.IDENTIFIER]['idx'][idx] = \
+                            name_idx
+                        store_dict['explored_data' + SparseParameter.IDENTIFIER]['is_dia'][
+                            idx] = is_dia
 
-                    if add:
+                    for name_idx, idx in enumerate(self._smart_first):
+                        data_list, name_list, hash_tuple = self._serialize_matrix(
+                            self._explored_range[idx])
+                        rename_list = self._build_names(name_idx, int(len(name_list) == 4))
 
                         for irun, name in enumerate(rename_list):
                             store_dict[name] = data_list[irun]
 
-                        smart_dict[hash_tuple] = name_idx
-                        count += 1
-
             self._locked = True
 
             return store_dict
@@ -1646,7 +1944,15 @@ class SparseParameter(ArrayParameter):
             data_list = [load_dict[name] for name in rename_list]
             self._data = self._reconstruct_matrix(data_list)
 
-            if 'explored_data' + SparseParameter.IDENTIFIER in load_dict:
+            packed_names = self._build_packed_names()
+            if packed_names[-1] in load_dict:
+                idx_col = load_dict['explored_data' + SparseParameter.IDENTIFIER]
+                matrices = self._unpack_matrices(*[load_dict[name] for name in packed_names])
+
+                self._explored_range = [matrices[name_idx] for name_idx in idx_col]
+                self._explored = True
+
+            elif 'explored_data' + SparseParameter.IDENTIFIER in load_dict:
                 explore_table = load_dict['explored_data' + SparseParameter.IDENTIFIER]
 
                 idx_col = explore_table['idx']
@@ -1682,7 +1988,9 @@ class PickleParameter(Parameter):
 
     If you use the default HDF5 storage service, the pickle dumps are stored to disk.
     Works similar to the array parameter regarding memory management (Equality of objects
-    is based on object id).
+    is based on the pickle dumps). If the HDF5 storage service uses the blob store
+    (`blob_store=True`), the dumps are written into the content-addressed blob store of the
+    trajectory, so identical objects are stored only once per file.
 
     There is no straightforward check to guarantee that data is picklable, so you have to
     take care that all data handled by the PickleParameter supports pickling.
@@ -1728,6 +2036,10 @@ class PickleParameter(Parameter):
         """
         return True
 
+    def _get_range_dtype(self):
+        """Pickled ranges are never kept as typed arrays"""
+        return None
+
     @staticmethod
     def _build_name(name_id):
         """Formats names for storage
@@ -1737,12 +2049,22 @@ class PickleParameter(Parameter):
         """
         return 'xp_%08d' % name_id
 
+    def _store_flags(self):
+        """All pickle dumps are stored as blobs if the storage service supports it"""
+        store_flags = {'data': pypetconstants.BLOB}
+        if self.f_has_range():
+            # There are never more dumps than entries in the range
+            for name_id in range(len(self)):
+                store_flags[self._build_name(name_id)] = pypetconstants.BLOB
+        return store_flags
+
     def _store(self):
         """Returns a dictionary for storage.
 
         Every element in the dictionary except for 'explored_data' is a pickle dump.
 
-        Reusage of objects is identified over the object id, i.e. python's built-in id function.
+        Reusage of objects is identified over the pickle dumps. Objects
+        with the same id are pickled only once.
 
         'explored_data' contains the references to the objects to be able to recall the
         order of objects later on.
@@ -1760,28 +2082,27 @@ class PickleParameter(Parameter):
             store_dict['explored_data'] = \
                 ObjectTable(columns=['idx'], index=list(range(len(self))))
 
-            smart_dict = {}
-            count = 0
+            id_dict = {}
+            dump_dict = {}
 
             for idx, val in enumerate(self._explored_range):
 
                 obj_id = id(val)
 
-                if obj_id in smart_dict:
-                    name_id = smart_dict[obj_id]
-                    add = False
+                if obj_id in id_dict:
+                    name_id = id_dict[obj_id]
                 else:
-                    name_id = count
-                    add = True
+                    dump = pickle.dumps(val, protocol=self.v_protocol)
+                    if dump in dump_dict:
+                        name_id = dump_dict[dump]
+                    else:
+                        name_id = len(dump_dict)
+                        dump_dict[dump] = name_id
+                        store_dict[self._build_name(name_id)] = dump
+                    id_dict[obj_id] = name_id
 
-                name = self._build_name(name_id)
                 store_dict['explored_data']['idx'][idx] = name_id
 
-                if add:
-                    store_dict[name] = pickle.dumps(val, protocol=self.v_protocol)
-                    smart_dict[obj_id] = name_id
-                    count += 1
-
         self._locked = True
 
         return store_dict
@@ -1823,9 +2144,14 @@ class PickleParameter(Parameter):
             name_col = explore_table['idx']
 
             explore_list = []
+            loaded_dict = {}  # Every dump is unpickled only once
             for name_id in name_col:
-                arrayname = self._build_name(name_id)
-                loaded = pickle.loads(load_dict[arrayname])
+                if name_id in loaded_dict:
+                    loaded = loaded_dict[name_id]
+                else:
+                    arrayname = self._build_name(name_id)
+                    loaded = pickle.loads(load_dict[arrayname])
+                    loaded_dict[name_id] = loaded
                 explore_list.append(loaded)
 
             self._explored_range = explore_list
@@ -2409,6 +2735,10 @@ class PickleResult(Result):
 
     Note that it is not checked whether data can be pickled, so take care that it works!
 
+    If the HDF5 storage service uses the blob store (`blob_store=True`), the pickle dumps are
+    written into the content-addressed blob store of the trajectory. Hence, identical items of
+    different results are stored only once per file.
+
     You can pass the pickle protocol via `protocol=2` to the constructor or change it with
     the `v_protocol` property. Default protocol is 0.
 
@@ -2466,6 +2796,10 @@ class PickleResult(Result):
         self._data[name] = item
 
 
+    def _store_flags(self):
+        """All pickle dumps are stored as blobs if the storage service supports it"""
+        return dict((key, pypetconstants.BLOB) for key in self._data)
+
     def _store(self):
         """Returns a dictionary containing pickle dumps"""
         store_dict = {}
@@ -315,6 +315,10 @@ SHARED_DATA = 'SHARED_DATA_'
 NESTED_GROUP = 'NESTED_GROUP'
 """ An HDF5 group containing nested data """
 
+BLOB = 'BLOB'
+""" A pickle dump written once into the content-addressed blob store of a trajectory
+and hard linked into the group of a leaf """
+
 ############# LOGGING ############
 
 LOG_ENV = '$env'
@@ -7,10 +7,16 @@ Contains the standard :class:`~pypet.storageservice.HDF5StorageSerivce`.
 __author__ = 'Robert Meyer'
 
 import os
+import sys
 import warnings
 import time
 import hashlib
+import zlib
 import itertools as itools
+if sys.version_info < (2, 7, 0):
+    from ordereddict import OrderedDict
+else:
+    from collections import OrderedDict
 
 import tables as pt
 import tables.parameters as ptpa
@@ -138,6 +144,56 @@ class PTItemMock(object):
         self._v_attrs = DictWrap(dictionary)
 
 
+class LazyArray(object):
+    """Proxy to a numpy array of a result that stays on disk until it is indexed.
+
+    Returned by the :class:`~pypet.storageservice.HDF5StorageService` if results are
+    loaded with `load_mode='lazy'`. Indexing the proxy, e.g. `lazy_array[:, 1000:2000]`,
+    reads only the requested hyperslab from the hdf5 file. Accordingly, only the
+    chunks covering the slab are decompressed.
+    `numpy.asarray(lazy_array)` or `lazy_array[...]` read the whole array.
+
+    """
+    def __init__(self, storage_service, filename, trajectory_name, path, name, shape, dtype):
+        self._storage_service = storage_service
+        self._filename = filename
+        self._trajectory_name = trajectory_name
+        self._path = path
+        self._name = name
+        self.shape = shape
+        self.dtype = dtype
+
+    @property
+    def ndim(self):
+        """Number of dimensions of the array"""
+        return len(self.shape)
+
+    @property
+    def size(self):
+        """Number of elements of the array"""
+        return int(np.prod(self.shape))
+
+    def __len__(self):
+        return self.shape[0]
+
+    def __getitem__(self, item):
+        return self._storage_service.load(pypetconstants.ACCESS_DATA, self._path, self._name,
+                                          '__readslice__', (item,), None,
+                                          trajectory_name=self._trajectory_name,
+                                          filename=self._filename)
+
+    def __array__(self, dtype=None):
+        data = self[...]
+        if dtype is not None:
+            data = data.astype(dtype)
+        return data
+
+    def __repr__(self):
+        return '<%s %s (shape:%s, dtype:%s)>' % (self.__class__.__name__,
+                                                 '%s.%s' % (self._path, self._name),
+                                                 str(self.shape), str(self.dtype))
+
+
 class HDF5StorageService(StorageService, HasLogger):
     """Storage Service to handle the storage of a trajectory/parameters/results into hdf5 files.
 
@@ -208,6 +264,21 @@ class HDF5StorageService(StorageService, HasLogger):
         Whether or not to use the *Fletcher32* filter in the HDF5 library.
         This is used to add a checksum on hdf5 data.
 
+    :param storage_policy:
+
+        How filters and chunk shapes of chunked arrays (`CARRAY` and `EARRAY`) are chosen.
+        `'default'` uses `complib`, `complevel`, and `shuffle` from above and the chunk
+        shapes of PyTables for all arrays.
+        `'auto'` compresses a small sample of every numpy array first. Incompressible data
+        is stored without compression, all other data with the fast *blosc:lz4* compressor
+        and shuffling (or *zlib* at level 1 if blosc is not available).
+        Chunk shapes can be tuned to the expected access pattern by passing
+        `access='rows'` (reading `data[i]`) or `access='columns'` (reading `data[:, j]`)
+        or a dictionary mapping names of data items to these values
+        to :func:`~pypet.trajectory.Trajectory.f_store_item`. The chosen filters and chunk
+        shape are recorded in the `SRVC_POLICY` attribute of every hdf5 node.
+        Filters passed explicitly when storing an item always take precedence.
+
     :param pandas_format:
 
         How to store pandas data frames. Either in 'fixed' ('f') or 'table' ('t') format.
@@ -288,6 +359,51 @@ class HDF5StorageService(StorageService, HasLogger):
 
         Analogous to the above.
 
+    :param pack_scalar_results:
+
+        If results of single runs that contain only scalar data (e.g. integers, floats,
+        and strings) should be packed into tables instead of being stored as individual
+        hdf5 nodes. Results with the same name and location across all runs share a single
+        table and every run adds a row to it. This drastically reduces the number of
+        hdf5 nodes for trajectories with many runs. Results with annotations or
+        with data that does not match the table of the first stored run are stored
+        as usual. Loading is not affected by this setting, packed results are found
+        in any case.
+
+    :param columnar_results:
+
+        If results of single runs containing numpy arrays or numerical scalars should
+        be written into extendable arrays spanning all runs instead of being stored in every
+        single run group. For instance, all data of `results.runs.run_XXXXXXXX.mygroup.myresult`
+        is stored in `results.runs_columnar.mygroup.myresult` where the first axis of every
+        array is the run index. The boolean array `run_mask` marks which runs were stored.
+        Accordingly, the data of all runs can be loaded at once via the
+        `results.runs_columnar` branch of the trajectory. Results of single runs are still
+        loaded as usual. Results with annotations or with data not matching the arrays
+        of the first stored run are stored as usual. Columnar results take precedence over
+        packed scalar results if both options are enabled.
+
+    :param blob_store:
+
+        If pickle dumps of :class:`~pypet.parameter.PickleParameter` and
+        :class:`~pypet.parameter.PickleResult` should be written into the content-addressed
+        blob store (`overview/blobs`) of the trajectory. Identical dumps are written
+        only once and hard linked into the leaves. Files written this way cannot be read
+        by older versions of pypet. Loading is not affected by this setting,
+        blobs are found in any case.
+
+    :param load_mode:
+
+        How array data of results is loaded. `None` (default) reads all data into memory.
+        `'mmap'` returns read-only :class:`numpy.memmap` objects instead for numpy arrays
+        of results that are stored contiguously and uncompressed in the hdf5 file,
+        i.e. that were stored with the `ARRAY` instead of the default `CARRAY` flag.
+        Data is then only paged in from disk when accessed. All other data is read as usual.
+        The hdf5 file must not be modified as long as the memory maps are in use.
+        `'lazy'` returns a :class:`~pypet.storageservice.LazyArray` for every numpy array
+        of a result that only reads the hyperslabs that are indexed.
+        The mode can also be chosen per item via `f_load_item(..., load_mode='mmap')`.
+
     :param display_time:
 
         How often status messages about loading and storing time should be displayed.
@@ -436,6 +552,42 @@ class HDF5StorageService(StorageService, HasLogger):
     NESTED_GROUP = pypetconstants.NESTED_GROUP
     ''' An HDF5 data object containing nested data '''
 
+    BLOB = pypetconstants.BLOB
+    ''' A pickle dump that is written only once into the blob store of the trajectory '''
+
+    BLOB_GROUP = 'blobs'
+    ''' Name of the blob store group below the overview group '''
+
+    BLOB_HASH = 'SRVC_BLOB_HASH'
+    ''' Hdf5 attribute containing the content hash of a blob '''
+
+    BLOB_REFS = 'SRVC_BLOB_REFS'
+    ''' Hdf5 attribute counting the hard links to a blob outside of the blob store '''
+
+    BLOB_CACHE_BYTES = 2 ** 26
+    ''' Maximum bytes of pickle dumps kept in the in-process blob cache '''
+
+    PACKED_GROUP = 'packed_results'
+    ''' Name of the group below the overview group containing packed results '''
+
+    PACKED_RUN_IDX = 'SRVC_RUN_IDX'
+    ''' Column of a packed result table containing the run index '''
+
+    COLUMNAR_GROUP = 'runs_columnar'
+    ''' Name of the group below `results` containing run-spanning columnar results '''
+
+    COLUMNAR = 'SRVC_COLUMNAR'
+    ''' Whether an hdf5 node is a columnar result '''
+
+    COLUMNAR_MASK = 'run_mask'
+    ''' Name of the boolean array of a columnar result marking stored runs '''
+
+    COLUMNAR_SCALAR_TYPE = 'SRVC_COLUMNAR_SCALAR'
+    ''' Type of the scalars stored into a columnar array '''
+
+    COLUMNAR_PADDING_SIZE = 2 ** 24
+    ''' Maximum bytes of zeros appended at once to fill rows of columnar arrays '''
+
     TYPE_FLAG_MAPPING = {
         ObjectTable: TABLE,
         list: ARRAY,
@@ -490,6 +642,26 @@ class HDF5StorageService(StorageService, HasLogger):
     LEAF = 'SRVC_LEAF'
     ''' Whether an hdf5 node is a leaf node'''
 
+    DEFAULT_POLICY = 'default'
+    ''' Storage policy using the filters of the service for all arrays'''
+    AUTO_POLICY = 'auto'
+    ''' Storage policy choosing filters and chunk shapes for every array'''
+    STORAGE_POLICY = 'SRVC_POLICY'
+    ''' Hdf5 attribute recording the filters and chunk shape chosen by the storage policy'''
+    POLICY_SAMPLE_SIZE = 2 ** 16
+    ''' Bytes of an array compressed to probe its compressibility'''
+    POLICY_MIN_RATIO = 0.9
+    ''' Data with a larger compression ratio of the probe is stored without compression'''
+    POLICY_CHUNK_SIZE = 2 ** 17
+    ''' Bytes per chunk if chunk shapes are chosen by the storage policy'''
+    POLICY_ACCESS = ('rows', 'columns')
+    ''' Access patterns understood by the storage policy'''
+
+    MMAP = 'mmap'
+    ''' Load mode returning memory maps of contiguous arrays instead of reading them'''
+    LAZY = 'lazy'
+    ''' Load mode returning proxies of arrays that are read on indexing'''
+
     def __init__(self, filename=None,
                  file_title=None,
                  overwrite_file=False,
@@ -498,6 +670,7 @@ class HDF5StorageService(StorageService, HasLogger):
                  complib='zlib',
                  shuffle=True,
                  fletcher32=False,
+                 storage_policy='default',
                  pandas_format='fixed',
                  purge_duplicate_comments=True,
                  summary_tables=True,
@@ -505,6 +678,10 @@ class HDF5StorageService(StorageService, HasLogger):
                  large_overview_tables=False,
                  results_per_run=0,
                  derived_parameters_per_run=0,
+                 pack_scalar_results=False,
+                 columnar_results=False,
+                 blob_store=False,
+                 load_mode=None,
                  display_time=20,
                  trajectory=None):
 
@@ -513,6 +690,12 @@ class HDF5StorageService(StorageService, HasLogger):
         if purge_duplicate_comments and not summary_tables:
             raise ValueError('You cannot purge duplicate comments without having the'
                              ' small overview tables.')
+        self._check_load_mode(load_mode)
+        if storage_policy not in (HDF5StorageService.DEFAULT_POLICY,
+                                  HDF5StorageService.AUTO_POLICY):
+            raise ValueError('Storage policy `%s` is not understood, use `%s` or `%s`.' %
+                             (str(storage_policy), HDF5StorageService.DEFAULT_POLICY,
+                              HDF5StorageService.AUTO_POLICY))
 
         # Prepare file names and log folder
         if file_title is None and trajectory is not None:
@@ -560,6 +743,7 @@ class HDF5StorageService(StorageService, HasLogger):
         self._fletcher32 = fletcher32
         self._shuffle = shuffle
         self._encoding = encoding
+        self._storage_policy = storage_policy
 
         self._node_processing_timer = None
 
@@ -570,6 +754,10 @@ class HDF5StorageService(StorageService, HasLogger):
         self._purge_duplicate_comments = purge_duplicate_comments
         self._results_per_run = results_per_run
         self._derived_parameters_per_run = derived_parameters_per_run
+        self._pack_scalar_results = pack_scalar_results
+        self._columnar_results = columnar_results
+        self._blob_store = blob_store
+        self._load_mode = load_mode
 
         self._overview_parameters = small_overview_tables
         self._overview_config = small_overview_tables
@@ -580,6 +768,10 @@ class HDF5StorageService(StorageService, HasLogger):
         self._overview_results_summary = summary_tables
 
         self._overview_group_ = None  # to cache link to overview
+        self._blob_group_ = None  # to cache link to the blob store
+        self._blob_cache = OrderedDict()  # maps content hashes to pickle dumps
+        self._blob_cache_bytes = 0  # total size of the dumps in the cache
+        self._packed_rows = {}  # maps packed tables to dicts of run indices and row numbers
 
         self._disable_logger = DisableAllLogging()
 
@@ -635,6 +827,24 @@ class HDF5StorageService(StorageService, HasLogger):
     def display_time(self, display_time):
         self._display_time = display_time
 
+    @property
+    def load_mode(self):
+        """How array data of results is loaded, `None`, `'mmap'`, or `'lazy'`"""
+        return self._load_mode
+
+    @load_mode.setter
+    def load_mode(self, load_mode):
+        self._check_load_mode(load_mode)
+        self._load_mode = load_mode
+
+    @staticmethod
+    def _check_load_mode(load_mode):
+        """Raises a ValueError if `load_mode` is not understood"""
+        if load_mode not in (None, HDF5StorageService.MMAP, HDF5StorageService.LAZY):
+            raise ValueError('Load mode `%s` is not understood, use `None`, `%s`, or `%s`.' %
+                             (str(load_mode), HDF5StorageService.MMAP,
+                              HDF5StorageService.LAZY))
+
     @property
     def complib(self):
         """Compression library used"""
@@ -703,6 +913,21 @@ class HDF5StorageService(StorageService, HasLogger):
             self._overview_group_ = self._all_create_or_get_groups('overview')[0]
         return self._overview_group_
 
+    @property
+    def _blob_group(self):
+        """Direct link to the blob store of the current trajectory"""
+        if self._blob_group_ is None:
+            self._blob_group_ = self._all_create_or_get_group(HDF5StorageService.BLOB_GROUP,
+                                                              self._overview_group)[0]
+        return self._blob_group_
+
+    def __getstate__(self):
+        """The blob cache is not pickled"""
+        result = super(HDF5StorageService, self).__getstate__()
+        result['_blob_cache'] = OrderedDict()
+        result['_blob_cache_bytes'] = 0
+        return result
+
     def _all_get_filters(self, kwargs=None):
         """Makes filters
 
@@ -777,6 +1002,21 @@ class HDF5StorageService(StorageService, HasLogger):
                     comment='Expected number of derived parameters per run,'
                             ' a good guess can increase storage performance')
 
+        _set_config('hdf5.pack_scalar_results', self._pack_scalar_results,
+                    comment='Whether scalar results of single runs are packed into '
+                            'tables spanning all runs')
+
+        _set_config('hdf5.columnar_results', self._columnar_results,
+                    comment='Whether results of single runs are written into '
+                            'arrays spanning all runs')
+
+        _set_config('hdf5.blob_store', self._blob_store,
+                    comment='Whether pickle dumps are written into the blob store')
+
+        _set_config('hdf5.storage_policy', self._storage_policy,
+                    comment='How filters and chunk shapes of arrays are chosen, '
+                            '`default` or `auto`')
+
         _set_config('hdf5.complevel', self._complevel,
                     comment='Compression Level (0 no compression '
                             'to 9 highest compression)')
@@ -886,6 +1126,20 @@ class HDF5StorageService(StorageService, HasLogger):
                     that should NOT be loaded here. You cannot use `load_except` and
                     `load_only` at the same time.
 
+                :param load_mode:
+
+                    Overrides the `load_mode` of the service for this item,
+                    `'mmap'` returns read-only memory maps of contiguous arrays and
+                    `'lazy'` returns proxies that read arrays only when indexed.
+
+                :param load_slice:
+
+                    If you load a result, you can read only a part of its numpy arrays and
+                    tables. Either an index expression applied to all arrays and tables,
+                    for example `load_slice=np.s_[:, 1000:2000]`, or a dictionary
+                    mapping names of data items to index expressions. Only the
+                    requested hyperslabs are read from disk.
+
             * :const:`pypet.pyetconstants.GROUP`
 
                 Loads a group a node (comment and annotations)
@@ -927,6 +1181,11 @@ class HDF5StorageService(StorageService, HasLogger):
 
                 Analogous to :ref:`storing lists <store-lists>`
 
+            * :const:`pypet.pypetconstants.ACCESS_DATA`
+
+                Reads data within the storage, same parameters as for storing but
+                only requests that do not modify the data are allowed.
+
         :raises:
 
             NoSuchServiceError if message or data is not understood
@@ -954,6 +1213,9 @@ class HDF5StorageService(StorageService, HasLogger):
             elif msg == pypetconstants.LIST:
                 self._srvc_load_several_items(stuff_to_load, *args, **kwargs)
 
+            elif msg == pypetconstants.ACCESS_DATA:
+                return self._hdf5_interact_with_data(stuff_to_load, *args, **kwargs)
+
             else:
                 raise pex.NoSuchServiceError('I do not know how to handle `%s`' % msg)
 
@@ -1150,6 +1412,12 @@ class HDF5StorageService(StorageService, HasLogger):
                             Store stuff as pytable but reconstructs it later as dictionary
                             on loading
 
+                        :const:`~pypet.HDF5StorageService.BLOB` ('BLOB')
+
+                            Store a pickle dump only once in the blob store of the
+                            trajectory and hard link it into the leaf's group.
+                            Identical dumps share the same data on disk.
+
                         :const:`~pypet.HDF%StorageService.FRAME` ('FRAME')
 
                             Store stuff as pandas data frame
@@ -1398,6 +1666,16 @@ class HDF5StorageService(StorageService, HasLogger):
                                      'using (default) value `%s`.' %
                                      (name, str(getattr(self, attr_name))))
 
+        for attr_name in ('pack_scalar_results', 'columnar_results', 'blob_store',
+                          'storage_policy'):
+            try:
+                config = traj.f_get('config.hdf5.' + attr_name).f_get()
+                setattr(self, '_' + attr_name, config)
+            except AttributeError:
+                self._logger.debug('Could not find `%s` in traj config, '
+                                   'using (default) value `%s`.' %
+                                   (attr_name, str(getattr(self, '_' + attr_name))))
+
         if ((not self._overview_results_summary or
                     not self._overview_derived_parameters_summary) and
                     self._purge_duplicate_comments):
@@ -1538,6 +1816,8 @@ class HDF5StorageService(StorageService, HasLogger):
             self._node_processing_timer = NodeProcessingTimer(display_time=self._display_time,
                                                               logger_name=self._logger.name)
             self._overview_group_ = None
+            self._blob_group_ = None
+            self._packed_rows = {}
 
             return True
         else:
@@ -1582,6 +1862,8 @@ class HDF5StorageService(StorageService, HasLogger):
             self._trajectory_name = None
             self._trajectory_index = None
             self._overview_group_ = None
+            self._blob_group_ = None
+            self._packed_rows = {}
             self._logger.debug('Closing HDF5 file')
             return True
         else:
@@ -1696,7 +1978,13 @@ class HDF5StorageService(StorageService, HasLogger):
                 new_short_name = split_name[-1]
 
                 # Get the data from the other trajectory
-                old_node = ptcompat.get_node(other_file, old_location)
+                try:
+                    old_node = ptcompat.get_node(other_file, old_location)
+                except pt.NoSuchNodeError:
+                    if self._trj_merge_packed_row(other_file, other_trajectory_name,
+                                                  old_name, new_name, move_nodes):
+                        continue
+                    raise
 
                 # Now move or copy the data
                 if move_nodes:
@@ -1726,6 +2014,66 @@ class HDF5StorageService(StorageService, HasLogger):
                 other_file.flush()
                 other_file.close()
 
+    def _trj_merge_packed_row(self, other_file, other_trajectory_name, old_name, new_name,
+                              move_nodes):
+        """Copies a packed result of another trajectory into the current one.
+
+        :return: `False` if the result in the other trajectory was not packed
+
+        """
+        old_location, old_run_idx = self._prm_get_packed_location(old_name)
+        new_location, new_run_idx = self._prm_get_packed_location(new_name)
+        if old_location is None or new_location is None:
+            return False
+
+        split_name = old_name.split('.')
+        columnar_location = self._prm_get_columnar_location(old_name, split_name[2])
+        if (columnar_location is not None and
+                '/' + other_trajectory_name + '/' + columnar_location in other_file):
+            raise ValueError('Cannot merge `%s`, it is part of a columnar result. Please use '
+                             '`slow_merge=True` to merge columnar results.' % old_name)
+        try:
+            old_table = ptcompat.get_node(other_file,
+                                          '/' + other_trajectory_name + '/overview/' +
+                                          HDF5StorageService.PACKED_GROUP + '/' + old_location)
+        except pt.NoSuchNodeError:
+            return False
+        row_numbers = np.nonzero(old_table.col(HDF5StorageService.PACKED_RUN_IDX) ==
+                                 old_run_idx)[0]
+        if len(row_numbers) == 0:
+            return False
+        row_number = int(row_numbers[0])
+
+        split_location = new_location.split('/')
+        table_name = split_location.pop()
+        where, _ = self._all_create_or_get_groups('.'.join(split_location),
+                                                  start_hdf5_group=self._all_create_or_get_group(
+                                                      HDF5StorageService.PACKED_GROUP,
+                                                      self._overview_group)[0])
+        if table_name in where:
+            new_table = ptcompat.get_child(where, table_name)
+            if new_table.coldtypes != old_table.coldtypes:
+                raise ValueError('Cannot merge packed result `%s` into `%s`, the data '
+                                 'does not match.' % (old_name, new_name))
+        else:
+            # Copy the table including its attributes but without any data
+            new_table = ptcompat.copy_node(self._hdf5file, where=old_table, newparent=where,
+                                           newname=table_name, start=0, stop=0)
+
+        new_row = old_table.read(row_number, row_number + 1)
+        new_row[HDF5StorageService.PACKED_RUN_IDX] = new_run_idx
+        new_table.append(new_row)
+        new_table.flush()
+        self._packed_rows.pop(new_table._v_pathname, None)
+
+        if move_nodes:
+            if old_table.nrows == 1:
+                old_table._f_remove()
+            else:
+                ptcompat.remove_rows(old_table, start=row_number, stop=row_number + 1)
+            self._packed_rows.pop(old_table._v_pathname, None)
+        return True
+
     def _trj_prepare_merge(self, traj, changed_parameters, old_length):
         """Prepares a trajectory for merging.
 
@@ -2144,7 +2492,15 @@ class HDF5StorageService(StorageService, HasLogger):
 
         if current_depth <= max_depth:
             # Then load recursively all data in the last group and below
-            _hdf5_group = getattr(_hdf5_group, final_group_name)
+            try:
+                _hdf5_group = getattr(_hdf5_group, final_group_name)
+            except pt.NoSuchNodeError:
+                # The final node might be a result packed into a table
+                if self._tree_load_packed_leaves(traj_node, load_data=load_data,
+                                                 trajectory=_trajectory, as_new=_as_new,
+                                                 names=(final_group_name,)):
+                    return
+                raise
             self._tree_load_nodes_dfs(traj_node, load_data=load_data, with_links=with_links,
                                   recursive=recursive, max_depth=max_depth,
                                   current_depth=current_depth, trajectory=_trajectory,
@@ -2706,7 +3062,8 @@ class HDF5StorageService(StorageService, HasLogger):
                     traj_group = parent_traj_node._children[name]
 
                     if load_data == pypetconstants.OVERWRITE_DATA:
-                        traj_group.v_annotations.f_empty()
+                        if traj_group._has_annotations():
+                            traj_group.v_annotations.f_empty()
                         traj_group.v_comment = ''
                 else:
                     if HDF5StorageService.CLASS_NAME in hdf5_group._v_attrs:
@@ -2733,6 +3090,69 @@ class HDF5StorageService(StorageService, HasLogger):
                             new_hdf5_group = children[new_hdf5_group_name]
                             loading_list.append((traj_group, new_depth, new_hdf5_group))
 
+                    self._tree_load_packed_leaves(traj_group, load_data=load_data,
+                                                  trajectory=trajectory, as_new=as_new)
+
+    def _tree_load_packed_leaves(self, traj_group, load_data, trajectory, as_new, names=None):
+        """Loads all results below `traj_group` that were packed into tables.
+
+        :param traj_group: The group containing the packed results
+        :param load_data: How to load the data
+        :param trajectory: The trajectory object
+        :param as_new: If trajectory is loaded as new
+        :param names: Names of the packed results to load, `None` loads all of them
+
+        :return: Number of loaded results
+
+        """
+        location, run_idx = self._prm_get_packed_location(traj_group.v_full_name,
+                                                          traj_group.v_run_branch)
+        if location is None:
+            return 0
+
+        candidates = []
+        try:
+            packed_group = ptcompat.get_node(self._hdf5file,
+                                             self._overview_group._v_pathname + '/' +
+                                             HDF5StorageService.PACKED_GROUP + '/' + location)
+            for name, table in packed_group._v_leaves.items():
+                row_number = self._prm_get_packed_rows(table).get(run_idx)
+                if row_number is not None:
+                    candidates.append((name, table, row_number))
+        except pt.NoSuchNodeError:
+            pass
+
+        columnar_location = self._prm_get_columnar_location(traj_group.v_full_name,
+                                                            traj_group.v_run_branch)
+        if columnar_location is not None:
+            try:
+                columnar_group = ptcompat.get_node(self._hdf5file,
+                                                   self._trajectory_group._v_pathname + '/' +
+                                                   columnar_location)
+                for name, group in columnar_group._v_groups.items():
+                    if self._prm_has_columnar_row(group, run_idx):
+                        candidates.append((name, group, run_idx))
+            except pt.NoSuchNodeError:
+                pass
+
+        loaded = 0
+        for name, node, row_number in candidates:
+            if names is not None and name not in names:
+                continue
+
+            if name in traj_group._children:
+                instance = traj_group._children[name]
+            else:
+                instance = self._tree_create_leaf(name, trajectory, node)
+                traj_group._add_leaf_from_storage(args=(instance,), kwargs={})
+
+            self._prm_load_packed_result(instance, load_data, node, row_number)
+            if as_new:
+                instance._stored = False
+            loaded += 1
+
+        return loaded
+
     def _tree_load_link(self, new_traj_node, load_data, traj, as_new, hdf5_soft_link):
         """ Loads a link
         
@@ -2796,42 +3216,70 @@ class HDF5StorageService(StorageService, HasLogger):
         if max_depth is None:
             max_depth = float('inf')
 
-        store_list = [(parent_traj_node, name, current_depth, parent_hdf5_group)]
-
-        while store_list:
-            parent_traj_node, name, current_depth, parent_hdf5_group = store_list.pop()
+        new_hdf5_group = self._tree_store_node(parent_traj_node, name, store_data, with_links,
+                                               max_depth, parent_hdf5_group)
+        if new_hdf5_group is None or not recursive:
+            return
 
-            # Check if we create a link
-            if name in parent_traj_node._links:
-                if with_links:
-                    self._tree_store_link(parent_traj_node, name, parent_hdf5_group)
-                continue
+        # Traverse the subtree depth first, children are expanded after their parent was
+        # stored, so the hdf5 group of the parent does exist. Only the hdf5 groups along the
+        # current path are kept, `hdf5_groups[depth]` is the group of the last node
+        # at `depth`. Once a node at `depth` is visited, all groups deeper than that are done
+        # and their handles are released.
+        traj_node = parent_traj_node._children[name]
+        hdf5_groups = [new_hdf5_group]
+        for depth, name, traj_node, parent_traj_node in nn.NaturalNamingInterface._traverse(
+                traj_node, max_depth=max_depth - current_depth, depth_first=True,
+                follow_links=False):
+            del hdf5_groups[depth:]
+            parent_hdf5_group = hdf5_groups[depth - 1]
+            new_hdf5_group = self._tree_store_node(parent_traj_node, name, store_data,
+                                                   with_links, max_depth, parent_hdf5_group)
+            if new_hdf5_group is not None:
+                hdf5_groups.append(new_hdf5_group)
+
+    def _tree_store_node(self, parent_traj_node, name, store_data, with_links, max_depth,
+                         parent_hdf5_group):
+        """Stores a single node to hdf5 without its children.
+
+        :return: The hdf5 group of the node if it is a group node, otherwise `None`
 
-            traj_node = parent_traj_node._children[name]
+        """
+        # Check if we create a link
+        if name in parent_traj_node._links:
+            if with_links:
+                self._tree_store_link(parent_traj_node, name, parent_hdf5_group)
+            return None
 
-            # If the node does not exist in the hdf5 file create it
-            if not hasattr(parent_hdf5_group, name):
-                newly_created = True
-                new_hdf5_group = ptcompat.create_group(self._hdf5file, where=parent_hdf5_group,
-                                                       name=name, filters=self._all_get_filters())
-            else:
-                newly_created = False
-                new_hdf5_group = getattr(parent_hdf5_group, name)
+        traj_node = parent_traj_node._children[name]
 
-            if traj_node.v_is_leaf:
-                self._prm_store_parameter_or_result(traj_node, store_data=store_data,
-                                                     _hdf5_group=new_hdf5_group,
-                                                    _newly_created=newly_created)
+        if (traj_node.v_is_leaf and
+                (self._pack_scalar_results or self._columnar_results) and
+                not hasattr(parent_hdf5_group, name)):
+            # The leaf might be packed into a table instead of getting its own node
+            self._prm_store_parameter_or_result(traj_node, store_data=store_data)
+            return None
 
-            else:
-                self._grp_store_group(traj_node, store_data=store_data, with_links=with_links,
-                                      recursive=False, max_depth=max_depth,
-                                      _hdf5_group=new_hdf5_group,
-                                      _newly_created=newly_created)
+        # If the node does not exist in the hdf5 file create it
+        if not hasattr(parent_hdf5_group, name):
+            newly_created = True
+            new_hdf5_group = ptcompat.create_group(self._hdf5file, where=parent_hdf5_group,
+                                                   name=name, filters=self._all_get_filters())
+        else:
+            newly_created = False
+            new_hdf5_group = getattr(parent_hdf5_group, name)
 
-                if recursive and current_depth < max_depth:
-                    for child in compat.iterkeys(traj_node._children):
-                        store_list.append((traj_node, child, current_depth + 1, new_hdf5_group))
+        if traj_node.v_is_leaf:
+            self._prm_store_parameter_or_result(traj_node, store_data=store_data,
+                                                 _hdf5_group=new_hdf5_group,
+                                                _newly_created=newly_created)
+            return None
+        else:
+            self._grp_store_group(traj_node, store_data=store_data, with_links=with_links,
+                                  recursive=False, max_depth=max_depth,
+                                  _hdf5_group=new_hdf5_group,
+                                  _newly_created=newly_created)
+            return new_hdf5_group
 
     def _tree_store_link(self, node_in_traj, link, hdf5_group):
         """Creates a soft link.
@@ -3529,7 +3977,7 @@ class HDF5StorageService(StorageService, HasLogger):
                 self._hdf5file.flush()
 
         # Only store annotations if the item has some
-        if not item_with_annotations.v_annotations.f_is_empty():
+        if item_with_annotations._has_annotations():
 
             anno_dict = item_with_annotations.v_annotations._dict
 
@@ -3644,7 +4092,8 @@ class HDF5StorageService(StorageService, HasLogger):
                 return
 
             elif load_data == pypetconstants.OVERWRITE_DATA:
-                traj_group.v_annotations.f_empty()
+                if traj_group._has_annotations():
+                    traj_group.v_annotations.f_empty()
                 traj_group.v_comment = ''
 
             self._all_load_skeleton(traj_group, _hdf5_group)
@@ -3655,7 +4104,7 @@ class HDF5StorageService(StorageService, HasLogger):
 
     def _all_load_skeleton(self, traj_node, hdf5_group):
         """Reloads skeleton data of a tree node"""
-        if traj_node.v_annotations.f_is_empty():
+        if not traj_node._has_annotations():
             self._ann_load_annotations(traj_node, hdf5_group)
         if traj_node.v_comment == '':
             comment = self._all_get_from_attrs(hdf5_group, HDF5StorageService.COMMENT)
@@ -3690,6 +4139,22 @@ class HDF5StorageService(StorageService, HasLogger):
                         raise pex.NoSuchServiceError('I cannot store `%s`, I do not understand the'
                                                      'type `%s`.' % (key, str(dtype)))
 
+    @staticmethod
+    def _prm_check_store_dict(store_dict, fullname):
+        """Checks that `store_dict` does not contain proxies of data on disk.
+
+        Memory maps are replaced by plain numpy arrays viewing the same memory.
+
+        """
+        for key, data in compat.listitems(store_dict):
+            if type(data) is np.memmap:
+                store_dict[key] = data.view(np.ndarray)
+            elif type(data) is LazyArray:
+                raise pex.NoSuchServiceError('I cannot store `%s` of `%s`, it is a lazily loaded '
+                                             'array still on disk. Load it completely, e.g. via '
+                                             '`numpy.asarray`, before storing it.' %
+                                             (key, fullname))
+
     def _prm_meta_add_summary(self, instance):
         """Adds data to the summary tables and returns if `instance`s comment has to be stored.
 
@@ -3791,14 +4256,16 @@ class HDF5StorageService(StorageService, HasLogger):
         except Exception as exc:
             self._logger.error('Could not store information table due to `%s`.' % repr(exc))
 
-        if ((not self._purge_duplicate_comments or definitely_store_comment) and
-                    instance.v_comment != ''):
-            # Only add the comment if necessary
-            setattr(group._v_attrs, HDF5StorageService.COMMENT, instance.v_comment)
+        if group is not None:
+            # Packed results have no group of their own
+            if ((not self._purge_duplicate_comments or definitely_store_comment) and
+                        instance.v_comment != ''):
+                # Only add the comment if necessary
+                setattr(group._v_attrs, HDF5StorageService.COMMENT, instance.v_comment)
 
-        # Add class name and whether node is a leaf to the HDF5 attributes
-        setattr(group._v_attrs, HDF5StorageService.CLASS_NAME, instance.f_get_class_name())
-        setattr(group._v_attrs, HDF5StorageService.LEAF, True)
+            # Add class name and whether node is a leaf to the HDF5 attributes
+            setattr(group._v_attrs, HDF5StorageService.CLASS_NAME, instance.f_get_class_name())
+            setattr(group._v_attrs, HDF5StorageService.LEAF, True)
 
         if instance.v_is_parameter and instance.v_explored:
             # If the stored parameter was an explored one we need to mark this in the
@@ -3817,12 +4284,23 @@ class HDF5StorageService(StorageService, HasLogger):
                                    'table due to `%s`.' % repr(exc))
 
     def _prm_store_from_dict(self, fullname, store_dict, hdf5_group, store_flags, kwargs):
-        """Stores a `store_dict`"""
+        """Stores a `store_dict`
+
+        :return: If data already on disk was extended
+
+        """
+        extended = False
+        access = kwargs.pop('access', None)
+        self._prm_check_access(access)
         for key, data_to_store in store_dict.items():
             # self._logger.log(1, 'SUB-Storing %s [%s]', key, str(store_dict[key]))
             original_hdf5_group = None
 
             flag = store_flags[key]
+            if isinstance(access, dict):
+                key_access = access.get(key, None)
+            else:
+                key_access = access
 
             if '.' in key:
                 original_hdf5_group = hdf5_group
@@ -3842,10 +4320,18 @@ class HDF5StorageService(StorageService, HasLogger):
 
             # Iterate through the data and store according to the storage flags
             if key in hdf5_group:
-                # We won't change any data that is found on disk
-                self._logger.debug(
-                    'Found %s already in hdf5 node of %s, so I will ignore it.' %
-                    (key, fullname))
+                if flag == HDF5StorageService.EARRAY:
+                    # Extendable arrays are appended to
+                    extended = self._prm_extend_earray(key, data_to_store, hdf5_group,
+                                                       fullname, access=key_access,
+                                                       **kwargs) or extended
+                else:
+                    # We won't change any data that is found on disk
+                    self._logger.debug(
+                        'Found %s already in hdf5 node of %s, so I will ignore it.' %
+                        (key, fullname))
+                if original_hdf5_group is not None:
+                    hdf5_group = original_hdf5_group
                 continue
 
             if flag == HDF5StorageService.TABLE:
@@ -3860,12 +4346,14 @@ class HDF5StorageService(StorageService, HasLogger):
                 # self._logger.log(1, 'SUB-Storing %s ARRAY', key)
                 self._prm_write_into_array(key, data_to_store, hdf5_group, fullname,
                                            **kwargs)
+            elif flag == HDF5StorageService.BLOB:
+                self._prm_write_blob(key, data_to_store, hdf5_group, fullname, **kwargs)
             elif flag in (HDF5StorageService.CARRAY,
                           HDF5StorageService.EARRAY,
                           HDF5StorageService.VLARRAY):
                 self._prm_write_into_other_array(key, data_to_store,
                                                  hdf5_group, fullname,
-                                                 flag=flag, **kwargs)
+                                                 flag=flag, access=key_access, **kwargs)
             elif flag in (HDF5StorageService.SERIES,
                           HDF5StorageService.FRAME,
                           HDF5StorageService.PANEL):
@@ -3881,6 +4369,8 @@ class HDF5StorageService(StorageService, HasLogger):
             if original_hdf5_group is not None:
                 hdf5_group = original_hdf5_group
 
+        return extended
+
     def _prm_store_parameter_or_result(self,
                                        instance,
                                        store_data=pypetconstants.STORE_DATA,
@@ -3940,6 +4430,12 @@ class HDF5StorageService(StorageService, HasLogger):
         self._logger.debug('Storing `%s`.' % fullname)
 
         if _hdf5_group is None:
+            if ((self._pack_scalar_results or self._columnar_results) and
+                    not self._trajectory_group._v_pathname + '/' +
+                        fullname.replace('.', '/') in self._hdf5file and
+                    (self._prm_store_columnar_result(instance, overwrite) or
+                     self._prm_store_packed_result(instance, overwrite))):
+                return
             # If no group is provided we might need to create one
             _hdf5_group, _newly_created = self._all_create_or_get_groups(fullname)
 
@@ -3954,6 +4450,7 @@ class HDF5StorageService(StorageService, HasLogger):
             # Get the data to store from the instance
             if not instance.f_is_empty():
                 store_dict = instance._store()
+                self._prm_check_store_dict(store_dict, instance.v_full_name)
             try:
                 # Ask the instance for storage flags
                 instance_flags = instance._store_flags().copy() # copy to avoid modifying the
@@ -3962,6 +4459,12 @@ class HDF5StorageService(StorageService, HasLogger):
                 # If it does not provide any, set it to the empty dictionary
                 instance_flags = {}
 
+            if not self._blob_store:
+                # Without the blob store pickle dumps are stored like any other data
+                instance_flags = dict((key, flag) for key, flag in
+                                      compat.iteritems(instance_flags)
+                                      if flag != HDF5StorageService.BLOB)
+
             # User specified flags have priority over the flags from the instance
             instance_flags.update(store_flags)
             store_flags = instance_flags
@@ -4000,12 +4503,13 @@ class HDF5StorageService(StorageService, HasLogger):
                                      'Please pass `True` of a list of strings to fine grain '
                                      'overwriting.' % str(overwrite))
 
-            self._prm_store_from_dict(fullname, store_dict, _hdf5_group, store_flags, kwargs)
+            extended = self._prm_store_from_dict(fullname, store_dict, _hdf5_group,
+                                                 store_flags, kwargs)
 
             # Store annotations
             self._ann_store_annotations(instance, _hdf5_group, overwrite=overwrite)
 
-            if _newly_created or overwrite is True:
+            if _newly_created or overwrite is True or extended:
                 # If we created a new group or the parameter was extended we need to
                 # update the meta information and summary tables
                 self._prm_add_meta_info(instance, _hdf5_group,
@@ -4025,12 +4529,440 @@ class HDF5StorageService(StorageService, HasLogger):
             for key in store_dict.keys():
                 if key in  _hdf5_group:
                     hdf5_child = ptcompat.get_child(_hdf5_group, key)
+                    self._prm_release_blobs(hdf5_child)
                     hdf5_child._f_remove(recursive=True)
             # If no data left delete the whole parameter
             if _hdf5_group._v_nchildren == 0:
                 _hdf5_group._f_remove(recursive=True)
             raise
 
+    @staticmethod
+    def _prm_get_packed_location(full_name, run_branch=None):
+        """Returns the location of a packed table relative to the packed results group
+        and the run index.
+
+        The name of the single run and of its run set are replaced by
+        `run_ALL` and `run_set_ALL`, respectively, so that items of all runs share
+        a location. If `run_branch` is not given it is guessed from the `full_name`.
+
+        :return: Tuple of location and run index or `(None, None)` if `full_name` is not
+            part of a single run.
+
+        """
+        split_name = full_name.split('.')
+        if run_branch is None:
+            # Pick the last name that looks like a single run
+            for name in split_name:
+                if (name.startswith(pypetconstants.RUN_NAME) and
+                        name[len(pypetconstants.RUN_NAME):].isdigit()):
+                    run_branch = name
+        if (run_branch is None or run_branch == 'trajectory' or
+                not run_branch[len(pypetconstants.RUN_NAME):].isdigit()):
+            return None, None
+
+        run_idx = int(run_branch[len(pypetconstants.RUN_NAME):])
+        for idx, name in enumerate(split_name):
+            if name == run_branch:
+                split_name[idx] = pypetconstants.RUN_NAME_DUMMY
+            elif name.startswith(pypetconstants.SET_NAME):
+                split_name[idx] = pypetconstants.SET_NAME_DUMMY
+        return '/'.join(split_name), run_idx
+
+    def _prm_get_packed_rows(self, table):
+        """Returns a dictionary mapping run indices to row numbers of a packed `table`"""
+        rows = self._packed_rows.get(table._v_pathname)
+        if rows is None:
+            run_indices = table.col(HDF5StorageService.PACKED_RUN_IDX)
+            rows = dict((int(run_idx), row_number)
+                        for row_number, run_idx in enumerate(run_indices))
+            self._packed_rows[table._v_pathname] = rows
+        return rows
+
+    @staticmethod
+    def _prm_get_columnar_location(full_name, run_branch):
+        """Returns the hdf5 location of a columnar item relative to the trajectory group.
+
+        For example, `results.runs.run_00000003.mygroup.myresult` is mapped to
+        `results/runs_columnar/mygroup/myresult`.
+
+        :return: The location or `None` if `full_name` does not belong to a
+            group below `results.runs`.
+
+        """
+        split_name = full_name.split('.')
+        if (len(split_name) < 3 or split_name[0] != 'results' or split_name[1] != 'runs' or
+                split_name[2] != run_branch):
+            return None
+        return '/'.join(['results', HDF5StorageService.COLUMNAR_GROUP] + split_name[3:])
+
+    @staticmethod
+    def _prm_has_columnar_row(group, run_idx):
+        """Checks if `group` is a columnar result containing data of run `run_idx`"""
+        if not getattr(group._v_attrs, HDF5StorageService.COLUMNAR, False):
+            return False
+        run_mask = ptcompat.get_child(group, HDF5StorageService.COLUMNAR_MASK)
+        return run_idx < run_mask.nrows and bool(run_mask[run_idx])
+
+    def _prm_get_packed_row(self, full_name, run_branch=None):
+        """Returns the packed table or columnar group and the row number of an item.
+
+        Returns `None` if the item was neither packed nor stored in columnar format.
+
+        """
+        location, run_idx = self._prm_get_packed_location(full_name, run_branch)
+        if location is None:
+            return None
+        try:
+            table = ptcompat.get_node(self._hdf5file,
+                                      self._overview_group._v_pathname + '/' +
+                                      HDF5StorageService.PACKED_GROUP + '/' + location)
+            row_number = self._prm_get_packed_rows(table).get(run_idx)
+            if row_number is not None:
+                return table, row_number
+        except pt.NoSuchNodeError:
+            pass
+
+        columnar_location = self._prm_get_columnar_location(full_name, run_branch)
+        if columnar_location is not None:
+            try:
+                group = ptcompat.get_node(self._hdf5file,
+                                          self._trajectory_group._v_pathname + '/' +
+                                          columnar_location)
+                if self._prm_has_columnar_row(group, run_idx):
+                    return group, run_idx
+            except pt.NoSuchNodeError:
+                pass
+        return None
+
+    def _prm_remove_packed_row(self, node, row_number):
+        """Removes a single row from a packed table or a columnar result"""
+        if not isinstance(node, pt.Table):
+            # Columnar data is only masked
+            run_mask = ptcompat.get_child(node, HDF5StorageService.COLUMNAR_MASK)
+            run_mask[row_number] = False
+            run_mask.flush()
+        elif node.nrows == 1:
+            # PyTables cannot remove the very last row of a table
+            node._f_remove()
+            del self._packed_rows[node._v_pathname]
+        else:
+            ptcompat.remove_rows(node, start=row_number, stop=row_number + 1)
+            del self._packed_rows[node._v_pathname]
+
+    def _prm_get_columnar_data(self, instance):
+        """Returns the data of `instance` as numpy arrays and the names of the original types
+        of scalars if it can be stored in columnar format and `(None, None)` otherwise.
+
+        """
+        if (not self._columnar_results or
+                instance.f_get_class_name() != 'Result' or
+                instance.f_is_empty() or
+                instance._has_annotations()):
+            return None, None
+
+        store_dict = instance._store()
+        array_dict = {}
+        scalar_types = {}
+        for key, val in compat.iteritems(store_dict):
+            if '.' in key or key == HDF5StorageService.COLUMNAR_MASK:
+                return None, None
+            if type(val) is np.ndarray:
+                array = val
+            elif (type(val) in pypetconstants.PARAMETER_SUPPORTED_DATA and
+                    not isinstance(val, (compat.base_type, compat.bytes_type))):
+                array = np.array(val)
+                scalar_types[key] = type(val).__name__
+            else:
+                return None, None
+            if array.dtype.kind not in 'biufc':
+                # Strings and objects are not stored in columnar format
+                return None, None
+            array_dict[key] = array
+        return array_dict, scalar_types
+
+    def _prm_store_columnar_result(self, instance, overwrite):
+        """Writes a result of a single run into arrays spanning all runs.
+
+        :return:
+
+            `True` if the result was stored and `False` if it needs to be stored as usual.
+
+        """
+        fullname = instance.v_full_name
+        location = self._prm_get_columnar_location(fullname, instance.v_run_branch)
+        if location is None:
+            return False
+        _, run_idx = self._prm_get_packed_location(fullname, instance.v_run_branch)
+        if run_idx is None:
+            return False
+        array_dict, scalar_types = self._prm_get_columnar_data(instance)
+        if array_dict is None:
+            return False
+
+        array_dict[HDF5StorageService.COLUMNAR_MASK] = np.array(True)
+        path = self._trajectory_group._v_pathname + '/' + location
+        if path in self._hdf5file:
+            group = ptcompat.get_node(self._hdf5file, path)
+            if not getattr(group._v_attrs, HDF5StorageService.COLUMNAR, False):
+                return False
+            run_mask = ptcompat.get_child(group, HDF5StorageService.COLUMNAR_MASK)
+            row_exists = run_idx < run_mask.nrows and bool(run_mask[run_idx])
+            if row_exists and not overwrite:
+                self._logger.debug('Already found `%s` on disk I will not store it!' % fullname)
+                instance._stored = True
+                return True
+
+            # Check if the data matches the arrays of previous runs
+            comment = self._all_get_from_attrs(group, HDF5StorageService.COMMENT)
+            if (set(group._v_children) != set(array_dict) or
+                    (comment or '') != instance.v_comment or
+                    any(ptcompat.get_child(group, key).atom.dtype != array.dtype or
+                        ptcompat.get_child(group, key).shape[1:] != array.shape or
+                        self._all_get_from_attrs(ptcompat.get_child(group, key),
+                                                 HDF5StorageService.COLUMNAR_SCALAR_TYPE) !=
+                        scalar_types.get(key)
+                        for key, array in compat.iteritems(array_dict))):
+                if row_exists:
+                    # The old data is overwritten by storing the result as usual
+                    self._prm_remove_packed_row(group, run_idx)
+                return False
+        else:
+            group, _ = self._all_create_or_get_groups(location.replace('/', '.'))
+            expectedrows = max(1000, 2 * (run_idx + 1))
+            for key, array in compat.iteritems(array_dict):
+                # Arrays are created empty, rows up to the current run are filled below
+                data = np.zeros((0,) + array.shape, dtype=array.dtype)
+                self._prm_write_into_other_array(key, data, group, fullname,
+                                                 flag=HDF5StorageService.EARRAY,
+                                                 expectedrows=expectedrows)
+                if key in scalar_types:
+                    self._all_set_attr(ptcompat.get_child(group, key),
+                                       HDF5StorageService.COLUMNAR_SCALAR_TYPE,
+                                       scalar_types[key])
+            setattr(group._v_attrs, HDF5StorageService.COLUMNAR, True)
+            setattr(group._v_attrs, HDF5StorageService.CLASS_NAME, instance.f_get_class_name())
+            setattr(group._v_attrs, HDF5StorageService.LEAF, True)
+            if instance.v_comment != '':
+                setattr(group._v_attrs, HDF5StorageService.COMMENT, instance.v_comment)
+            row_exists = False
+
+        for key, array in compat.iteritems(array_dict):
+            earray = ptcompat.get_child(group, key)
+            if earray.nrows <= run_idx:
+                # Runs may finish in any order, so we fill missing rows with zeros
+                self._prm_pad_earray(earray, run_idx)
+                earray.append(array[np.newaxis])
+            else:
+                earray[run_idx] = array
+            earray.flush()
+
+        self._prm_add_meta_info(instance, None, overwrite=row_exists)
+        instance._stored = True
+        self._node_processing_timer.signal_update()
+        return True
+
+    @staticmethod
+    def _prm_pad_earray(earray, nrows):
+        """Appends rows of zeros to `earray` until it has `nrows` rows.
+
+        Zeros are appended in blocks of at most `COLUMNAR_PADDING_SIZE` bytes
+        (or a single row) to not allocate the whole padding at once.
+
+        """
+        missing = nrows - earray.nrows
+        if missing <= 0:
+            return
+        row_shape = earray.shape[1:]
+        rowsize = max(int(np.prod(row_shape)) * earray.dtype.itemsize, 1)
+        block_rows = min(max(HDF5StorageService.COLUMNAR_PADDING_SIZE // rowsize, 1), missing)
+        block = np.zeros((block_rows,) + row_shape, dtype=earray.dtype)
+        while missing > 0:
+            earray.append(block[:missing])
+            missing -= block_rows
+
+    def _prm_get_packable_data(self, instance):
+        """Returns the data of `instance` if it can be packed into a table and `None` otherwise.
+
+        Only plain results of single runs without annotations and with scalar data only
+        can be packed.
+
+        """
+        if (not self._pack_scalar_results or
+                instance.v_run_branch == 'trajectory' or
+                instance.f_get_class_name() != 'Result' or
+                instance.f_is_empty() or
+                instance._has_annotations()):
+            return None
+
+        store_dict = instance._store()
+        for key, val in compat.iteritems(store_dict):
+            if ('.' in key or key == HDF5StorageService.PACKED_RUN_IDX or
+                    type(val) not in pypetconstants.PARAMETER_SUPPORTED_DATA):
+                return None
+            if type(val) in compat.int_types and not -2 ** 31 <= val < 2 ** 31:
+                # Python integers are stored as 32 bit integer columns
+                return None
+        return store_dict
+
+    def _prm_store_packed_result(self, instance, overwrite):
+        """Stores a result as a row into a table shared by all runs.
+
+        :return:
+
+            `True` if the result was packed and `False` if it needs to be stored as usual.
+
+        """
+        store_dict = self._prm_get_packable_data(instance)
+        if store_dict is None:
+            return False
+        fullname = instance.v_full_name
+        location, run_idx = self._prm_get_packed_location(fullname, instance.v_run_branch)
+        if location is None:
+            return False
+
+        row_dict = {}
+        data_type_dict = {}
+        for key, val in compat.iteritems(store_dict):
+            self._all_set_attributes_to_recall_natives(val, PTItemMock(data_type_dict),
+                                                       HDF5StorageService.FORMATTED_COLUMN_PREFIX %
+                                                       key)
+            if isinstance(val, compat.unicode_type):
+                val = val.encode(self._encoding)
+            row_dict[key] = val
+
+        packed = self._prm_get_packed_row(fullname, instance.v_run_branch)
+        if packed is None:
+            split_location = location.split('/')
+            table_name = split_location.pop()
+            where, _ = self._all_create_or_get_groups('.'.join(split_location),
+                                                      start_hdf5_group=self._all_create_or_get_group(
+                                                          HDF5StorageService.PACKED_GROUP,
+                                                          self._overview_group)[0])
+            if table_name in where:
+                table = ptcompat.get_child(where, table_name)
+            else:
+                description = dict((key, self._all_get_table_col(key, [val], fullname))
+                                   for key, val in compat.iteritems(row_dict))
+                description[HDF5StorageService.PACKED_RUN_IDX] = pt.IntCol()
+                table = ptcompat.create_table(self._hdf5file, where=where, name=table_name,
+                                              description=description, title=table_name,
+                                              expectedrows=self._results_per_run or 100,
+                                              filters=self._all_get_filters())
+                for name, value in compat.iteritems(data_type_dict):
+                    self._all_set_attr(table, name, value)
+                setattr(table._v_attrs, HDF5StorageService.CLASS_NAME,
+                        instance.f_get_class_name())
+                if instance.v_comment != '':
+                    setattr(table._v_attrs, HDF5StorageService.COMMENT, instance.v_comment)
+            row_number = None
+        else:
+            table, row_number = packed
+            if not overwrite:
+                self._logger.debug('Already found `%s` on disk I will not store it!' % fullname)
+                instance._stored = True
+                return True
+
+        # Check if the data matches the columns of the table
+        comment = self._all_get_from_attrs(table, HDF5StorageService.COMMENT)
+        coldtypes = table.coldtypes
+        if (set(coldtypes) != set(row_dict) | set([HDF5StorageService.PACKED_RUN_IDX]) or
+                (comment or '') != instance.v_comment or
+                any(self._all_get_from_attrs(table, name) != value
+                    for name, value in compat.iteritems(data_type_dict)) or
+                any(isinstance(val, compat.bytes_type) and len(val) > coldtypes[key].itemsize
+                    for key, val in compat.iteritems(row_dict))):
+            if row_number is not None:
+                # The old data is overwritten by storing the result as usual
+                self._prm_remove_packed_row(table, row_number)
+            return False
+
+        if row_number is None:
+            row = table.row
+            row[HDF5StorageService.PACKED_RUN_IDX] = run_idx
+            for key, val in compat.iteritems(row_dict):
+                row[key] = val
+            row.append()
+            table.flush()
+            self._prm_get_packed_rows(table)[run_idx] = table.nrows - 1
+        else:
+            for row in table.iterrows(row_number, row_number + 1):
+                for key, val in compat.iteritems(row_dict):
+                    row[key] = val
+                row.update()
+            table.flush()
+
+        self._prm_add_meta_info(instance, None, overwrite=row_number is not None)
+        instance._stored = True
+        self._node_processing_timer.signal_update()
+        return True
+
+    def _prm_load_packed_result(self, instance, load_data, node, row_number,
+                                load_only=None, load_except=None):
+        """Loads a result from a row of a packed table or a columnar result.
+
+        :param instance: Empty result instance
+        :param load_data: How to load stuff
+        :param node: The packed table or the group of the columnar result
+        :param row_number: The row of the result
+        :param load_only: List of data keys if only parts of a result should be loaded
+        :param load_except: List of data key that should NOT be loaded.
+
+        """
+        if load_data == pypetconstants.LOAD_NOTHING:
+            return
+        if load_data == pypetconstants.OVERWRITE_DATA:
+            instance.f_empty()
+            if instance._has_annotations():
+                instance.v_annotations.f_empty()
+            instance.v_comment = ''
+
+        if instance.v_comment == '':
+            comment = self._all_get_from_attrs(node, HDF5StorageService.COMMENT)
+            instance.v_comment = '' if comment is None else comment
+        instance._stored = True
+
+        if isinstance(load_only, compat.base_type):
+            load_only = [load_only]
+        if isinstance(load_except, compat.base_type):
+            load_except = [load_except]
+
+        if (load_data == pypetconstants.LOAD_SKELETON or
+                (load_only is None and load_except is None and not instance.f_is_empty())):
+            self._node_processing_timer.signal_update()
+            return
+
+        load_dict = {}
+        if isinstance(node, pt.Table):
+            row = node[row_number]
+            for colname in node.colnames:
+                if (colname == HDF5StorageService.PACKED_RUN_IDX or
+                        (load_only is not None and colname not in load_only) or
+                        (load_except is not None and colname in load_except)):
+                    continue
+                data, _ = self._all_recall_native_type(row[colname], node,
+                                                       HDF5StorageService.FORMATTED_COLUMN_PREFIX %
+                                                       colname)
+                load_dict[colname] = data
+        else:
+            for key, earray in node._v_children.items():
+                if (key == HDF5StorageService.COLUMNAR_MASK or
+                        (load_only is not None and key not in load_only) or
+                        (load_except is not None and key in load_except)):
+                    continue
+                data = earray[row_number]
+                typestr = self._all_get_from_attrs(earray,
+                                                   HDF5StorageService.COLUMNAR_SCALAR_TYPE)
+                if typestr is not None:
+                    data = pypetconstants.PARAMETERTYPEDICT[typestr](data)
+                elif not isinstance(data, np.ndarray):
+                    # Zero dimensional arrays are read as scalars
+                    data = np.array(data)
+                load_dict[key] = data
+
+        if load_dict:
+            instance._load(load_dict)
+        self._node_processing_timer.signal_update()
+
     def _shared_write_shared_data(self, key, hdf5_group, full_name, **kwargs):
         try:
             data = kwargs.pop('obj', None)
@@ -4279,6 +5211,11 @@ class HDF5StorageService(StorageService, HasLogger):
             How to store:
                 CARRAY, EARRAY, VLARRAY
 
+        :param access:
+
+            Expected access pattern ('rows' or 'columns') to choose the chunk shape
+            if the storage policy is 'auto'
+
         """
         try:
 
@@ -4295,14 +5232,40 @@ class HDF5StorageService(StorageService, HasLogger):
                 raise ValueError(
                     'CArray `%s` already exists in `%s`. Appending is not supported (yet).')
 
-            if 'filters' in kwargs:
+            access = kwargs.pop('access', None)
+            policy = None
+            if (self._storage_policy == HDF5StorageService.AUTO_POLICY and
+                    flag != HDF5StorageService.VLARRAY and
+                    isinstance(data, np.ndarray) and
+                    not data.dtype.hasobject and
+                    data.size > 0 and
+                    not any(name in kwargs for name in ('filters', 'complib', 'complevel',
+                                                        'shuffle', 'fletcher32'))):
+                filters, chunkshape, policy = self._prm_choose_policy(data, access)
+                if chunkshape is not None and 'chunkshape' not in kwargs:
+                    kwargs['chunkshape'] = chunkshape
+            elif 'filters' in kwargs:
                 filters = kwargs.pop('filters')
             else:
                 filters = self._all_get_filters(kwargs)
 
+            # Uncompressed arrays do not need chunks, stored contiguously
+            # they can be memory mapped when loaded
+            contiguous = (flag == HDF5StorageService.CARRAY and
+                          not kwargs and
+                          filters.complevel == 0 and
+                          not filters.fletcher32 and
+                          type(data) is np.ndarray and
+                          data.size > 0 and
+                          data.dtype.kind not in ('O', 'U'))
+
             try:
-                other_array = factory(self._hdf5file, where=group, name=key, obj=data,
-                                                filters=filters, **kwargs)
+                if contiguous:
+                    other_array = ptcompat.create_array(self._hdf5file, where=group, name=key,
+                                                        obj=data)
+                else:
+                    other_array = factory(self._hdf5file, where=group, name=key, obj=data,
+                                          filters=filters, **kwargs)
             except (ValueError, TypeError) as exc:
                 try:
                     conv_data = data[:]
@@ -4318,12 +5281,122 @@ class HDF5StorageService(StorageService, HasLogger):
                 # Remember the types of the original data to recall them on loading
                 self._all_set_attributes_to_recall_natives(data, other_array,
                                                        HDF5StorageService.DATA_PREFIX)
+            if policy is not None:
+                policy += ',chunkshape=%s' % str(other_array.chunkshape)
+                setattr(other_array._v_attrs, HDF5StorageService.STORAGE_POLICY, policy)
+            if contiguous:
+                flag = HDF5StorageService.ARRAY
             setattr(other_array._v_attrs, HDF5StorageService.STORAGE_TYPE, flag)
             self._hdf5file.flush()
         except:
             self._logger.error('Failed storing %s `%s` of `%s`.' % (flag, key, fullname))
             raise
 
+    @staticmethod
+    def _prm_check_access(access):
+        """Checks that the expected `access` pattern (or a dictionary of patterns) is known.
+
+        Patterns are checked regardless of the storage policy, although they only affect
+        chunk shapes if the policy is 'auto'.
+
+        """
+        if isinstance(access, dict):
+            patterns = compat.listvalues(access)
+        else:
+            patterns = [access]
+        for pattern in patterns:
+            if pattern is not None and pattern not in HDF5StorageService.POLICY_ACCESS:
+                raise ValueError('Access `%s` is not understood, use one of %s.' %
+                                 (str(pattern), str(HDF5StorageService.POLICY_ACCESS)))
+
+    def _prm_choose_policy(self, data, access=None):
+        """Chooses filters and chunk shape for a numpy array.
+
+        Compresses a sample of `data` to probe whether compression pays off at all.
+
+        :return: Tuple of filters, chunk shape (or `None`), and a description of the choice
+
+        """
+        itemsize = max(data.dtype.itemsize, 1)
+
+        # Probe compressibility of a byte shuffled sample
+        sample = data.flat[:max(HDF5StorageService.POLICY_SAMPLE_SIZE // itemsize, 1)]
+        sample = np.ascontiguousarray(sample).view(np.uint8).reshape(-1, itemsize)
+        raw = np.ascontiguousarray(sample.T).tostring()
+        ratio = len(zlib.compress(raw, 1)) / float(len(raw))
+
+        if ratio > HDF5StorageService.POLICY_MIN_RATIO:
+            complib, complevel, shuffle = 'zlib', 0, False
+        else:
+            complib, complevel = self._prm_policy_complib()
+            shuffle = itemsize > 1
+        filters = pt.Filters(complib=complib, complevel=complevel, shuffle=shuffle,
+                             fletcher32=self._fletcher32)
+
+        chunkshape = None
+        if access is not None:
+            shape = data.shape
+            if len(shape) == 1 or access == 'columns':
+                # Chunks span the first axis
+                axes = [0]
+            else:
+                # Chunks span the trailing axes of a single row
+                axes = range(len(shape) - 1, 0, -1)
+            target = max(HDF5StorageService.POLICY_CHUNK_SIZE // itemsize, 1)
+            chunkshape = [1] * len(shape)
+            for axis in axes:
+                chunkshape[axis] = max(min(shape[axis], target), 1)
+                target = max(target // chunkshape[axis], 1)
+            chunkshape = tuple(chunkshape)
+
+        if complevel == 0:
+            policy = 'complib=None,ratio=%.2f' % ratio
+        else:
+            policy = 'complib=%s,complevel=%d,shuffle=%s,ratio=%.2f' % (complib, complevel,
+                                                                        str(shuffle), ratio)
+        return filters, chunkshape, policy
+
+    @staticmethod
+    def _prm_policy_complib():
+        """Returns the fastest available compression library and level"""
+        try:
+            if ('blosc:lz4' in pt.filters.all_complibs and
+                    'lz4' in pt.filters.blosc_compressor_list()):
+                return 'blosc:lz4', 5
+        except AttributeError:
+            pass  # Old PyTables versions do not support blosc compressors
+        return 'zlib', 1
+
+    def _prm_extend_earray(self, key, data, group, fullname, **kwargs):
+        """Appends the rows of `data` that are not yet part of the earray `key` in `group`.
+
+        The data already on disk is assumed to be the beginning of `data`.
+        If `key` was stored in another format, for instance, by an older version of pypet,
+        it is replaced by an earray.
+
+        :return: If data on disk was changed
+
+        """
+        try:
+            node = ptcompat.get_child(group, key)
+            nrows = getattr(node, 'nrows', -1)
+            if nrows >= len(data):
+                self._logger.debug(
+                    'Found %s already in hdf5 node of %s, so I will ignore it.' %
+                    (key, fullname))
+                return False
+            if isinstance(node, pt.EArray) and nrows >= 0:
+                node.append(data[nrows:])
+                node.flush()
+            else:
+                node._f_remove(recursive=True)
+                self._prm_write_into_other_array(key, data, group, fullname,
+                                                 flag=HDF5StorageService.EARRAY, **kwargs)
+            return True
+        except:
+            self._logger.error('Failed extending earray `%s` of `%s`.' % (key, fullname))
+            raise
+
     def _prm_write_into_array(self, key, data, group, fullname, **kwargs):
         """Stores data as array.
 
@@ -4389,6 +5462,64 @@ class HDF5StorageService(StorageService, HasLogger):
             self._logger.error('Failed storing array `%s` of `%s`.' % (key, fullname))
             raise
 
+    def _prm_write_blob(self, key, data, group, fullname, **kwargs):
+        """Stores a pickle dump into the blob store and hard links it as `key` into `group`.
+
+        Blobs are named after the SHA-1 hash of the dump. Accordingly, a dump
+        that is already part of the blob store is not written again.
+
+        """
+        try:
+            blob_hash = hashlib.sha1(data).hexdigest()
+            blob_name = 'blob_' + blob_hash
+            blob_group = self._blob_group
+            if blob_name in blob_group:
+                blob = ptcompat.get_child(blob_group, blob_name)
+            else:
+                self._prm_write_into_array(blob_name, data, blob_group, fullname, **kwargs)
+                blob = ptcompat.get_child(blob_group, blob_name)
+                # Attributes are shared among all hard links of the blob
+                setattr(blob._v_attrs, HDF5StorageService.STORAGE_TYPE,
+                        HDF5StorageService.BLOB)
+                setattr(blob._v_attrs, HDF5StorageService.BLOB_HASH, blob_hash)
+            ptcompat.create_hard_link(self._hdf5file, group, key, blob)
+            refs = getattr(blob._v_attrs, HDF5StorageService.BLOB_REFS, 0)
+            setattr(blob._v_attrs, HDF5StorageService.BLOB_REFS, refs + 1)
+        except:
+            self._logger.error('Failed storing blob `%s` of `%s`.' % (key, fullname))
+            raise
+
+    def _prm_release_blobs(self, node):
+        """Decrements the reference counts of all blobs hard linked within `node`.
+
+        Blobs that are no longer referenced are removed from the blob store.
+        Needs to be called before `node` is removed.
+
+        """
+        if isinstance(node, pt.Leaf):
+            leaves = [node]
+        else:
+            leaves = [leaf for group in ptcompat.walk_groups(node)
+                      for leaf in compat.listvalues(group._v_leaves)]
+        for leaf in leaves:
+            if leaf._v_parent._v_name == HDF5StorageService.BLOB_GROUP:
+                # The blob store itself is not a reference
+                continue
+            attrs = leaf._v_attrs
+            if (getattr(attrs, HDF5StorageService.STORAGE_TYPE, None) !=
+                    HDF5StorageService.BLOB):
+                continue
+            refs = getattr(attrs, HDF5StorageService.BLOB_REFS, None)
+            if refs is None:
+                # Blob of an older file without reference counting
+                continue
+            if refs > 1:
+                setattr(attrs, HDF5StorageService.BLOB_REFS, refs - 1)
+            else:
+                blob_name = 'blob_' + getattr(attrs, HDF5StorageService.BLOB_HASH)
+                if blob_name in self._blob_group:
+                    ptcompat.get_child(self._blob_group, blob_name)._f_remove()
+
     def _lnk_delete_link(self, link_name):
         """Removes a link from disk"""
         translated_name = '/' + self._trajectory_name + '/' + link_name.replace('.','/')
@@ -4423,6 +5554,11 @@ class HDF5StorageService(StorageService, HasLogger):
 
         """
         split_name = instance.v_location.split('.')
+        if _hdf5_group is None and delete_only is None and instance.v_is_leaf:
+            packed = self._prm_get_packed_row(instance.v_full_name, instance.v_run_branch)
+            if packed is not None:
+                self._prm_remove_packed_row(*packed)
+                return
         if _hdf5_group is None:
             where = '/' + self._trajectory_name + '/' + '/'.join(split_name)
             node_name = instance.v_name
@@ -4433,6 +5569,7 @@ class HDF5StorageService(StorageService, HasLogger):
                     raise TypeError('You cannot remove the group `%s`, it has children, please '
                                     'use `recursive=True` to enforce removal.' %
                                     instance.v_full_name)
+            self._prm_release_blobs(_hdf5_group)
             _hdf5_group._f_remove(recursive=True)
         else:
             if not instance.v_is_leaf:
@@ -4451,6 +5588,7 @@ class HDF5StorageService(StorageService, HasLogger):
                     _hdf5_sub_group = ptcompat.get_node(self._hdf5file,
                                                         where=_hdf5_group,
                                                         name=delete_item)
+                    self._prm_release_blobs(_hdf5_sub_group)
                     _hdf5_sub_group._f_remove(recursive=True)
                 except pt.NoSuchNodeError:
                     self._logger.warning('Could not delete `%s` from `%s`. HDF5 node not found!' %
@@ -4665,7 +5803,8 @@ class HDF5StorageService(StorageService, HasLogger):
         return int(maxlength * 1.5)
 
     def _prm_load_into_dict(self, full_name, load_dict, hdf5_group, instance,
-                            load_only, load_except, load_flags, _prefix = ''):
+                            load_only, load_except, load_flags, load_mode=None,
+                            load_slice=None, _prefix = ''):
         """Loads into dictionary"""
         for node in hdf5_group:
 
@@ -4684,6 +5823,8 @@ class HDF5StorageService(StorageService, HasLogger):
                                          load_only=load_only,
                                          load_except=load_except,
                                          load_flags=load_flags,
+                                         load_mode=load_mode,
+                                         load_slice=load_slice,
                                          _prefix=load_name)
                 continue
 
@@ -4703,17 +5844,24 @@ class HDF5StorageService(StorageService, HasLogger):
             if load_name in load_flags:
                 load_type = load_flags[load_name]
 
+            if isinstance(load_slice, dict):
+                node_slice = load_slice.get(load_name, None)
+            else:
+                node_slice = load_slice
+
             if load_type == HDF5StorageService.DICT:
                 to_load = self._prm_read_dictionary(node, full_name)
             elif load_type == HDF5StorageService.TABLE:
-                to_load = self._prm_read_table(node, full_name)
+                to_load = self._prm_read_table(node, full_name, node_slice)
             elif load_type in (HDF5StorageService.ARRAY, HDF5StorageService.CARRAY,
                                 HDF5StorageService.EARRAY, HDF5StorageService.VLARRAY):
-                to_load = self._prm_read_array(node, full_name)
+                to_load = self._prm_read_array(node, full_name, load_mode, node_slice)
             elif load_type in (HDF5StorageService.FRAME,
                                HDF5StorageService.SERIES,
                                HDF5StorageService.PANEL):
                 to_load = self._prm_read_pandas(node, full_name)
+            elif load_type == HDF5StorageService.BLOB:
+                to_load = self._prm_read_blob(node, full_name)
             elif load_type.startswith(HDF5StorageService.SHARED_DATA):
                 to_load = self._prm_read_shared_data(node, instance)
             else:
@@ -4734,6 +5882,8 @@ class HDF5StorageService(StorageService, HasLogger):
                                       with_links=False,
                                       recursive=False,
                                       max_depth=None,
+                                      load_mode=None,
+                                      load_slice=None,
                                       _hdf5_group=None,):
         """Loads a parameter or result from disk.
 
@@ -4769,6 +5919,16 @@ class HDF5StorageService(StorageService, HasLogger):
 
             Dummy variable, no-op because leaves have no children
 
+        :param load_mode:
+
+            How arrays are loaded, `None` to use the load mode of the service.
+            Memory maps and lazy arrays are only created for results.
+
+        :param load_slice:
+
+            Index expression or dictionary of index expressions to load only
+            parts of numpy arrays and tables of a result
+
         :param _hdf5_group:
 
             The corresponding hdf5 group of the instance
@@ -4778,6 +5938,11 @@ class HDF5StorageService(StorageService, HasLogger):
             return
 
         if _hdf5_group is None:
+            packed = self._prm_get_packed_row(instance.v_full_name, instance.v_run_branch)
+            if packed is not None:
+                self._prm_load_packed_result(instance, load_data, *packed,
+                                             load_only=load_only, load_except=load_except)
+                return
             _hdf5_group = self._all_get_node_by_name(instance.v_full_name)
 
         if load_data == pypetconstants.OVERWRITE_DATA:
@@ -4786,7 +5951,8 @@ class HDF5StorageService(StorageService, HasLogger):
                                      instance.v_full_name)
                 return
             instance.f_empty()
-            instance.v_annotations.f_empty()
+            if instance._has_annotations():
+                instance.v_annotations.f_empty()
             instance.v_comment = ''
 
         self._all_load_skeleton(instance, _hdf5_group)
@@ -4849,13 +6015,26 @@ class HDF5StorageService(StorageService, HasLogger):
         instance_flags.update(load_flags)
         load_flags = instance_flags
 
+        if load_mode is None:
+            load_mode = self._load_mode
+        else:
+            self._check_load_mode(load_mode)
+        if instance.v_is_parameter:
+            # Parameters are always read into memory
+            load_mode = None
+            if load_slice is not None:
+                raise ValueError('Parameter `%s` cannot be loaded partially, '
+                                 'please do not pass `load_slice`.' % full_name)
+
         self._prm_load_into_dict(full_name=full_name,
                                  load_dict=load_dict,
                                  hdf5_group=_hdf5_group,
                                  instance=instance,
                                  load_only=load_only,
                                  load_except=load_except,
-                                 load_flags=load_flags)
+                                 load_flags=load_flags,
+                                 load_mode=load_mode,
+                                 load_slice=load_slice)
 
         if load_only is not None:
             # Check if all data in `load_only` was actually found in the hdf5 file
@@ -4970,8 +6149,51 @@ class HDF5StorageService(StorageService, HasLogger):
             self._logger.error('Failed loading `%s` of `%s`.' % (pd_node._v_name, full_name))
             raise
 
-    def _prm_read_table(self, table_or_group, full_name):
-        """Reads a non-nested PyTables table column by column and created a new ObjectTable for
+    def _prm_read_column(self, column, ptitem, colname):
+        """Turns a column of a table read as numpy array into a list of the original data.
+
+        Columns of scalars are converted at once if the type of
+        the original data is a python type or the numpy type of the column.
+        Only other columns are converted item by item.
+
+        :param column: Numpy array of the column data
+
+        :param ptitem: HDF5 table or mock containing the types of the original data
+
+        :param colname: Name of the column
+
+        :return: List of data items
+
+        """
+        prefix = HDF5StorageService.FORMATTED_COLUMN_PREFIX % colname
+        colltype = self._all_get_from_attrs(ptitem, prefix + HDF5StorageService.COLL_TYPE)
+        typestr = self._all_get_from_attrs(ptitem, prefix + HDF5StorageService.SCALAR_TYPE)
+
+        if (colltype == HDF5StorageService.COLL_SCALAR and column.ndim == 1 and
+                len(column) > 0 and typestr is not None):
+            if typestr == column.dtype.type.__name__:
+                # The data was stored as numpy scalars in the first place
+                return list(column)
+            if (typestr == compat.unicode_type.__name__ and
+                    column.dtype.kind == 'S'):
+                return np.char.decode(column, self._encoding).tolist()
+            data_list = column.tolist()
+            if type(data_list[0]).__name__ == typestr:
+                # The data was stored as python scalars
+                return data_list
+
+        data_list = list(column)
+        for idx, data in enumerate(data_list):
+            # Recall original type of data
+            data, type_changed = self._all_recall_native_type(data, ptitem, prefix)
+            if type_changed:
+                data_list[idx] = data
+            else:
+                break
+        return data_list
+
+    def _prm_read_table(self, table_or_group, full_name, load_slice=None):
+        """Reads a non-nested PyTables table at once and creates a new ObjectTable for
         the loaded data.
 
         :param table_or_group:
@@ -4982,13 +6204,17 @@ class HDF5StorageService(StorageService, HasLogger):
 
             Full name of the parameter or result whose data is to be loaded
 
+        :param load_slice:
+
+            Rows to read, `None` reads the whole table
+
         :return:
 
             Data to be loaded
 
         """
         try:
-            result_table = None
+            columns = OrderedDict()
 
             if self._all_get_from_attrs(table_or_group, HDF5StorageService.SPLIT_TABLE):
                 table_name = table_or_group._v_name
@@ -5003,56 +6229,28 @@ class HDF5StorageService(StorageService, HasLogger):
                     fieldname = compat.tostr(row['field_name'])
                     data_type_dict[fieldname] = compat.tostr(row['data_type'])
 
+                ptitem = PTItemMock(data_type_dict)
                 for sub_table in table_or_group:
                     sub_table_name = sub_table._v_name
 
                     if sub_table_name == data_type_table_name:
                         continue
 
+                    # Read all columns at once into a structured numpy array
+                    table_data = self._prm_read_rows(sub_table, load_slice)
                     for colname in sub_table.colnames:
-                        # Read Data column by column
-                        col = sub_table.col(colname)
-                        data_list = list(col)
-
-                        prefix = HDF5StorageService.FORMATTED_COLUMN_PREFIX % colname
-                        for idx, data in enumerate(data_list):
-                            # Recall original type of data
-                            data, type_changed = self._all_recall_native_type(data,
-                                                                              PTItemMock(
-                                                                                  data_type_dict),
-                                                                              prefix)
-                            if type_changed:
-                                data_list[idx] = data
-                            else:
-                                break
-
-                        # Construct or insert into an ObjectTable
-                        if result_table is None:
-                            result_table = ObjectTable(data={colname: data_list})
-                        else:
-                            result_table[colname] = data_list
+                        columns[colname] = self._prm_read_column(table_data[colname],
+                                                                 ptitem, colname)
 
             else:
+                table_data = self._prm_read_rows(table_or_group, load_slice)
                 for colname in table_or_group.colnames:
-                    # Read Data column by column
-                    col = table_or_group.col(colname)
-                    data_list = list(col)
-
-                    prefix = HDF5StorageService.FORMATTED_COLUMN_PREFIX % colname
-                    for idx, data in enumerate(data_list):
-                        # Recall original type of data
-                        data, type_changed = self._all_recall_native_type(data, table_or_group,
-                                                                          prefix)
-                        if type_changed:
-                            data_list[idx] = data
-                        else:
-                            break
+                    columns[colname] = self._prm_read_column(table_data[colname],
+                                                             table_or_group, colname)
 
-                    # Construct or insert into an ObjectTable
-                    if result_table is None:
-                        result_table = ObjectTable(data={colname: data_list})
-                    else:
-                        result_table[colname] = data_list
+            result_table = None
+            if columns:
+                result_table = ObjectTable(data=columns, columns=compat.listkeys(columns))
 
             return result_table
         except:
@@ -5061,7 +6259,19 @@ class HDF5StorageService(StorageService, HasLogger):
             raise
 
 
-    def _prm_read_array(self, array, full_name):
+    @staticmethod
+    def _prm_read_rows(table, load_slice):
+        """Reads all or the rows of `table` selected by `load_slice`"""
+        if load_slice is None:
+            return table.read()
+        if isinstance(load_slice, tuple) and len(load_slice) == 1:
+            load_slice = load_slice[0]
+        if isinstance(load_slice, compat.int_types + (np.integer,)):
+            # Keep the result a table with a single row
+            load_slice = [load_slice]
+        return table[load_slice]
+
+    def _prm_read_array(self, array, full_name, load_mode=None, load_slice=None):
         """Reads data from an array or carray
 
         :param array:
@@ -5072,12 +6282,50 @@ class HDF5StorageService(StorageService, HasLogger):
 
             Full name of the parameter or result whose data is to be loaded
 
+        :param load_mode:
+
+            If `'mmap'` a read-only memory map is returned if the data
+            is a numpy array stored contiguously in the file.
+            If `'lazy'` a :class:`~pypet.storageservice.LazyArray` is returned
+            for numpy arrays.
+
+        :param load_slice:
+
+            Index expression to read only a hyperslab of numpy arrays
+
         :return:
 
             Data to load
 
         """
         try:
+            colltype = self._all_get_from_attrs(array, HDF5StorageService.DATA_PREFIX +
+                                                HDF5StorageService.COLL_TYPE)
+            is_ndarray = (colltype == HDF5StorageService.COLL_NDARRAY and
+                          not isinstance(array, pt.VLArray) and
+                          array.shape != ())
+            if is_ndarray and load_mode == HDF5StorageService.MMAP:
+                result = self._prm_map_array(array)
+                if result is not None:
+                    if load_slice is not None:
+                        result = result[load_slice]
+                    return result
+            if is_ndarray and load_slice is not None:
+                # Only the hyperslab is read from disk, single elements are recalled
+                # as 0-d arrays to convert their type as well
+                result = np.asarray(array[load_slice])
+                result, dummy = self._all_recall_native_type(result, array,
+                                                             HDF5StorageService.DATA_PREFIX)
+                if result.ndim == 0:
+                    result = result[()]
+                return result
+            if is_ndarray and load_mode == HDF5StorageService.LAZY:
+                path = array._v_parent._v_pathname.split('/')[2:]
+                dtype = array.dtype
+                if self._prm_is_unicode_array(array):
+                    dtype = np.dtype((compat.unicode_type, dtype.itemsize))
+                return LazyArray(self, self._filename, self._trajectory_name,
+                                 '.'.join(path), array._v_name, array.shape, dtype)
             result = ptcompat.read_array(array)
             # Recall original data types
             result, dummy = self._all_recall_native_type(result, array,
@@ -5088,6 +6336,62 @@ class HDF5StorageService(StorageService, HasLogger):
             self._logger.error('Failed loading `%s` of `%s`.' % (array._v_name, full_name))
             raise
 
+    def _prm_map_array(self, array):
+        """Returns a read-only memory map of `array` or `None` if it cannot be mapped.
+
+        Only plain numpy arrays stored as contiguous and uncompressed hdf5 arrays
+        with a fixed size data type can be mapped.
+
+        """
+        if (type(array) is not pt.Array or
+                array.atom.shape != () or
+                array.dtype.hasobject or
+                np.prod(array.shape) == 0 or
+                self._prm_is_unicode_array(array)):
+            # Unicode arrays are stored as bytes and need to be decoded
+            return None
+        offset = ptcompat.get_data_offset(array)
+        if offset is None:
+            return None
+        dtype = array.dtype
+        if array.byteorder == 'little':
+            dtype = dtype.newbyteorder('<')
+        elif array.byteorder == 'big':
+            dtype = dtype.newbyteorder('>')
+        return np.memmap(array._v_file.filename, dtype=dtype, mode='r',
+                         offset=offset, shape=array.shape)
+
+    def _prm_is_unicode_array(self, array):
+        """Checks if `array` stores a numpy array of unicode strings encoded as bytes"""
+        typestr = self._all_get_from_attrs(array, HDF5StorageService.DATA_PREFIX +
+                                           HDF5StorageService.SCALAR_TYPE)
+        return typestr == compat.unicode_type.__name__
+
+    def _prm_read_blob(self, blob, full_name):
+        """Reads a pickle dump from the blob store.
+
+        Dumps are cached by their content hash, so every blob is read from disk
+        only once as long as it stays in the cache.
+
+        """
+        blob_hash = self._all_get_from_attrs(blob, HDF5StorageService.BLOB_HASH)
+        try:
+            result = self._blob_cache.pop(blob_hash)
+        except KeyError:
+            result = self._prm_read_array(blob, full_name)
+            self._blob_cache_bytes += len(result)
+            while (self._blob_cache and
+                   self._blob_cache_bytes > HDF5StorageService.BLOB_CACHE_BYTES):
+                _, old_result = self._blob_cache.popitem(last=False)
+                self._blob_cache_bytes -= len(old_result)
+            if self._blob_cache_bytes > HDF5StorageService.BLOB_CACHE_BYTES:
+                # The dump alone exceeds the cache
+                self._blob_cache_bytes -= len(result)
+                return result
+        # (Re-)insert as the most recently used item
+        self._blob_cache[blob_hash] = result
+        return result
+
     def _hdf5_interact_with_data(self, path_to_data, item_name, request, args, kwargs):
 
         hdf5_group = self._all_get_node_by_name(path_to_data)
@@ -5107,6 +6411,8 @@ class HDF5StorageService(StorageService, HasLogger):
             return
         elif request == '__thenode__':
             return hdf5data
+        elif request == '__readslice__':
+            return self._prm_read_array(hdf5data, path_to_data, load_slice=args[0])
         elif request == 'pandas_get':
             pandas_data = self._prm_read_pandas(hdf5data, path_to_data)
             return pandas_data
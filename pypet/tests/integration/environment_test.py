@@ -4,6 +4,7 @@ import os
 import platform
 import logging
 import time
+import pickle
 import numpy as np
 
 from pypet.trajectory import Trajectory, load_trajectory
@@ -77,6 +78,203 @@ class FullStorageTest(TrajectoryComparator):
 
             self.assertTrue('hi' in traj)
 
+    def test_async_storage(self):
+        filename = make_temp_dir('async_store.hdf5')
+        with Environment(filename=filename,
+                         log_config=get_log_config(),
+                         async_storage=True,
+                         queue_maxsize=1) as env:
+
+            traj = env.v_trajectory
+
+            traj.par.x = Parameter('x', 3, 'jj')
+
+            traj.f_explore({'x': list(range(10))})
+
+            env.f_run(add_array_result)
+
+            self.assertIsInstance(traj.v_storage_service, HDF5StorageService)
+            self.assertTrue(traj.f_get('config.environment.%s.async_storage' % env.v_name))
+
+            traj = load_trajectory(index=-1, filename=filename, load_all=2)
+
+            self.assertTrue(all(traj.f_get_run_information(run_name)['completed']
+                                for run_name in traj.f_get_run_names()))
+            for idx, run_name in enumerate(traj.f_get_run_names()):
+                data = traj.results.runs[run_name].data
+                self.assertTrue(np.all(data == idx * np.ones((100, 100))))
+
+        with self.assertRaises(ValueError):
+            Environment(filename=filename, log_config=get_log_config(),
+                        async_storage=True, multiproc=True)
+
+    def test_async_storage_stores_only_new_nodes(self):
+        trajs = []
+        for async_storage in (False, True):
+            filename = make_temp_dir('async_new_nodes_%s.hdf5' % async_storage)
+            with Environment(filename=filename,
+                             log_config=get_log_config(),
+                             async_storage=async_storage) as env:
+                traj = env.v_trajectory
+                traj.par.x = Parameter('x', 3, 'jj')
+                traj.f_explore({'x': list(range(4))})
+
+                copy_calls = []
+                old_copy = Trajectory.f_copy
+
+                def counting_copy(self, *args, **kwargs):
+                    copy_calls.append(self.v_crun)
+                    return old_copy(self, *args, **kwargs)
+
+                Trajectory.f_copy = counting_copy
+                try:
+                    env.f_run(add_group_and_link_result)
+                finally:
+                    Trajectory.f_copy = old_copy
+                # The trajectory is never copied to hand data over to the storage thread
+                self.assertEqual(copy_calls, [])
+
+                trajs.append(load_trajectory(index=-1, filename=filename, load_all=2))
+
+        sync_traj, async_traj = trajs
+        self.compare_trajectories(sync_traj, async_traj)
+        for run_name in async_traj.f_get_run_names():
+            group = async_traj.results.runs[run_name].group
+            self.assertEqual(group.v_comment, 'Group of the run')
+            self.assertEqual(group.v_annotations.run, run_name)
+            self.assertIs(async_traj.runs[run_name].link, async_traj.par.x)
+
+    def test_scoop_tasks_only_carry_the_run_state(self):
+        filename = make_temp_dir('scoop_tasks.hdf5')
+        with Environment(filename=filename,
+                         log_config=get_log_config()) as env:
+            traj = env.v_trajectory
+            for irun in range(100):
+                traj.f_add_parameter('p%d' % irun, irun)
+            traj.par.x = Parameter('x', 3, 'jj')
+            traj.f_explore({'x': list(range(5))})
+            traj.f_store()
+
+            # The skeleton is shared with the workers only once
+            skeleton = traj.f_copy(copy_leaves='explored', with_links=True)
+            skeleton_size = len(pickle.dumps(skeleton))
+            tasks = list(env._make_iterator(0, copy_data=True, skeleton_rev='rev'))
+            self.assertEqual(len(tasks), 5)
+            for idx, task in enumerate(tasks):
+                self.assertNotIn('traj', task)
+                self.assertEqual(task['skeleton_rev'], 'rev')
+                self.assertLess(10 * len(pickle.dumps(task)), skeleton_size)
+                skeleton._set_run_state(task['run_state'])
+                self.assertEqual(skeleton.v_idx, idx)
+                self.assertEqual(skeleton.x, idx)
+
+    def test_async_storage_is_not_slower(self):
+        run_times = {}
+        for async_storage in (False, True):
+            filename = make_temp_dir('async_timing_%s.hdf5' % async_storage)
+            with Environment(filename=filename,
+                             log_config=get_log_config(),
+                             async_storage=async_storage) as env:
+                traj = env.v_trajectory
+                for irun in range(1000):
+                    traj.f_add_parameter('p%d' % irun, irun)
+                traj.par.x = Parameter('x', 3, 'jj')
+                traj.f_explore({'x': list(range(20))})
+                start = time.time()
+                env.f_run(add_scalar_result)
+                run_times[async_storage] = time.time() - start
+        # Copying the whole trajectory per run made asynchronous storage much slower
+        self.assertLess(run_times[True], 1.25 * run_times[False])
+
+    def test_run_cache(self):
+        for cache_name in ('run_cache', 'run_cache.sqlite'):
+            cache_path = make_temp_dir(cache_name)
+            filename = make_temp_dir(cache_name + '.hdf5')
+
+            def make_run(trajname, explore_dict, code_version='1.0'):
+                calls = []
+                with Environment(trajectory=trajname, filename=filename,
+                                 log_config=get_log_config(),
+                                 run_cache=cache_path, code_version=code_version) as env:
+                    traj = env.v_trajectory
+                    traj.f_add_parameter('x', 2)
+                    traj.f_add_parameter('y', 10)
+                    traj.f_explore(explore_dict)
+                    results = env.f_run(add_cached_result, calls)
+                    self.assertEqual(traj.f_get('config.environment.%s.run_cache' %
+                                                env.v_name).f_get(), cache_path)
+                traj = load_trajectory(name=traj.v_name, filename=filename, load_all=2)
+                for idx, run_name in enumerate(traj.f_get_run_names()):
+                    z = traj.results.runs[run_name].z
+                    self.assertEqual(results[idx], (idx, z))
+                    self.assertEqual(traj.derived_parameters.runs[run_name].w,
+                                     traj.f_get('x').f_get_range()[idx] + traj.y
+                                     if 'x' in explore_dict else traj.x +
+                                     traj.f_get('y').f_get_range()[idx])
+                    self.assertIs(traj.results.runs[run_name].f_get('zlink'),
+                                  traj.results.runs[run_name].f_get('z'))
+                return calls, results
+
+            calls, results = make_run('first', {'x': [1, 2, 3]})
+            self.assertEqual(calls, [0, 1, 2])
+
+            # Only the point x=2, y=20 was not computed before
+            calls, results = make_run('second', {'y': [10, 20]})
+            self.assertEqual(calls, [1])
+            self.assertEqual(results, [(0, 20), (1, 40)])
+
+            calls, results = make_run('third', {'y': [10, 20]}, code_version='2.0')
+            self.assertEqual(calls, [0, 1])
+
+    def test_run_cache_considers_job_and_arguments(self):
+        cache_path = make_temp_dir('run_cache_jobs')
+        filename = make_temp_dir('run_cache_jobs.hdf5')
+
+        def make_run(trajname, job, offset):
+            calls = []
+            with Environment(trajectory=trajname, filename=filename,
+                             log_config=get_log_config(), run_cache=cache_path) as env:
+                traj = env.v_trajectory
+                traj.f_add_parameter('x', 2)
+                traj.f_add_parameter('y', 10)
+                traj.f_explore({'x': [1, 2, 3]})
+                results = env.f_run(job, calls, offset=offset)
+            return calls, [result for _, result in sorted(results)]
+
+        calls, results = make_run('first', add_offset_result, 0)
+        self.assertEqual(results, [10, 20, 30])
+        calls, results = make_run('second', add_offset_result, 0)
+        self.assertEqual(calls, [])
+        calls, results = make_run('third', add_offset_result, 100)
+        self.assertEqual(calls, [0, 1, 2])
+        self.assertEqual(results, [110, 120, 130])
+        calls, results = make_run('fourth', add_negative_offset_result, 0)
+        self.assertEqual(calls, [0, 1, 2])
+        self.assertEqual(results, [-10, -20, -30])
+
+    def test_deduplicate_runs(self):
+        filename = make_temp_dir('deduplicate_runs.hdf5')
+        calls = []
+        with Environment(filename=filename, log_config=get_log_config(),
+                         deduplicate_runs=True) as env:
+            traj = env.v_trajectory
+            traj.f_add_parameter('x', 2)
+            traj.f_add_parameter('y', 10)
+            traj.f_explore(cartesian_product({'x': [1, 2, 1], 'y': [10, 20]}))
+            results = env.f_run(add_cached_result, calls)
+
+        self.assertEqual(calls, [0, 1, 2, 3])
+        self.assertEqual(sorted(results), [(idx, x * y) for idx, (x, y) in
+                                           enumerate(zip(traj.f_get('x').f_get_range(),
+                                                         traj.f_get('y').f_get_range()))])
+
+        traj = load_trajectory(name=traj.v_name, filename=filename, load_all=2)
+        for idx, run_name in enumerate(traj.f_get_run_names()):
+            self.assertTrue(traj.f_get_run_information(run_name)['completed'])
+            self.assertEqual(traj.results.runs[run_name].z, dict(results)[idx])
+            self.assertIs(traj.results.runs[run_name].f_get('zlink'),
+                          traj.results.runs[run_name].f_get('z'))
+
 
 def with_niceness(traj):
     if traj.multiproc:
@@ -107,6 +305,41 @@ def add_large_data(traj):
     traj.f_add_result('m4ny', *array_list)
 
 
+def add_array_result(traj):
+    traj.f_add_result('runs.$.data', traj.x * np.ones((100, 100)))
+
+
+def add_scalar_result(traj):
+    traj.f_add_result('runs.$.y', traj.x)
+
+
+def add_group_and_link_result(traj):
+    group = traj.f_add_result_group('runs.$.group', comment='Group of the run')
+    group.v_annotations.run = traj.v_crun
+    group.f_add_result('nested.data', traj.x, comment='Nested data')
+    traj.f_add_link('runs.$.link', traj.par.f_get('x'))
+
+
+def add_cached_result(traj, calls):
+    calls.append(traj.v_idx)
+    traj.f_add_result('runs.$.z', traj.x * traj.y)
+    traj.f_add_derived_parameter('runs.$.w', traj.x + traj.y)
+    traj.f_add_link('results.runs.$.zlink', traj.f_get('results.runs.$.z'))
+    return traj.x * traj.y
+
+
+def add_offset_result(traj, calls, offset):
+    calls.append(traj.v_idx)
+    traj.f_add_result('runs.$.z', traj.x * traj.y + offset)
+    return traj.x * traj.y + offset
+
+
+def add_negative_offset_result(traj, calls, offset):
+    calls.append(traj.v_idx)
+    traj.f_add_result('runs.$.z', -traj.x * traj.y + offset)
+    return -traj.x * traj.y + offset
+
+
 class SimpleEnvironmentTest(TrajectoryComparator):
 
     tags = 'integration', 'hdf5', 'environment', 'quick'
@@ -0,0 +1,46 @@
+__author__ = 'Robert Meyer'
+
+import gc
+import sys
+try:
+    import tracemalloc
+except ImportError:
+    # Only available for python 3.4 and newer
+    tracemalloc = None
+
+from pypet import Trajectory
+
+
+def node_memory(n_groups, leaves_per_group):
+    """Returns the memory in bytes per tree node of a trajectory.
+
+    The trajectory contains `n_groups` groups with `leaves_per_group` results each.
+
+    """
+    gc.collect()
+    tracemalloc.start()
+    start = tracemalloc.get_traced_memory()[0]
+    traj = Trajectory(add_time=False)
+    for irun in range(n_groups):
+        for jrun in range(leaves_per_group):
+            traj.f_add_result('group%d.sub.r%d' % (irun, jrun))
+    gc.collect()
+    used = tracemalloc.get_traced_memory()[0] - start
+    tracemalloc.stop()
+    n_nodes = len(traj._nn_interface._flat_leaf_storage_dict) + len(traj._all_groups)
+    return used / float(n_nodes)
+
+
+def main():
+    if tracemalloc is None:
+        print('Measuring the memory per node requires `tracemalloc` (python 3.4 or newer), '
+              'skipping.')
+        return
+    n_groups = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    for leaves_per_group in (1, 10):
+        print('%d groups with %d leaves each: %.1f bytes per node' %
+              (n_groups, leaves_per_group, node_memory(n_groups, leaves_per_group)))
+
+
+if __name__ == '__main__':
+    main()
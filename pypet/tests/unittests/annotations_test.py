@@ -221,6 +221,36 @@ class AnnotationsTest(unittest.TestCase):
 
                 self.assertTrue(name in node.v_annotations)
 
+    def test_lazy_annotations_and_children(self):
+        traj = Trajectory(add_time=False)
+        group = traj.f_add_group('empty.group')
+        other_group = traj.f_add_group('empty.other_group')
+        leaf = traj.f_add_leaf('empty.res', 42)
+        self.assertIsNone(leaf._annotations)
+        self.assertIsNone(group._annotations)
+        self.assertTrue(group._children is other_group._children)
+        self.assertEqual(len(group._children), 0)
+
+        # Reading does not create new objects
+        self.assertEqual(leaf.f_ann_to_str(), '')
+        self.assertFalse(leaf._has_annotations())
+        self.assertIsNone(traj.empty._links.get('x'))
+        with self.assertRaises(TypeError):
+            group._children['x'] = 42
+
+        leaf.f_set_annotations(x=1)
+        self.assertTrue(leaf._has_annotations())
+        traj.f_add_link('empty.link', leaf)
+        self.assertEqual(group.f_children(), 0)
+        self.assertTrue(traj.f_get('empty.link') is leaf)
+
+        traj = pickle.loads(pickle.dumps(traj))
+        self.assertTrue(traj.empty.group._children is traj.empty.other_group._links)
+        self.assertEqual(traj.f_get('empty.res').f_get_annotations('x'), 1)
+        self.assertEqual(traj.empty.f_links(), 1)
+        traj.empty.group.f_add_leaf('new', 43)
+        self.assertEqual(traj.empty.group.new, 43)
+
 
 if __name__ == '__main__':
     opt_args = parse_args()
@@ -492,6 +492,23 @@ class ArrayParameterTest(ParameterTest):
     def test_store_load_with_hdf5(self):
         return super(ArrayParameterTest, self).test_store_load_with_hdf5()
 
+    def test_pickling_without_full_copy_omits_hashing_caches(self):
+        param = ArrayParameter('test.arr', np.zeros(1000))
+        param._explore([np.ones(1000) * irun for irun in range(200)])
+        param._store()
+        self.assertIsNotNone(param._smart_idx)
+
+        param.v_full_copy = False
+        small_dump = pickle.dumps(param)
+        param.v_full_copy = True
+        full_dump = pickle.dumps(param)
+        self.assertLess(len(small_dump) * 20, len(full_dump))
+
+        new_param = pickle.loads(small_dump)
+        self.assertIsNone(new_param._smart_range)
+        self.assertIsNone(new_param._smart_idx)
+        self.assertTrue(np.all(new_param.f_get() == param.f_get()))
+
 
 
 
@@ -651,6 +668,148 @@ class SparseParameterTest(ParameterTest):
         for key, vallist in self.explore_dict.items():
             self.param[key]._explore(vallist)
 
+    def test_packed_storage(self):
+        matrices = [spsp.csr_matrix(np.eye(3)), spsp.csc_matrix(np.eye(3) * 2),
+                    spsp.bsr_matrix(np.ones((4, 4)), blocksize=(2, 2)),
+                    spsp.dia_matrix(np.eye(4) * 3), spsp.csr_matrix((3, 3))]
+        param = SparseParameter('test.sparse', matrices[0])
+        param._explore(matrices + matrices[:2])
+
+        store_dict = param._store()
+        # A handful of entries regardless of the length of the range
+        self.assertEqual(len([key for key in store_dict if 'explored' in key]), 5)
+        meta = store_dict['explored__spsp__.packed_meta']
+        self.assertEqual(meta.shape, (len(matrices),
+                                      len(SparseParameter.PACKED_META_COLUMNS)))
+        self.assertEqual(store_dict['explored_data__spsp__'].tolist(),
+                         [0, 1, 2, 3, 4, 0, 1])
+
+        loaded = SparseParameter('test.sparse')
+        loaded._load(store_dict)
+        for matrix, loaded_matrix in zip(param.f_get_range(), loaded.f_get_range()):
+            self.assertEqual(matrix.format, loaded_matrix.format)
+            self.assertEqual(matrix.shape, loaded_matrix.shape)
+            self.assertTrue(comp.nested_equal(matrix, loaded_matrix))
+
+    def test_no_packing_of_different_dtypes(self):
+        matrices = [spsp.csr_matrix(np.eye(3)), spsp.csr_matrix(np.eye(3, dtype=int))]
+        param = SparseParameter('test.sparse', matrices[0])
+        param._explore(matrices)
+
+        self.assertFalse(param._stores_incrementally())
+        store_dict = param._store()
+        self.assertNotIn('explored__spsp__.packed_meta', store_dict)
+        self.assertEqual(param._store_flags(), {})
+
+        loaded = SparseParameter('test.sparse')
+        loaded._load(store_dict)
+        for matrix, loaded_matrix in zip(param.f_get_range(), loaded.f_get_range()):
+            self.assertEqual(matrix.dtype, loaded_matrix.dtype)
+            self.assertTrue(comp.nested_equal(matrix, loaded_matrix))
+
+
+class TypedRangeTest(unittest.TestCase):
+
+    tags = 'unittest', 'parameter', 'typed_range'
+
+    def test_python_natives_are_kept_as_arrays(self):
+        for default, explore_list in ((1, [1, 2, 3]),
+                                      (1.0, [1.0, 2.5]),
+                                      (True, [False, True]),
+                                      (1j, [2j, 3+1j]),
+                                      ('a', ['a', 'bbb', 'cc'])):
+            param = Parameter('test.param', default)
+            param._explore(explore_list)
+            self.assertIsInstance(param._explored_range, np.ndarray)
+            param_range = param.f_get_range()
+            self.assertEqual(param_range, explore_list)
+            self.assertEqual([type(x) for x in param_range],
+                             [type(default)] * len(explore_list))
+            param._set_parameter_access(1)
+            self.assertIs(type(param.f_get()), type(default))
+            self.assertEqual(param.f_get(), explore_list[1])
+
+    def test_numpy_scalars(self):
+        param = Parameter('test.param', np.float32(1.0))
+        param._explore(np.array([1.0, 2.0, 3.0], dtype=np.float32))
+        self.assertIsInstance(param._explored_range, np.ndarray)
+        self.assertTrue(all(type(x) is np.float32 for x in param.f_get_range()))
+        param._set_parameter_access(2)
+        self.assertIs(type(param.f_get()), np.float32)
+
+        with self.assertRaises(TypeError):
+            Parameter('test.param', np.float32(1.0))._explore(np.array([1.0, 2.0]))
+
+    def test_heterogeneous_data_is_still_rejected(self):
+        with self.assertRaises(TypeError):
+            Parameter('test.param', 1)._explore([1, True])
+        with self.assertRaises(TypeError):
+            Parameter('test.param', 1.0)._explore([1.0, 2])
+        with self.assertRaises(ValueError):
+            Parameter('test.param', 1)._explore([])
+
+    def test_fallback_to_lists(self):
+        param = Parameter('test.param', 1)
+        param._explore([1, 2 ** 70])
+        self.assertIsInstance(param._explored_range, list)
+        self.assertEqual(param.f_get_range(), [1, 2 ** 70])
+
+        param = PickleParameter('test.param', 1)
+        param._explore([1, 2])
+        self.assertIsInstance(param._explored_range, list)
+
+    def test_expand(self):
+        param = Parameter('test.param', 1)
+        param._explore([1, 2])
+        param.f_unlock()
+        param._expand(x for x in [3, 4])
+        self.assertIsInstance(param._explored_range, np.ndarray)
+        self.assertEqual(param.f_get_range(), [1, 2, 3, 4])
+
+        param.f_unlock()
+        param._expand([2 ** 70])
+        self.assertEqual(param.f_get_range(), [1, 2, 3, 4, 2 ** 70])
+
+    def test_store_and_load(self):
+        param = Parameter('test.param', 'a')
+        param._explore(['a', 'bb', 'ccc'])
+        store_dict = param._store()
+        self.assertIsInstance(store_dict['explored_data'], np.ndarray)
+
+        new_param = Parameter('test.param')
+        new_param._load(store_dict)
+        self.assertEqual(new_param.f_get_range(), ['a', 'bb', 'ccc'])
+
+        old_dict = {'data': ObjectTable(data={'data': [42]}),
+                    'explored_data': ObjectTable(data={'data': [1, 2, 3]})}
+        new_param = Parameter('test.param')
+        new_param._load(old_dict)
+        self.assertIsInstance(new_param._explored_range, np.ndarray)
+        self.assertEqual(new_param.f_get_range(), [1, 2, 3])
+
+    def test_store_load_with_hdf5(self):
+        filename = make_temp_dir('typed_ranges.hdf5')
+        traj = Trajectory(name='typed', filename=filename, overwrite_file=True)
+        traj.f_add_parameter('int_param', 1)
+        traj.f_add_parameter('float_param', 1.0)
+        traj.f_add_parameter('bool_param', True)
+        traj.f_add_parameter('str_param', 'a')
+        traj.f_add_parameter('np_param', np.int16(1))
+        traj.f_explore({'int_param': [1, 2, 3],
+                        'float_param': [1.0, 2.0, 3.0],
+                        'bool_param': [True, False, True],
+                        'str_param': ['a', 'bb', 'ccc'],
+                        'np_param': [np.int16(2), np.int16(3), np.int16(4)]})
+        traj.f_store()
+
+        new_traj = Trajectory(name='typed', filename=filename)
+        new_traj.f_load(load_data=2)
+        for name in ('int_param', 'float_param', 'bool_param', 'str_param', 'np_param'):
+            old_range = traj.f_get(name).f_get_range()
+            new_range = new_traj.f_get(name).f_get_range()
+            self.assertEqual(old_range, new_range)
+            self.assertEqual([type(x) for x in old_range], [type(x) for x in new_range])
+
 
 class ResultTest(TrajectoryComparator):
 
@@ -13,13 +13,14 @@ import pandas as pd
 import tables as pt
 from pypet import SharedPandasFrame,  ObjectTable, compat,  make_ordinary_result, Result, \
     make_shared_result, compact_hdf5_file, SharedCArray, SharedEArray, \
-    SharedVLArray
+    SharedVLArray, PickleResult
 
 from pypet.tests.testutils.ioutils import get_root_logger, parse_args, run_suite
 from pypet.tests.testutils.ioutils import make_temp_dir, make_trajectory_name, unittest
 from pypet.tests.testutils.data import TrajectoryComparator
 from pypet import Trajectory, SharedResult, SharedTable, SharedArray, load_trajectory, StorageContextManager
 import pypet.utils.ptcompat as ptcompat
+import pypet.utils.hdf5compression as hdf5compression
 import pypet.compat as compat
 
 class MyTable(pt.IsDescription):
@@ -267,6 +268,62 @@ class StorageDataTrajectoryTests(TrajectoryComparator):
         get_root_logger().info('New filesize is %s' % str(new_size))
         self.assertTrue(new_size < size, "%s > %s" % (str(new_size), str(size)))
 
+    @unittest.skipIf(platform.system() == 'Windows', 'Not supported under Windows')
+    def test_compacting_in_parallel(self):
+        filename = make_temp_dir('hdf5compacting_parallel.hdf5')
+        traj = Trajectory(name=make_trajectory_name(self), filename=filename,
+                          blob_store=True)
+        trajname = traj.v_name
+        config = {'a': [1, 2, 3]}
+        traj.f_add_result(PickleResult, 'pickles.res1', config, protocol=2)
+        traj.f_add_result(PickleResult, 'pickles.res2', config, protocol=2)
+        traj.f_store(only_init=True)
+
+        res = traj.f_add_result(SharedResult, 'arrays')
+        res['carray'] = SharedCArray()
+        res['carray'].create_shared_data(obj=np.arange(3000.0).reshape(1000, 3))
+        res['earray'] = SharedEArray()
+        res['earray'].create_shared_data(obj=np.ones((500, 2)))
+        res['table'] = SharedTable()
+        res['table'].create_shared_data(description={'x': pt.IntCol()})
+        traj.f_add_result('Will.Be.Deleted', np.ones(1000))
+        traj.f_store()
+        with StorageContextManager(traj):
+            traj.arrays.table.append([(irun,) for irun in range(700)])
+        traj.f_delete_item(traj.Will, recursive=True)
+
+        old_parallel_size = hdf5compression.PARALLEL_SIZE
+        old_block_size = hdf5compression.BLOCK_SIZE
+        hdf5compression.PARALLEL_SIZE = 0
+        hdf5compression.BLOCK_SIZE = 1000
+        try:
+            code = compact_hdf5_file(filename, keep_backup=False, complib='blosc',
+                                     complevel=5, ncores=2)
+        finally:
+            hdf5compression.PARALLEL_SIZE = old_parallel_size
+            hdf5compression.BLOCK_SIZE = old_block_size
+        self.assertEqual(code, 0)
+
+        hdf5file = ptcompat.open_file(filename, mode='r')
+        try:
+            traj_group = ptcompat.get_node(hdf5file, '/' + trajname)
+            self.assertEqual(traj_group.overview.blobs._v_nchildren, 1)
+            self.assertFalse('Will' in traj_group.results._v_children)
+            carray = traj_group.results.arrays.carray
+            self.assertEqual(carray.filters.complib, 'blosc')
+            self.assertEqual(carray.filters.complevel, 5)
+        finally:
+            hdf5file.close()
+
+        traj2 = load_trajectory(name=trajname, filename=filename, load_all=2)
+        self.assertEqual(traj2.res1, config)
+        self.assertEqual(traj2.res2, config)
+        with StorageContextManager(traj2):
+            self.assertTrue(np.all(traj2.arrays.carray.read() ==
+                                   np.arange(3000.0).reshape(1000, 3)))
+            self.assertTrue(np.all(traj2.arrays.earray.read() == np.ones((500, 2))))
+            self.assertTrue(np.all(traj2.arrays.table.read()['x'] == np.arange(700)))
+
     def test_all_arrays(self):
         filename = make_temp_dir('hdf5arrays.hdf5')
         traj = Trajectory(name=make_trajectory_name(self), filename=filename)
@@ -17,7 +17,8 @@ import logging
 
 from pypet import Trajectory, Parameter, load_trajectory, ArrayParameter, SparseParameter, \
     SparseResult, Result, NNGroupNode, ResultGroup, ConfigGroup, DerivedParameterGroup, \
-    ParameterGroup, Environment, pypetconstants, compat, HDF5StorageService
+    ParameterGroup, Environment, pypetconstants, compat, HDF5StorageService, PickleParameter, \
+    PickleResult, ObjectTable, LazyArray, StorageContextManager
 from pypet.tests.testutils.data import TrajectoryComparator
 from pypet.tests.testutils.ioutils import make_temp_dir, get_root_logger, \
     parse_args, run_suite, get_log_config, get_log_path
@@ -134,6 +135,305 @@ class StorageTest(TrajectoryComparator):
         x = traj.f_get('x')
         self.assertIs(x, traj._explored_parameters['parameters.x'])
 
+    def test_pickle_blob_store(self):
+        filename = make_temp_dir('blob_store.hdf5')
+        traj = Trajectory(filename=filename, overwrite_file=True, add_time=False,
+                          blob_store=True)
+        config_a = {'a': [1, 2, 3]}
+        config_b = {'b': 'hello'}
+        traj.f_add_parameter(PickleParameter, 'setting', config_a)
+        traj.f_explore({'setting': [config_a, config_b, {'a': [1, 2, 3]}, config_b]})
+        traj.f_add_result(PickleResult, 'res1', config_a, other=config_b, protocol=2)
+        traj.f_add_result(PickleResult, 'res2', config_b, protocol=2)
+        traj.f_store()
+
+        hdf5file = ptcompat.open_file(filename, mode='r')
+        try:
+            traj_group = ptcompat.get_node(hdf5file, '/' + traj.v_name)
+            blob_group = traj_group.overview.blobs
+            # Only two distinct dumps are ever written to disk
+            self.assertEqual(blob_group._v_nchildren, 2)
+            param_group = traj_group.parameters.setting
+            self.assertEqual(len([x for x in param_group._v_children if
+                                  x.startswith('xp_')]), 2)
+            self.assertEqual(getattr(param_group.data._v_attrs,
+                                     HDF5StorageService.STORAGE_TYPE),
+                             HDF5StorageService.BLOB)
+        finally:
+            hdf5file.close()
+
+        traj2 = load_trajectory(name=traj.v_name, filename=filename, load_data=2)
+        self.compare_trajectories(traj, traj2)
+        config_range = traj2.f_get('setting').f_get_range()
+        self.assertIs(config_range[1], config_range[3])
+        self.assertEqual(traj2.res2, config_b)
+
+        service = traj2.v_storage_service
+        self.assertEqual(len(service._blob_cache), 2)
+        service._blob_cache.clear()
+        traj2.f_load(load_results=pypetconstants.OVERWRITE_DATA)
+        self.assertEqual(traj2.f_get('res1').other, config_b)
+        self.assertEqual(len(service._blob_cache), 2)
+
+    def test_pickle_dumps_without_blob_store(self):
+        filename = make_temp_dir('no_blob_store.hdf5')
+        traj = Trajectory(filename=filename, overwrite_file=True, add_time=False)
+        config = {'a': [1, 2, 3]}
+        traj.f_add_parameter(PickleParameter, 'setting', config)
+        traj.f_explore({'setting': [config, {'b': 'hello'}]})
+        traj.f_add_result(PickleResult, 'res1', config, protocol=2)
+        traj.f_store()
+
+        hdf5file = ptcompat.open_file(filename, mode='r')
+        try:
+            traj_group = ptcompat.get_node(hdf5file, '/' + traj.v_name)
+            self.assertFalse('blobs' in traj_group.overview)
+            param_group = traj_group.parameters.setting
+            self.assertNotEqual(getattr(param_group.data._v_attrs,
+                                        HDF5StorageService.STORAGE_TYPE),
+                                HDF5StorageService.BLOB)
+        finally:
+            hdf5file.close()
+
+        traj2 = load_trajectory(name=traj.v_name, filename=filename, load_data=2)
+        self.compare_trajectories(traj, traj2)
+
+    def test_blob_cache_is_bounded_by_bytes(self):
+        filename = make_temp_dir('blob_cache.hdf5')
+        traj = Trajectory(filename=filename, overwrite_file=True, add_time=False,
+                          blob_store=True)
+        for idx in range(4):
+            traj.f_add_result(PickleResult, 'res%d' % idx, 'x' * 1000 + str(idx),
+                              protocol=2)
+        traj.f_store()
+
+        old_bytes = HDF5StorageService.BLOB_CACHE_BYTES
+        HDF5StorageService.BLOB_CACHE_BYTES = 2500
+        try:
+            traj2 = load_trajectory(name=traj.v_name, filename=filename, load_all=2)
+        finally:
+            HDF5StorageService.BLOB_CACHE_BYTES = old_bytes
+        service = traj2.v_storage_service
+        self.assertEqual(len(service._blob_cache), 2)
+        self.assertEqual(service._blob_cache_bytes,
+                         sum(len(dump) for dump in service._blob_cache.values()))
+        self.assertLessEqual(service._blob_cache_bytes, 2500)
+        self.assertEqual(traj2.res3, 'x' * 1000 + '3')
+
+    def test_blob_removal(self):
+        filename = make_temp_dir('blob_removal.hdf5')
+        traj = Trajectory(filename=filename, overwrite_file=True, add_time=False,
+                          blob_store=True)
+        config = {'c': [4, 5, 6]}
+        traj.f_add_result(PickleResult, 'res1', config, protocol=2)
+        traj.f_add_result(PickleResult, 'res2', config, protocol=2)
+        traj.f_store()
+
+        def count_blobs():
+            hdf5file = ptcompat.open_file(filename, mode='r')
+            try:
+                traj_group = ptcompat.get_node(hdf5file, '/' + traj.v_name)
+                return traj_group.overview.blobs._v_nchildren
+            finally:
+                hdf5file.close()
+
+        self.assertEqual(count_blobs(), 1)
+        traj.f_delete_item('res1')
+        self.assertEqual(count_blobs(), 1)
+        traj.f_delete_item('res2')
+        self.assertEqual(count_blobs(), 0)
+
+        # Overwriting the last reference of a blob removes it as well
+        traj.f_add_result(PickleResult, 'res3', config, protocol=2)
+        traj.f_store_item('res3')
+        self.assertEqual(count_blobs(), 1)
+        traj.f_get('res3').f_set(['other'])
+        traj.f_store_item('res3', overwrite=True)
+        self.assertEqual(count_blobs(), 1)
+        traj = load_trajectory(name=traj.v_name, filename=filename, load_all=2)
+        self.assertEqual(traj.res3, ['other'])
+
+    def test_incremental_array_expansion(self):
+        filename = make_temp_dir('incremental_expansion.hdf5')
+        traj = Trajectory(filename=filename, overwrite_file=True, add_time=False)
+        traj.f_add_parameter(ArrayParameter, 'arr', np.zeros(3))
+        arrays = [np.ones(3) * irun for irun in range(4)]
+        traj.f_explore({'arr': arrays[:3] + [arrays[0]]})
+        traj.f_store()
+
+        # Arrays already on disk are marked to check that they are not rewritten later on
+        hdf5file = ptcompat.open_file(filename, mode='a')
+        try:
+            param_group = ptcompat.get_node(hdf5file, '/%s/parameters/arr' % traj.v_name)
+            set_group = param_group._f_get_child('explored__rr__')._f_get_child('set_00000')
+            for node in ptcompat.iter_nodes(set_group):
+                node._v_attrs.TEST_MARKER = node._v_name
+        finally:
+            hdf5file.close()
+
+        traj.f_expand({'arr': [arrays[1], arrays[3]]})
+        self.assertFalse(traj.f_get('arr').v_stored)
+        traj.f_store()
+
+        hdf5file = ptcompat.open_file(filename, mode='r')
+        try:
+            param_group = ptcompat.get_node(hdf5file, '/%s/parameters/arr' % traj.v_name)
+            set_group = param_group._f_get_child('explored__rr__')._f_get_child('set_00000')
+            nodes = sorted(ptcompat.iter_nodes(set_group), key=lambda x: x._v_name)
+            self.assertEqual(len(nodes), 4)
+            # Arrays already on disk were not rewritten
+            for node in nodes[:3]:
+                self.assertEqual(node._v_attrs.TEST_MARKER, node._v_name)
+            self.assertNotIn('TEST_MARKER', nodes[3]._v_attrs._v_attrnames)
+            index = param_group._f_get_child('explored_data__rr__')
+            self.assertIsInstance(index, pt.EArray)
+            self.assertEqual(index.read().tolist(), [0, 1, 2, 0, 1, 3])
+        finally:
+            hdf5file.close()
+
+        traj2 = load_trajectory(name=traj.v_name, filename=filename, load_data=2)
+        self.assertEqual(len(traj2), 6)
+        self.compare_trajectories(traj, traj2)
+
+    def test_pack_scalar_results(self):
+
+        def add_results(traj):
+            idx = traj.v_idx
+            traj.f_add_result('stats.mean', 0.5 * idx, comment='Mean')
+            traj.f_add_result('stats.info', count=np.int16(idx), name='run%d' % idx,
+                              valid=idx % 2 == 0)
+            traj.f_add_result('trace', np.arange(idx + 1))
+            if idx == 2:
+                traj.f_add_result('odd', 42)
+            else:
+                traj.f_add_result('odd', 'no_int')
+
+        filename = make_temp_dir('packed_results.hdf5')
+        env = Environment(trajectory='packed', filename=filename, log_config=None,
+                          add_time=False, pack_scalar_results=True)
+        traj = env.v_traj
+        traj.f_add_parameter('x', 0)
+        traj.f_explore({'x': list(range(4))})
+        env.f_run(add_results)
+        env.f_disable_logging()
+
+        hdf5file = ptcompat.open_file(filename, mode='r')
+        try:
+            run_group = ptcompat.get_node(hdf5file, '/packed/results/runs/run_00000001')
+            # Only the array result got its own node
+            self.assertEqual(set(run_group._v_children), set(['stats', 'trace']))
+            self.assertEqual(run_group.stats._v_nchildren, 0)
+            # The integer does not match the table and was stored as usual
+            run_group = ptcompat.get_node(hdf5file, '/packed/results/runs/run_00000002')
+            self.assertIn('odd', run_group)
+            packed_group = ptcompat.get_node(hdf5file, '/packed/overview/packed_results/'
+                                                       'results/runs/run_ALL')
+            self.assertEqual(packed_group.stats.mean.nrows, 4)
+            self.assertEqual(packed_group.odd.nrows, 3)
+        finally:
+            hdf5file.close()
+
+        traj2 = load_trajectory(name=traj.v_name, filename=filename, load_data=2)
+        for idx, run_name in enumerate(traj2.f_get_run_names()):
+            run_group = traj2.f_get(run_name)
+            self.assertEqual(run_group.f_get('stats.mean').mean, 0.5 * idx)
+            self.assertEqual(run_group.f_get('stats.info').count, idx)
+            self.assertTrue(np.all(run_group.f_get('trace').trace == np.arange(idx + 1)))
+        info = traj2.f_get('run_00000003.stats.info')
+        self.assertEqual(info.name, 'run3')
+        self.assertIsInstance(info.count, np.int16)
+        self.assertIs(info.valid, False)
+        self.assertEqual(traj2.f_get('run_00000001.stats.mean').v_comment, 'Mean')
+        self.assertEqual(traj2.f_get('run_00000002.odd').odd, 42)
+
+        traj3 = load_trajectory(name=traj.v_name, filename=filename, load_results=1)
+        traj3.f_load_child('results.runs.run_00000002.stats.info', load_data=2)
+        self.assertEqual(traj3.f_get('run_00000002.stats.info').name, 'run2')
+        self.assertTrue(traj3.f_get('run_00000001.stats.mean').f_is_empty())
+        traj3.f_load_item(traj3.f_get('run_00000001.stats.mean'))
+        self.assertEqual(traj3.f_get('run_00000001.stats.mean').mean, 0.5)
+
+        traj3.f_delete_item(traj3.f_get('run_00000001.stats.mean'))
+        traj4 = load_trajectory(name=traj.v_name, filename=filename, load_data=2)
+        self.assertNotIn('results.runs.run_00000001.stats.mean', traj4)
+        self.assertEqual(traj4.f_get('run_00000003.stats.mean').mean, 1.5)
+
+    def test_columnar_padding_is_appended_blockwise(self):
+        filename = make_temp_dir('columnar_padding.hdf5')
+        with ptcompat.open_file(filename, mode='w') as hdf5file:
+            earray = ptcompat.create_earray(hdf5file, where='/', name='padded',
+                                            obj=np.zeros((0, 10), dtype=np.float64))
+            appended = []
+            append = earray.append
+            earray.append = lambda rows: appended.append(len(rows)) or append(rows)
+            old_size = HDF5StorageService.COLUMNAR_PADDING_SIZE
+            HDF5StorageService.COLUMNAR_PADDING_SIZE = 240  # 3 rows of 80 bytes
+            try:
+                HDF5StorageService._prm_pad_earray(earray, 10)
+            finally:
+                HDF5StorageService.COLUMNAR_PADDING_SIZE = old_size
+            self.assertEqual(appended, [3, 3, 3, 1])
+            self.assertEqual(earray.shape, (10, 10))
+            self.assertTrue(np.all(earray[:] == 0))
+
+    def test_columnar_results(self):
+
+        def add_results(traj):
+            idx = traj.v_idx
+            traj.f_add_result('voltage', np.ones(3) * idx, steps=idx, comment='Trace')
+            traj.f_add_result('stats.valid', idx % 2 == 0)
+            traj.f_add_result('label', 'run%d' % idx)
+            if idx == 2:
+                traj.f_add_result('trace', np.zeros(5))
+            else:
+                traj.f_add_result('trace', np.arange(3))
+
+        filename = make_temp_dir('columnar_results.hdf5')
+        env = Environment(trajectory='columnar', filename=filename, log_config=None,
+                          add_time=False, columnar_results=True)
+        traj = env.v_traj
+        traj.f_add_parameter('x', 0)
+        traj.f_explore({'x': list(range(4))})
+        env.f_run(add_results)
+        env.f_disable_logging()
+
+        hdf5file = ptcompat.open_file(filename, mode='r')
+        try:
+            run_group = ptcompat.get_node(hdf5file, '/columnar/results/runs/run_00000001')
+            # Strings are not stored in columnar format
+            self.assertEqual(set(run_group._v_children), set(['stats', 'label']))
+            self.assertIn('trace', ptcompat.get_node(hdf5file,
+                                                     '/columnar/results/runs/run_00000002'))
+            voltage = ptcompat.get_node(hdf5file,
+                                        '/columnar/results/runs_columnar/voltage/voltage')
+            self.assertIsInstance(voltage, pt.EArray)
+            self.assertEqual(voltage.shape, (4, 3))
+        finally:
+            hdf5file.close()
+
+        traj2 = load_trajectory(name=traj.v_name, filename=filename, load_data=2)
+        for idx, run_name in enumerate(traj2.f_get_run_names()):
+            run_group = traj2.f_get(run_name)
+            self.assertTrue(np.all(run_group.f_get('voltage').voltage == np.ones(3) * idx))
+            self.assertEqual(run_group.f_get('voltage').steps, idx)
+            self.assertIs(run_group.f_get('stats.valid').valid, idx % 2 == 0)
+            self.assertEqual(run_group.f_get('label').label, 'run%d' % idx)
+        self.assertIs(type(traj2.f_get('run_00000001.voltage').steps), int)
+        self.assertEqual(traj2.f_get('run_00000003.voltage').v_comment, 'Trace')
+        self.assertTrue(np.all(traj2.f_get('run_00000002.trace').trace == np.zeros(5)))
+
+        # All runs can be accessed at once
+        columnar = traj2.results.runs_columnar
+        self.assertEqual(columnar.f_get('voltage').voltage.shape, (4, 3))
+        self.assertEqual(columnar.f_get('voltage').steps.tolist(), [0, 1, 2, 3])
+        self.assertEqual(columnar.f_get('trace').run_mask.tolist(), [True, True, False, True])
+
+        traj3 = load_trajectory(name=traj.v_name, filename=filename, load_results=1)
+        traj3.f_delete_item(traj3.f_get('run_00000001.voltage'))
+        traj4 = load_trajectory(name=traj.v_name, filename=filename, load_data=2)
+        self.assertNotIn('results.runs.run_00000001.voltage', traj4)
+        self.assertEqual(traj4.f_get('run_00000003.voltage').steps, 3)
+
     def test_loading_and_storing_empty_containers(self):
         filename = make_temp_dir('empty_containers.hdf5')
         traj = Trajectory(filename=filename, add_time=True)
@@ -652,6 +952,221 @@ class StorageTest(TrajectoryComparator):
 
         self.compare_trajectories(traj, traj2)
 
+    def test_store_and_load_object_table_types(self):
+        filename = make_temp_dir('object_table_types.hdf5')
+        traj = Trajectory(name='Testtabletypes', filename=filename, add_time=True)
+        n = 1000
+        table = ObjectTable(data={'ints': list(range(n)),
+                                  'floats': [x / 3.0 for x in range(n)],
+                                  'float32': [np.float32(x) for x in range(n)],
+                                  'bools': [x % 2 == 0 for x in range(n)],
+                                  'strings': [compat.unicode_type('s%d' % x) for x in range(n)],
+                                  'int8': [np.int8(x % 100) for x in range(n)]})
+        traj.f_add_result('table', table, comment='Table of many types')
+        traj.f_store()
+
+        traj2 = load_trajectory(name=traj.v_name, filename=filename, load_data=2)
+        loaded = traj2.f_get('table').table
+        self.assertIsInstance(loaded, ObjectTable)
+        self.assertEqual(set(loaded.columns), set(table.columns))
+        for colname, typ in (('ints', int), ('floats', float), ('float32', np.float32),
+                             ('bools', bool), ('strings', compat.unicode_type),
+                             ('int8', np.int8)):
+            self.assertIs(type(loaded[colname][n - 1]), typ)
+            self.assertEqual(list(loaded[colname]), list(table[colname]))
+
+        self.compare_trajectories(traj, traj2)
+
+    def test_load_mode_mmap(self):
+        filename = make_temp_dir('load_mode_mmap.hdf5')
+        traj = Trajectory(name='Testmmap', filename=filename, add_time=True)
+        mapped = np.random.rand(50, 7)
+        chunked = np.arange(100)
+        traj.f_add_result('arrays', mapped=mapped, chunked=chunked, scalar=42)
+        traj.f_store(only_init=True)
+        traj.f_store_item('arrays', store_flags={'mapped': HDF5StorageService.ARRAY})
+
+        with self.assertRaises(ValueError):
+            load_trajectory(name=traj.v_name, filename=filename, load_mode='mymode')
+
+        traj2 = load_trajectory(name=traj.v_name, filename=filename, load_data=1)
+        traj2.f_load_item('arrays', load_mode='mmap')
+        res = traj2.f_get('arrays')
+        self.assertIsInstance(res.mapped, np.memmap)
+        self.assertFalse(res.mapped.flags.writeable)
+        self.assertTrue(np.all(res.mapped == mapped))
+        # Chunked arrays and other data are read as usual
+        self.assertNotIsInstance(res.chunked, np.memmap)
+        self.assertTrue(np.all(res.chunked == chunked))
+        self.assertEqual(res.scalar, 42)
+
+        traj3 = load_trajectory(name=traj.v_name, filename=filename, load_data=2,
+                                load_mode='mmap')
+        self.assertIsInstance(traj3.arrays.mapped, np.memmap)
+        traj3.f_load_item('arrays', load_data=3, load_mode=None)
+        self.assertIsInstance(traj3.arrays.mapped, np.memmap)
+
+        traj4 = load_trajectory(name=traj.v_name, filename=filename, load_data=2)
+        self.assertNotIsInstance(traj4.arrays.mapped, np.memmap)
+        self.assertTrue(np.all(traj4.arrays.mapped == mapped))
+
+    def test_mmap_of_uncompressed_results(self):
+        filename = make_temp_dir('mmap_uncompressed.hdf5')
+        traj = Trajectory(name='Testmmapuncompressed', filename=filename, add_time=True,
+                          complevel=0)
+        data = np.random.rand(30, 4)
+        traj.f_add_result('arrays', data=data, empty=np.zeros(0))
+        traj.f_store()
+
+        with ptcompat.open_file(filename, mode='r') as h5file:
+            group = ptcompat.get_node(h5file, '/%s/results/arrays' % traj.v_name)
+            self.assertIs(type(ptcompat.get_child(group, 'data')), pt.Array)
+
+        traj2 = load_trajectory(name=traj.v_name, filename=filename, load_data=2,
+                                load_mode='mmap')
+        self.assertIsInstance(traj2.arrays.data, np.memmap)
+        self.assertTrue(np.all(traj2.arrays.data == data))
+
+        # Memory maps are stored like ordinary arrays
+        traj2.f_migrate(filename=make_temp_dir('mmap_uncompressed_migrated.hdf5'))
+        traj2.f_store()
+        traj3 = load_trajectory(name=traj.v_name, filename=traj2.v_storage_service.filename,
+                                load_data=2)
+        self.assertIs(type(traj3.arrays.data), np.ndarray)
+        self.assertTrue(np.all(traj3.arrays.data == data))
+
+    def test_partial_loading_of_slices(self):
+        filename = make_temp_dir('load_slices.hdf5')
+        traj = Trajectory(name='Testslices', filename=filename, add_time=True)
+        v = np.random.rand(20, 300)
+        w = np.arange(50)
+        names = np.array([compat.unicode_type('n%d' % x) for x in range(10)])
+        table = ObjectTable(data={'ints': list(range(30)),
+                                  'strings': [compat.unicode_type('s%d' % x)
+                                              for x in range(30)]})
+        traj.f_add_result('monitor', v=v, w=w, table=table, answer=42)
+        traj.f_add_result('names', names=names)
+        traj.f_add_parameter('p', np.arange(10))
+        traj.f_store()
+
+        traj2 = load_trajectory(name=traj.v_name, filename=filename, load_data=1)
+        traj2.f_load_item('monitor', load_only='v', load_slice=np.s_[:, 100:200])
+        self.assertTrue(np.all(traj2.monitor.v == v[:, 100:200]))
+        self.assertNotIn('w', traj2.monitor)
+
+        traj2.f_load_item('monitor', load_data=3, load_slice=np.s_[5:10])
+        self.assertTrue(np.all(traj2.monitor.v == v[5:10]))
+        self.assertTrue(np.all(traj2.monitor.w == w[5:10]))
+        self.assertEqual(list(traj2.monitor.table['ints']), list(range(5, 10)))
+        self.assertEqual(traj2.monitor.answer, 42)
+
+        traj2.f_load_item('monitor', load_data=3, load_slice={'w': np.s_[::2],
+                                                              'table': 3})
+        self.assertTrue(np.all(traj2.monitor.v == v))
+        self.assertTrue(np.all(traj2.monitor.w == w[::2]))
+        self.assertEqual(list(traj2.monitor.table['strings']), ['s3'])
+
+        with self.assertRaises(ValueError):
+            traj2.f_load_item('p', load_slice=np.s_[2:])
+
+        traj2.f_load_item('monitor', load_data=3, load_mode='lazy')
+        lazy = traj2.monitor.v
+        self.assertIsInstance(lazy, LazyArray)
+        self.assertEqual(lazy.shape, v.shape)
+        self.assertEqual(lazy.dtype, v.dtype)
+        self.assertEqual(len(lazy), 20)
+        self.assertTrue(np.all(lazy[3, 10:20] == v[3, 10:20]))
+        self.assertTrue(np.all(np.asarray(lazy) == v))
+        self.assertIsInstance(traj2.monitor.table, ObjectTable)
+        self.assertEqual(traj2.monitor.answer, 42)
+
+        with StorageContextManager(traj2):
+            self.assertTrue(np.all(traj2.monitor.w[-3:] == w[-3:]))
+
+        # Unicode arrays are decoded no matter how they are loaded
+        traj2.f_load_item('names', load_data=3, load_slice=np.s_[2:4])
+        self.assertEqual(traj2.names.dtype, names.dtype)
+        self.assertTrue(np.all(traj2.names == names[2:4]))
+        traj2.f_load_item('names', load_data=3, load_slice=5)
+        self.assertEqual(traj2.names, names[5])
+        traj2.f_load_item('names', load_data=3, load_mode='lazy')
+        lazy_names = traj2.names
+        self.assertEqual(lazy_names.dtype, names.dtype)
+        self.assertTrue(np.all(lazy_names[1:3] == names[1:3]))
+        self.assertEqual(lazy_names[7], names[7])
+        traj2.f_load_item('names', load_data=3, load_mode='mmap')
+        self.assertEqual(traj2.names.dtype, names.dtype)
+        self.assertTrue(np.all(traj2.names == names))
+
+    def test_storing_lazy_arrays_fails(self):
+        filename = make_temp_dir('store_lazy.hdf5')
+        traj = Trajectory(name='Testlazystore', filename=filename, add_time=True)
+        v = np.random.rand(20, 30)
+        traj.f_add_result('monitor', v=v)
+        traj.f_store()
+
+        traj2 = load_trajectory(name=traj.v_name, filename=filename, load_data=2,
+                                load_mode='lazy')
+        self.assertIsInstance(traj2.monitor.v, LazyArray)
+        traj2.f_migrate(filename=make_temp_dir('store_lazy_migrated.hdf5'))
+        with self.assertRaises(pex.NoSuchServiceError):
+            traj2.f_store()
+
+        traj2.f_get('monitor').f_set(v=np.asarray(traj2.monitor.v))
+        traj2.f_store()
+        traj3 = load_trajectory(name=traj.v_name, filename=traj2.v_storage_service.filename,
+                                load_data=2)
+        self.assertTrue(np.all(traj3.monitor.v == v))
+
+    def test_access_is_checked_for_all_storage_policies(self):
+        filename = make_temp_dir('access_default_policy.hdf5')
+        traj = Trajectory(name='Testaccess', filename=filename, add_time=True)
+        traj.f_add_result('arrays', rows=np.zeros((20, 50)), other=np.ones(10))
+        traj.f_store(only_init=True)
+        with self.assertRaises(ValueError):
+            traj.f_store_item('arrays', access='diagonal')
+        with self.assertRaises(ValueError):
+            traj.f_store_item('arrays', access={'rows': 'rows', 'other': 'diagonal'})
+        traj.f_store_item('arrays', access={'rows': 'rows'})
+        traj2 = load_trajectory(name=traj.v_name, filename=filename, load_all=2)
+        self.assertTrue(np.all(traj2.arrays.rows == 0))
+
+    def test_auto_storage_policy(self):
+        filename = make_temp_dir('storage_policy.hdf5')
+        traj = Trajectory(name='Testpolicy', filename=filename, add_time=True,
+                          storage_policy='auto')
+        noise = np.random.randint(0, 256, size=(100, 1000)).astype(np.uint8)
+        monitor = np.zeros((20, 5000))
+        traj.f_add_result('arrays', noise=noise, rows=monitor, columns=monitor,
+                          default=monitor)
+        traj.f_add_result('explicit', monitor)
+        traj.f_store(only_init=True)
+        traj.f_store_item('arrays', access={'rows': 'rows', 'columns': 'columns'})
+        traj.f_store_item('explicit', complevel=9, complib='zlib')
+        traj.f_store()
+
+        with self.assertRaises(ValueError):
+            Trajectory(name='Testpolicy2', filename=filename, storage_policy='fastest')
+
+        with ptcompat.open_file(filename, mode='r') as h5file:
+            group = ptcompat.get_node(h5file, '/%s/results/arrays' % traj.v_name)
+            noise_node = ptcompat.get_child(group, 'noise')
+            self.assertEqual(noise_node.filters.complevel, 0)
+            self.assertIn('complib=None', noise_node._v_attrs.SRVC_POLICY)
+            rows_node = ptcompat.get_child(group, 'rows')
+            self.assertGreater(rows_node.filters.complevel, 0)
+            self.assertTrue(rows_node.filters.shuffle)
+            self.assertEqual(rows_node.chunkshape, (1, 5000))
+            self.assertEqual(ptcompat.get_child(group, 'columns').chunkshape, (20, 1))
+            self.assertIn('chunkshape', ptcompat.get_child(group, 'default')._v_attrs.SRVC_POLICY)
+            explicit_node = ptcompat.get_node(h5file, '/%s/results/explicit/explicit' %
+                                              traj.v_name)
+            self.assertEqual(explicit_node.filters.complevel, 9)
+            self.assertNotIn('SRVC_POLICY', explicit_node._v_attrs)
+
+        self.assertEqual(traj.f_get('config.hdf5.storage_policy').f_get(), 'auto')
+        traj2 = load_trajectory(name=traj.v_name, filename=filename, load_data=2)
+        self.compare_trajectories(traj, traj2)
 
     def test_auto_load(self):
 
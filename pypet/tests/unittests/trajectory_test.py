@@ -12,7 +12,7 @@ if (sys.version_info < (2, 7, 0)):
 else:
     import unittest
 
-from pypet.parameter import Parameter, PickleParameter, Result
+from pypet.parameter import Parameter, PickleParameter, ArrayParameter, Result
 from pypet.trajectory import Trajectory
 from pypet.naturalnaming import NaturalNamingInterface, ParameterGroup, NNGroupNode
 from pypet.storageservice import LazyStorageService
@@ -119,6 +119,109 @@ class TrajectoryTest(unittest.TestCase):
         self.assertTrue(z is self.traj.par.test)
         self.traj.v_no_clobber = False
 
+    def test_add_leaves_bulk(self):
+        traj = Trajectory()
+        items = [('bulk.group%d.x%d' % (irun % 3, irun), irun) for irun in range(30)]
+        items.append((PickleParameter, 'bulk.pickled', [1, 2, 3], 'A comment'))
+        items.append(Parameter('bulk.instance', 42))
+        new_leaves = traj.par.f_add_leaves_bulk(items)
+
+        self.assertEqual(len(new_leaves), 32)
+        self.assertTrue(new_leaves[5] is traj.f_get('parameters.bulk.group2.x5'))
+        self.assertEqual(traj.x29, 29)
+        self.assertEqual(traj.par.bulk.f_groups(), 3)
+        self.assertIsInstance(traj.f_get('pickled'), PickleParameter)
+        self.assertEqual(traj.f_get('pickled').v_comment, 'A comment')
+        self.assertEqual(traj.instance, 42)
+        self.assertTrue('parameters.bulk.group0.x3' in traj._parameters)
+        self.assertEqual(traj.f_get('group1').v_full_name, 'parameters.bulk.group1')
+
+        traj.f_add_leaves_bulk([('results.first', 1), ('derived_parameters.second', 2)])
+        self.assertIsInstance(traj.f_get('first'), Result)
+        self.assertTrue('derived_parameters.second' in traj._derived_parameters)
+
+        # Nothing is added if any of the names is invalid
+        with self.assertRaises(ValueError):
+            traj.par.f_add_leaves_bulk([('valid', 1), ('in.valid.na*me', 2)])
+        self.assertFalse('valid' in traj)
+        with self.assertRaises(AttributeError):
+            traj.par.f_add_leaves_bulk([('bulk.group0.x0', 1)])
+        with self.assertRaises(AttributeError):
+            traj.par.f_add_leaves_bulk([('bulk.pickled.below', 1)])
+
+        traj._is_run = True
+        with self.assertRaises(TypeError):
+            traj.par.f_add_leaves_bulk([('forbidden', 1)])
+
+    def test_add_leaves_bulk_rolls_back_duplicates(self):
+        traj = Trajectory()
+        traj.f_add_parameter('existing.x', 1)
+        with self.assertRaises(AttributeError):
+            traj.par.f_add_leaves_bulk([('existing.y', 1), ('newgroup.z', 2),
+                                        ('newgroup.z', 3)])
+        self.assertFalse('existing.y' in traj)
+        self.assertFalse('newgroup' in traj)
+        self.assertFalse('parameters.newgroup.z' in traj._parameters)
+        self.assertEqual(traj.par.existing.f_children(), 1)
+        # The names can be used afterwards
+        traj.par.f_add_leaves_bulk([('existing.y', 1), ('newgroup.z', 2)])
+        self.assertEqual(traj.z, 2)
+
+    def test_add_leaves_bulk_rolls_back_constructor_errors(self):
+        traj = Trajectory()
+        traj.f_add_result('existing.x', 1)
+        traj._is_run = True
+        with self.assertRaises(RuntimeError):
+            traj.res.f_add_leaves_bulk([('existing.y', 1), ('newgroup.z', 2),
+                                        (FailingResult, 'newgroup.failing')])
+        self.assertFalse('existing.y' in traj)
+        self.assertFalse('newgroup' in traj)
+        self.assertFalse('results.newgroup.z' in traj._results)
+        self.assertEqual(len(traj._new_nodes), 0)
+        traj._is_run = False
+
+    def test_interned_names(self):
+        traj = Trajectory()
+        name = ''.join(['volt', 'age'])  # Not interned by the compiler
+        res1 = traj.f_add_result('group1.%s' % name, 1)
+        res2 = traj.f_add_result(''.join(['group2.', 'volt', 'age']), 2)
+        self.assertTrue(res1.v_name is res2.v_name)
+        group1 = traj.f_get('results.group1')
+        child_name = compat.listkeys(group1._children)[0]
+        self.assertTrue(child_name is res1.v_name)
+        self.assertTrue(compat.listkeys(traj.f_get('results.group2')._children)[0] is
+                        child_name)
+
+        group1.f_add_link(''.join(['li', 'nk']), res2)
+        self.assertTrue(compat.listkeys(group1._links)[0] is compat.intern('link'))
+        self.assertTrue(traj.f_get('results.group1.link') is res2)
+
+    def test_traverse_deep_trees_and_prune(self):
+        traj = Trajectory()
+        depth = sys.getrecursionlimit() + 10
+        traj.f_add_leaf('.'.join(['g%d' % irun for irun in range(depth)]), 42)
+        self.assertEqual(len(list(traj.f_iter_nodes(recursive=True))), depth)
+        self.assertEqual(len(traj.f_get('g0').f_to_dict()), 1)
+
+        traj = Trajectory()
+        traj.f_add_leaf('keep.sub.x', 1)
+        traj.f_add_leaf('prune.sub.y', 2)
+        traj.f_add_leaf('prune.z', 3)
+        # The predicate is evaluated before children are expanded
+        visited = []
+        def predicate(node):
+            visited.append(node.v_full_name)
+            return not node.v_full_name.startswith('prune')
+        names = [x.v_full_name for x in traj.f_iter_nodes(recursive=True, predicate=predicate)]
+        self.assertEqual(names, ['keep', 'keep.sub', 'keep.sub.x'])
+        self.assertEqual(set(visited), set(['keep', 'prune', 'keep.sub', 'keep.sub.x']))
+
+        traversal = NaturalNamingInterface._traverse(traj, depth_first=True)
+        names = [x[2].v_full_name for x in traversal]
+        # Sub branches are visited one after the other
+        idx = names.index('keep')
+        self.assertEqual(names[idx:idx + 3], ['keep', 'keep.sub', 'keep.sub.x'])
+
     def test_kids(self):
         self.traj.f_add_parameter('test.test2', 42, comment='Here to stay')
         data = self.traj.kids.parameters.kids.test.kids.test2.data
@@ -568,6 +671,63 @@ class TrajectoryTest(unittest.TestCase):
             self.assertTrue(comp.nested_equal(self.traj.f_get(key,fast_access=True),
                                               explore_dict_directly[self.traj.f_get(key).v_full_name]))
 
+    def test_cached_flat_views(self):
+        traj = Trajectory()
+        traj.f_add_parameter('x', 1)
+        traj.f_add_parameter('y', 2)
+        traj.f_add_result('z', 3)
+        traj.f_explore({'x': [10, 11, 12]})
+
+        params = traj.f_get_parameters(fast_access=True)
+        self.assertEqual(params, {'parameters.x': 1, 'parameters.y': 2})
+        self.assertIn('parameters', traj._flat_views)
+        params['parameters.y'] = 'modified'
+        self.assertEqual(traj.f_get_parameters(fast_access=True)['parameters.y'], 2)
+
+        traj.v_idx = 1
+        self.assertEqual(traj.f_get_parameters(fast_access=True)['parameters.x'], 11)
+        self.assertEqual(traj.f_get_explored_parameters(fast_access=True)['parameters.x'], 11)
+        traj.v_idx = -1
+        self.assertEqual(traj.f_get_parameters(fast_access=True)['parameters.x'], 1)
+
+        traj.f_get('y').f_unlock()
+        traj.f_get('y').f_set(5)
+        self.assertEqual(traj.f_get_parameters(fast_access=True)['parameters.y'], 5)
+
+        traj.f_add_parameter('w', 7)
+        self.assertEqual(traj.f_get_parameters(fast_access=True)['parameters.w'], 7)
+        traj.parameters.f_remove_child('w')
+        self.assertNotIn('parameters.w', traj.f_get_parameters(fast_access=True))
+
+        all_dict = traj.f_to_dict(fast_access=True)
+        self.assertEqual(all_dict['parameters.y'], 5)
+        self.assertEqual(all_dict['results.z'], 3)
+        traj.f_get('results.z').f_set(4)
+        self.assertEqual(traj.f_to_dict(fast_access=True)['results.z'], 4)
+        self.assertEqual(traj.f_to_dict(fast_access=True),
+                         traj._nn_interface._to_dict(traj, fast_access=True))
+
+    def test_merge_parameters_removes_duplicates(self):
+        traj1 = Trajectory()
+        traj1.f_add_parameter('x', 0)
+        traj1.f_add_parameter(ArrayParameter, 'arr', np.zeros(2))
+        traj1.f_add_parameter(PickleParameter, 'd', {'a': 1})
+        traj1.f_explore({'x': [0, 1, 2, 3],
+                         'arr': [np.zeros(2), np.ones(2), np.zeros(2), -np.zeros(2)]})
+        traj2 = Trajectory()
+        traj2.f_add_parameter('x', 0)
+        traj2.f_add_parameter(ArrayParameter, 'arr', np.zeros(2))
+        traj2.f_add_parameter(PickleParameter, 'd', {'a': 1})
+        traj2.f_explore({'x': [3, 1, 1, 5, 0],
+                         'arr': [np.zeros(2), np.ones(2), np.zeros(2), np.zeros(2), np.ones(2)],
+                         'd': [{'a': 1}, {'a': 1}, {'a': 1}, {'a': 1}, {'a': 2}]})
+
+        used_runs, changed = traj1._merge_parameters(traj2, remove_duplicates=True)
+        self.assertEqual(used_runs, {2: 4, 3: 5, 4: 6})
+        self.assertEqual(set(changed), set(['parameters.x', 'parameters.arr', 'parameters.d']))
+        self.assertEqual(list(traj1.f_get('x').f_get_range()), [0, 1, 2, 3, 1, 5, 0])
+        self.assertEqual(len(traj1.f_get('d').f_get_range()), 7)
+
     def test_not_increase_exploration(self):
 
         self.assertTrue(len(self.traj._explored_parameters)==2)
@@ -1146,6 +1306,69 @@ class TrajectoryTest(unittest.TestCase):
         #     self.traj.f_get('depth0.findme', backwards_search=True)
 
 
+    def test_search_cache(self):
+        self.traj = Trajectory()
+        self.traj.f_add_parameter('x', 0)
+        self.traj.f_explore({'x': [1, 2, 3]})
+        for irun in range(3):
+            self.traj.f_add_result('runs.%s.deep.group.voltage' % self.traj.f_wildcard('$', irun),
+                                   irun)
+        self.traj.v_crun = 1
+
+        nn_interface = self.traj._nn_interface
+        self.assertEqual(self.traj.res.crun.voltage, 1)
+        cache_size = len(nn_interface._search_cache)
+        self.assertGreater(cache_size, 0)
+        # Repeated lookups are answered from the cache
+        self.assertEqual(self.traj.res.crun.voltage, 1)
+        self.assertEqual(len(nn_interface._search_cache), cache_size)
+
+        self.traj.v_crun = 2
+        self.assertEqual(self.traj.res.crun.voltage, 2)
+        self.assertGreater(len(nn_interface._search_cache), cache_size)
+
+        # Adding and removing nodes invalidates previous results
+        self.traj.f_add_result('runs.run_00000002.other.voltage', 22)
+        self.assertEqual(len(nn_interface._search_cache), 0)
+        # The new node is closer to the run group than the old one
+        self.assertEqual(self.traj.res.crun.voltage, 22)
+        self.traj.f_remove_item('results.runs.run_00000002.other.voltage')
+        self.assertEqual(self.traj.res.crun.voltage, 2)
+
+        self.traj.v_crun = None
+        # Also failed searches are invalidated
+        self.assertIsNone(self.traj.results.f_get_default('nothere', None))
+        self.traj.f_add_result('runs.run_00000000.deep.nothere', 42)
+        self.assertEqual(self.traj.results.nothere, 42)
+
+    def test_search_by_sorted_full_names(self):
+        self.traj = Trajectory()
+        for irun in range(12):
+            self.traj.f_add_result('g%d.deep.group.voltage' % irun, irun)
+        self.traj.f_add_result('g1.voltage', 111)
+
+        nn_interface = self.traj._nn_interface
+        self.assertEqual(list(nn_interface._iter_descendant_names('voltage', 'results.g1')),
+                         ['results.g1.deep.group.voltage', 'results.g1.voltage'])
+        # The shallowest node is found like in a breadth first search
+        self.assertEqual(self.traj.results.g1.voltage, 111)
+        self.assertEqual(self.traj.results.g10.voltage, 10)
+        self.assertEqual(self.traj.results.g1.deep.voltage, 1)
+        self.assertEqual(self.traj.results.g11.f_get('voltage', max_depth=3, fast_access=True), 11)
+        self.assertIsNone(self.traj.results.g11.f_get_default('voltage', None, max_depth=2))
+        self.assertEqual(self.traj.results.f_get('voltage', fast_access=True), 111)
+
+        # The sorted full names are kept up to date
+        self.traj.f_remove_item('results.g1.voltage')
+        self.traj.f_add_result('g10.voltage', 1010)
+        self.assertEqual(nn_interface._sorted_full_names['voltage'],
+                         sorted(nn_interface._nodes_and_leaves['voltage']))
+        self.assertEqual(self.traj.results.g1.voltage, 1)
+        self.assertEqual(self.traj.results.g10.voltage, 1010)
+        self.traj.f_add_result('g11.voltage', 1111)
+        with self.assertRaises(pex.NotUniqueNodeError):
+            self.traj.results.f_get('voltage')
+
     def test_contains_item_identity(self):
 
         peterpaul = self.traj.f_get('peter.paul')
@@ -1539,6 +1762,37 @@ class TrajectoryCopyTreeTest(TrajectoryComparator):
 
         self.assertTrue(traj1.name.resr is not traj2.name.resr)
 
+    def test_run_state_with_shared_skeleton(self):
+        traj = Trajectory()
+        traj.f_add_parameter('x', 0)
+        traj.f_add_parameter('y', 'a')
+        traj.f_explore({'x': [1, 2, 3], 'y': ['b', 'c', 'd']})
+        traj.v_full_copy = False
+
+        skeleton = traj.f_copy(copy_leaves='explored', with_links=True)
+        for idx in range(len(traj)):
+            traj.f_set_crun(idx)
+            for run_traj in (skeleton, pickle.loads(pickle.dumps(skeleton))):
+                run_traj._set_run_state(traj._get_run_state())
+                self.assertEqual(run_traj.v_idx, idx)
+                self.assertEqual(run_traj.v_crun, traj.v_crun)
+                self.assertEqual(run_traj.x, traj.x)
+                self.assertEqual(run_traj.y, traj.y)
+                self.assertEqual(run_traj.f_get_run_information(idx),
+                                 traj.f_get_run_information(idx))
+                self.assertTrue(run_traj.f_get('x') is not traj.f_get('x'))
+                # The run information of the original trajectory is not shared
+                run_traj.f_get_run_information(idx, copy=False)['completed'] = 1
+                self.assertEqual(traj.f_get_run_information(idx)['completed'], 0)
+
+        traj.f_restore_default()
+        self.assertEqual(traj.x, 0)
+
+class FailingResult(Result):
+    def __init__(self, full_name, *args, **kwargs):
+        raise RuntimeError('I cannot be constructed')
+
+
 class TrajectoryFindTest(unittest.TestCase):
 
     tags = 'unittest', 'trajectory', 'search'
@@ -1,5 +1,6 @@
 __author__ = 'Robert Meyer'
 
+import os
 import time
 import sys
 import pickle
@@ -7,6 +8,7 @@ from collections import Set, Sequence, Mapping
 
 import pandas as pd
 import numpy as np
+import scipy.sparse as spsp
 import random
 import copy as cp
 
@@ -22,10 +24,10 @@ else:
 
 from pypet.utils.explore import cartesian_product, find_unique_points
 from pypet.utils.helpful_functions import progressbar, nest_dictionary, flatten_dictionary, \
-    result_sort
+    result_sort, make_hashable, make_digest
 from pypet.utils.comparisons import nested_equal
 from pypet.utils.to_new_tree import FileUpdater
-from pypet.utils.helpful_classes import IteratorChain
+from pypet.utils.helpful_classes import IteratorChain, Journal
 from pypet.utils.decorators import retry
 import pypet.compat as compat
 from pypet import HasSlots
@@ -191,6 +193,79 @@ class TestFindUnique(unittest.TestCase):
         self.assertTrue(len(unique_elements[0][1])==3)
         self.assertTrue(len(unique_elements[3][1])==1)
 
+    def test_find_unique_order_and_values(self):
+        paramA = Parameter('ggg', 33.0)
+        paramA._explore([3.0, 1.0, 3.0, 2.0, 1.0, 3.0])
+        paramB = ArrayParameter('jjj', np.zeros(2))
+        paramB._explore([np.ones(2), np.zeros(2), np.ones(2),
+                         np.ones(2), np.zeros(2), np.ones(2)[::-1]])
+        unique_elements = find_unique_points([paramA, paramB])
+        self.assertEqual([x[1] for x in unique_elements], [[0, 2, 5], [1, 4], [3]])
+        self.assertEqual(unique_elements[1][0][0], 1.0)
+        self.assertTrue(np.all(unique_elements[1][0][1] == np.zeros(2)))
+
+    def test_find_unique_sparse(self):
+        matrix = spsp.csr_matrix((3, 3))
+        matrix[1, 2] = 4.0
+        paramA = SparseParameter('sss', matrix)
+        paramA._explore([matrix, matrix.tocsc(), matrix.copy(), spsp.csr_matrix((3, 3))])
+        unique_elements = find_unique_points([paramA])
+        self.assertEqual([x[1] for x in unique_elements], [[0, 2], [1], [3]])
+
+    def test_find_unique_unhashable(self):
+        paramA = PickleParameter('ppp', {'a': 1})
+        paramA._explore([{'a': 1}, {'a': 2}, {'a': 1}])
+        unique_elements = find_unique_points([paramA])
+        self.assertEqual([x[1] for x in unique_elements], [[0, 2], [1]])
+
+    def test_canonical_hashing(self):
+        matrix = spsp.csr_matrix((3, 3))
+        matrix[1, 2] = 4.0
+        equal_values = [(np.arange(3), np.arange(3.0)),
+                        (np.zeros(2), -np.zeros(2)),
+                        ((np.ones(2), 1.0), [np.ones(2, dtype=bool), 1]),
+                        (matrix, matrix.tocsc().astype(np.float32)),
+                        (spsp.csr_matrix((3, 3)), spsp.csc_matrix((4, 4)))]
+        for val1, val2 in equal_values:
+            self.assertTrue(nested_equal(val1, val2))
+            self.assertEqual(hash(make_hashable(val1, canonical=True)),
+                             hash(make_hashable(val2, canonical=True)))
+        self.assertNotEqual(hash(make_hashable(np.arange(3), canonical=True)),
+                            hash(make_hashable(np.arange(1, 4), canonical=True)))
+        self.assertNotEqual(hash(make_hashable(np.arange(3))),
+                            hash(make_hashable(np.arange(3.0))))
+
+    def test_make_digest(self):
+        values = [42, 'hi', (1, [2.0, 'x']), np.arange(6).reshape(2, 3),
+                  spsp.csr_matrix(np.eye(3))]
+        digests = [make_digest(value) for value in values]
+        self.assertEqual(len(set(digests)), len(values))
+        self.assertEqual(digests, [make_digest(cp.deepcopy(value)) for value in values])
+        self.assertNotEqual(make_digest(np.arange(3)), make_digest(np.arange(3.0)))
+        self.assertNotEqual(make_digest(1), make_digest(1.0))
+
+        # Large arrays within containers are not abbreviated
+        large1 = np.zeros(10000)
+        large2 = large1.copy()
+        large2[5000] = 1.0
+        self.assertNotEqual(make_digest({'a': large1}), make_digest({'a': large2}))
+        self.assertNotEqual(make_digest([large1]), make_digest([large2]))
+        # Dictionaries and sets do not depend on their order
+        dict1 = dict((str(irun), irun) for irun in range(100))
+        dict2 = dict((str(irun), irun) for irun in reversed(range(100)))
+        self.assertEqual(make_digest(dict1), make_digest(dict2))
+        self.assertNotEqual(make_digest({'a': 1}), make_digest({'a': 2}))
+        self.assertEqual(make_digest(set(range(100))), make_digest(set(reversed(range(100)))))
+        self.assertNotEqual(make_digest(set([1, 2])), make_digest(set([1, 3])))
+        # Other objects are pickled instead of using their representation
+        slots = [Slots1() for irun in range(3)]
+        for irun, slot in enumerate(slots):
+            slot.hi = irun % 2
+        self.assertEqual(make_digest(slots[0]), make_digest(slots[2]))
+        self.assertNotEqual(make_digest(slots[0]), make_digest(slots[1]))
+        with self.assertRaises(TypeError):
+            make_digest(lambda x: x)
+
 
 class TestDictionaryMethods(unittest.TestCase):
 
@@ -516,6 +591,80 @@ class TestIteratorChain(unittest.TestCase):
 
         self.assertEqual(len(elem_list), 9)
 
+
+class TestJournal(unittest.TestCase):
+
+    tags = 'unittest', 'utils', 'journal'
+
+    def test_append_and_read(self):
+        filename = make_temp_dir('journal.jcnt')
+        if os.path.exists(filename):
+            os.remove(filename)
+        journal = Journal(filename, fsync_interval=0.0)
+        self.assertEqual(list(journal), [])
+        records = [compat.tobytes('record%d' % irun) * irun for irun in range(5)]
+        for record in records:
+            journal.append(record)
+        journal.close()
+        self.assertEqual(list(Journal(filename)), records)
+
+    def test_torn_tail(self):
+        filename = make_temp_dir('torn_journal.jcnt')
+        if os.path.exists(filename):
+            os.remove(filename)
+        journal = Journal(filename)
+        journal.append(compat.tobytes('first'))
+        journal.append(compat.tobytes('second'))
+        journal.close()
+        size = os.path.getsize(filename)
+
+        # Simulate a crash during writing the third record
+        with open(filename, 'ab') as journal_file:
+            journal_file.write(Journal.HEADER.pack(Journal.MAGIC, 100, 42) +
+                               compat.tobytes('thi'))
+
+        journal = Journal(filename)
+        self.assertEqual(list(journal), [compat.tobytes('first'), compat.tobytes('second')])
+        self.assertEqual(os.path.getsize(filename), size)
+        journal.append(compat.tobytes('third'))
+        journal.close()
+        self.assertEqual(list(Journal(filename)), [compat.tobytes('first'),
+                                                   compat.tobytes('second'),
+                                                   compat.tobytes('third')])
+
+        # Corrupt the payload of the last record
+        with open(filename, 'r+b') as journal_file:
+            journal_file.seek(-1, os.SEEK_END)
+            journal_file.write(compat.tobytes('X'))
+        self.assertEqual(list(Journal(filename)), [compat.tobytes('first'),
+                                                   compat.tobytes('second')])
+
+    def test_zero_filled_tail(self):
+        filename = make_temp_dir('zero_journal.jcnt')
+        if os.path.exists(filename):
+            os.remove(filename)
+        journal = Journal(filename)
+        journal.append(compat.tobytes('first'))
+        journal.append(compat.tobytes(''))
+        journal.close()
+        size = os.path.getsize(filename)
+
+        # Simulate a crash after the file was extended but before data was written
+        with open(filename, 'ab') as journal_file:
+            journal_file.write(compat.tobytes('\x00') * (5 * Journal.HEADER.size))
+
+        self.assertEqual(list(Journal(filename)), [compat.tobytes('first'),
+                                                   compat.tobytes('')])
+        self.assertEqual(os.path.getsize(filename), size)
+
+        # A corrupted length does not make us read beyond the end of the file
+        with open(filename, 'ab') as journal_file:
+            journal_file.write(Journal.HEADER.pack(Journal.MAGIC, 2 ** 62, 0))
+        self.assertEqual(list(Journal(filename)), [compat.tobytes('first'),
+                                                   compat.tobytes('')])
+        self.assertEqual(os.path.getsize(filename), size)
+
+
 class Slots1(HasSlots):
     __slots__ = 'hi'
 
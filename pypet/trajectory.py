@@ -40,7 +40,7 @@ import pypet.storageservice as storage
 import pypet.utils.dynamicimports as dynamicimports
 from pypet.utils.decorators import kwargs_api_change, not_in_run, copydoc, deprecated,\
     kwargs_mutual_exclusive, manual_run
-from pypet.utils.helpful_functions import is_debug, format_time
+from pypet.utils.helpful_functions import is_debug, format_time, make_hashable
 from pypet.utils.storagefactory import storage_factory
 
 
@@ -277,6 +277,10 @@ class Trajectory(DerivedParameterGroup, ResultGroup, ParameterGroup, ConfigGroup
 
         self._changed_default_parameters = {}  # Needed for paremeter presetting
 
+        self._flat_views = {}  # Cached dictionaries of parameter values for fast access,
+        # each stored together with the state of the trajectory they are valid for
+        self._access_version = 0  # Incremented whenever explored parameters change their value
+
         self._single_run_ids = {}  # A bidrectional dictionary conataining the mapping between
         # a run name and the run index (e.g. `1 <-> 'run_00000001'`), in both directions
 
@@ -405,6 +409,7 @@ class Trajectory(DerivedParameterGroup, ResultGroup, ParameterGroup, ConfigGroup
             result['_updated_run_information'] = set()
 
         result['_wildcard_cache'] = {}
+        result['_flat_views'] = {}
         return result
 
     def __str__(self):
@@ -1093,9 +1098,16 @@ class Trajectory(DerivedParameterGroup, ResultGroup, ParameterGroup, ConfigGroup
                                '`-1`. `%s` is actual an already given run name.' % dummy)
 
     def _remove_exploration(self):
-        """ Called if trajectory is expanded, deletes all explored parameters from disk """
+        """ Called if trajectory is expanded, deletes all explored parameters from disk.
+
+        Parameters that can store their expansion incrementally are kept on disk but
+        marked as not stored, so the new part of their range is appended on the next store.
+
+        """
         for param in compat.itervalues(self._explored_parameters):
-            if param._stored:
+            if param._stored and param._stores_incrementally():
+                param._stored = False
+            elif param._stored:
                 try:
                     self.f_delete_item(param)
                 except Exception:
@@ -1150,6 +1162,7 @@ class Trajectory(DerivedParameterGroup, ResultGroup, ParameterGroup, ConfigGroup
         # and blind out other single run results, this can be changed via 'v_crun'.
         new_traj._idx = self._idx
         new_traj._crun = self._crun
+        new_traj._access_version = self._access_version
 
         new_traj._standard_parameter = self._standard_parameter
         new_traj._standard_result = self._standard_result
@@ -1231,8 +1244,7 @@ class Trajectory(DerivedParameterGroup, ResultGroup, ParameterGroup, ConfigGroup
 
         def _copy_skeleton(node_in, node_out):
             """Copies the skeleton of from `node_out` to `node_in`"""
-            new_annotations = node_out.v_annotations
-            node_in._annotations = new_annotations
+            node_in._annotations = node_out._annotations
             node_in.v_comment = node_out.v_comment
 
         def _add_leaf(leaf):
@@ -2487,7 +2499,9 @@ class Trajectory(DerivedParameterGroup, ResultGroup, ParameterGroup, ConfigGroup
 
             load_dict = other_instance._store()
             my_instance._load(load_dict)
-            my_instance.f_set_annotations(**other_instance.v_annotations.f_to_dict(copy=False))
+            if other_instance._has_annotations():
+                my_instance.f_set_annotations(
+                    **other_instance.v_annotations.f_to_dict(copy=False))
             my_instance.v_comment = other_instance.v_comment
 
             self.f_store_item(my_instance)
@@ -2519,6 +2533,9 @@ class Trajectory(DerivedParameterGroup, ResultGroup, ParameterGroup, ConfigGroup
                 continue
             split_name = result_name.split('.')
             ignore_data.add(result_name)
+            if split_name[:2] == ['results', 'runs_columnar']:
+                # Columnar results are rebuilt from the merged results of the single runs
+                continue
             if any(x in other_trajectory._reversed_wildcards and x not in allowed_translations
                         for x in split_name):
                 continue
@@ -2669,25 +2686,41 @@ class Trajectory(DerivedParameterGroup, ResultGroup, ParameterGroup, ConfigGroup
 
             # We need to compare all parameter combinations in the current trajectory
             # to all parameter combinations in the other trajectory to spot duplicate points.
-            # Quadratic Complexity!
-            for irun in compat.xrange(len(other_trajectory)):
-                for jrun in compat.xrange(len(self)):
+            # To avoid quadratic complexity, all points of the current trajectory are
+            # hashed and points of the other trajectory are only compared to points
+            # with the same hash.
+            param_pairs = compat.listvalues(params_to_change)
+            my_values = [self._get_point_values(my_param, len(self))
+                         for my_param, _ in param_pairs]
+            other_values = [self._get_point_values(other_param, len(other_trajectory))
+                            for _, other_param in param_pairs]
+            my_keys = []
+            other_keys = []
+            for idx, (my_param, _) in enumerate(param_pairs):
+                keys = self._hash_values(my_param, my_values[idx], other_values[idx])
+                my_keys.append(keys[0])
+                other_keys.append(keys[1])
+
+            if param_pairs:
+                my_signatures = zip(*my_keys)
+                other_signatures = zip(*other_keys)
+            else:
+                # Without any parameters to compare all points are equal
+                my_signatures = [()] * len(self)
+                other_signatures = [()] * len(other_trajectory)
+
+            my_points = {}
+            for jrun, signature in enumerate(my_signatures):
+                my_points.setdefault(signature, []).append(jrun)
+
+            for irun, signature in enumerate(other_signatures):
+                for jrun in my_points.get(signature, ()):
+                    # Different points might share a hash, so we still need to
+                    # compare the values
                     change = True
-
-                    # Check all marked parameters
-                    for my_param, other_param in compat.itervalues(params_to_change):
-                        if other_param.f_has_range():
-                            other_param._set_parameter_access(irun)
-
-                        if my_param.f_has_range():
-                            my_param._set_parameter_access(jrun)
-
-                        val1 = my_param.f_get()
-                        val2 = other_param.f_get()
-
-                        # If only one parameter differs, the parameter space point differs
-                        # and we can skip the rest of the parameters
-                        if not my_param._equal_values(val1, val2):
+                    for idx, (my_param, other_param) in enumerate(param_pairs):
+                        if not my_param._equal_values(my_values[idx][jrun],
+                                                      other_values[idx][irun]):
                             change = False
                             break
 
@@ -2700,6 +2733,7 @@ class Trajectory(DerivedParameterGroup, ResultGroup, ParameterGroup, ConfigGroup
                         break
 
             # Restore changed default values
+            self._access_version += 1
             for my_param, other_param in compat.itervalues(params_to_change):
                 other_param._restore_default()
                 my_param._restore_default()
@@ -2748,6 +2782,39 @@ class Trajectory(DerivedParameterGroup, ResultGroup, ParameterGroup, ConfigGroup
 
         return used_runs, compat.listkeys(params_to_change)
 
+    @staticmethod
+    def _get_point_values(param, length):
+        """Returns a list of the values of `param` in all runs"""
+        if not param.f_has_range():
+            return [param.f_get()] * length
+        values = []
+        for idx in compat.xrange(length):
+            param._set_parameter_access(idx)
+            values.append(param.f_get())
+        return values
+
+    @staticmethod
+    def _hash_values(param, *value_lists):
+        """Hashes lists of values of a parameter for duplicate detection.
+
+        Values are hashed via :func:`~pypet.utils.helpful_functions.make_hashable`
+        such that values considered equal by the parameter share a hash.
+        This is only guaranteed if the parameter relies on the equality
+        implemented in :mod:`pypet.parameter`. If a subclass comes with its own notion
+        of equality, or if some of the values cannot be hashed, all values are mapped
+        to `None` instead.
+
+        :return: List of hash lists, one for each value list
+
+        """
+        if param._equal_values.__module__ == BaseParameter.__module__:
+            try:
+                return [[hash(make_hashable(value, canonical=True)) for value in values]
+                        for values in value_lists]
+            except TypeError:
+                pass
+        return [[None] * len(values) for values in value_lists]
+
     @not_in_run
     def f_migrate(self, new_name=None, in_store=False,
                   new_storage_service=None, **kwargs):
@@ -2896,6 +2963,7 @@ class Trajectory(DerivedParameterGroup, ResultGroup, ParameterGroup, ConfigGroup
         v_idx property back to -1 and v_crun to None."""
         self._idx = -1
         self._crun = None
+        self._access_version += 1
         for param in compat.itervalues(self._explored_parameters):
             if param is not None:
                 param._restore_default()
@@ -2905,10 +2973,47 @@ class Trajectory(DerivedParameterGroup, ResultGroup, ParameterGroup, ConfigGroup
         they should represent.
 
         """
+        self._access_version += 1
         for param in compat.itervalues(self._explored_parameters):
             if param is not None:
                 param._set_parameter_access(idx)
 
+    def _get_run_state(self):
+        """Returns what distinguishes the current single run from any other run.
+
+        This is the run index, the run name, a copy of the run information, and shallow copies
+        of the explored parameters. Note that ``v_full_copy`` determines how these will be copied.
+
+        Together with a single copy of the trajectory shared by all runs
+        the state is sufficient to reconstruct the trajectory
+        of a particular run, see :func:`~pypet.trajectory.Trajectory._set_run_state`.
+
+        """
+        explored_parameters = [cp.copy(param) for param in
+                               compat.itervalues(self._explored_parameters)
+                               if param is not None]
+        return (self._idx, self._crun, self._run_information[self._crun].copy(),
+                explored_parameters)
+
+    def _set_run_state(self, run_state):
+        """Turns the trajectory into the one of the single run described by `run_state`.
+
+        :param run_state: Tuple as returned by :func:`~pypet.trajectory.Trajectory._get_run_state`
+
+        """
+        idx, run_name, run_information, explored_parameters = run_state
+        # Copies of a trajectory share these dictionaries with the original one
+        self._single_run_ids = self._single_run_ids.copy()
+        self._run_information = self._run_information.copy()
+        self._idx = idx
+        self._crun = run_name
+        self._single_run_ids[idx] = run_name
+        self._single_run_ids[run_name] = idx
+        self._run_information[run_name] = run_information
+        self._access_version += 1
+        for param in explored_parameters:
+            self._copy_from(param, overwrite=True)
+
     def _make_single_run(self):
         """ Modifies the trajectory for single runs executed by the environment """
         self._is_run = False # to be able to use f_set_crun
@@ -3395,14 +3500,17 @@ class Trajectory(DerivedParameterGroup, ResultGroup, ParameterGroup, ConfigGroup
         """
         return self._environment_name
 
-    @staticmethod
-    def _return_item_dictionary(param_dict, fast_access, copy):
+    def _return_item_dictionary(self, param_dict, fast_access, copy, view_name=None):
         """Returns a dictionary containing either all parameters, all explored parameters,
         all config, all derived parameters, or all results.
 
         :param param_dict: The dictionary which is about to be returned
         :param fast_access: Whether to use fast access
         :param copy: If the original dict should be returned or a shallow copy
+        :param view_name:
+
+            If given, values for fast access are cached under this name,
+            see :func:`~pypet.trajectory.Trajectory._get_flat_view`.
 
         :return: The dictionary
 
@@ -3418,6 +3526,8 @@ class Trajectory(DerivedParameterGroup, ResultGroup, ParameterGroup, ConfigGroup
                 return param_dict.copy()
             else:
                 return param_dict
+        elif view_name is not None:
+            return self._get_flat_view(view_name, param_dict, lambda param: param.f_get()).copy()
         else:
             resdict = {}
             for key in param_dict:
@@ -3428,6 +3538,37 @@ class Trajectory(DerivedParameterGroup, ResultGroup, ParameterGroup, ConfigGroup
 
             return resdict
 
+    def _get_flat_view(self, view_name, param_dict, getter):
+        """Returns a cached dictionary mapping the keys of `param_dict` to `getter(param)`.
+
+        The dictionary is cached if all parameters are locked afterwards.
+        Values of locked parameters can only change if parameters are
+        added, removed, or unlocked, or if the trajectory changes the access
+        of explored parameters (e.g. by setting `v_idx`).
+        The cached dictionary is stamped with counters of all these events
+        and rebuilt if any of them changed.
+
+        Do not modify the returned dictionary!
+
+        """
+        stamp = (self._nn_interface._tree_version, self._access_version,
+                 BaseParameter._unlock_count, len(param_dict))
+        try:
+            view_stamp, view = self._flat_views[view_name]
+            if view_stamp == stamp:
+                return view
+        except KeyError:
+            pass
+
+        view = {}
+        all_locked = True
+        for key, param in compat.iteritems(param_dict):
+            view[key] = getter(param)
+            all_locked = all_locked and getattr(param, 'v_locked', False)
+        if all_locked:
+            self._flat_views[view_name] = (stamp, view)
+        return view
+
     def _finalize_run(self):
         """Called by the environment after storing to perform some rollback operations.
 
@@ -3481,6 +3622,20 @@ class Trajectory(DerivedParameterGroup, ResultGroup, ParameterGroup, ConfigGroup
         :raises: ValueError
 
         """
+        if fast_access and not short_names and copy:
+            # Values of parameters are cached, only results and other leaves are
+            # accessed anew
+            getter = lambda leaf: self._nn_interface._apply_fast_access(leaf, True)
+            result_dict = {}
+            for name in ('config', 'parameters', 'derived_parameters'):
+                result_dict.update(self._get_flat_view(('to_dict', name),
+                                                       getattr(self, '_' + name),
+                                                       getter))
+            for leaf_dict in (self._results, self._other_leaves):
+                for key, leaf in compat.iteritems(leaf_dict):
+                    result_dict[key] = getter(leaf)
+            return result_dict
+
         return self._nn_interface._to_dict(self, fast_access=fast_access,
                                            short_names=short_names,
                                            copy=copy, with_links=with_links)
@@ -3507,7 +3662,8 @@ class Trajectory(DerivedParameterGroup, ResultGroup, ParameterGroup, ConfigGroup
         :raises: ValueError
 
         """
-        return self._return_item_dictionary(self._config, fast_access, copy)
+        return self._return_item_dictionary(self._config, fast_access, copy,
+                                            view_name='config')
 
     def f_get_parameters(self, fast_access=False, copy=True):
         """ Returns a dictionary containing the full parameter names as keys and the parameters
@@ -3531,7 +3687,8 @@ class Trajectory(DerivedParameterGroup, ResultGroup, ParameterGroup, ConfigGroup
         :raises: ValueError
 
         """
-        return self._return_item_dictionary(self._parameters, fast_access, copy)
+        return self._return_item_dictionary(self._parameters, fast_access, copy,
+                                            view_name='parameters')
 
 
     def f_get_explored_parameters(self, fast_access=False, copy=True):
@@ -3560,7 +3717,8 @@ class Trajectory(DerivedParameterGroup, ResultGroup, ParameterGroup, ConfigGroup
         :raises: ValueError
 
         """
-        return self._return_item_dictionary(self._explored_parameters, fast_access, copy)
+        return self._return_item_dictionary(self._explored_parameters, fast_access, copy,
+                                            view_name='explored_parameters')
 
     def f_get_derived_parameters(self, fast_access=False, copy=True):
         """ Returns a dictionary containing the full parameter names as keys and the parameters
@@ -3584,7 +3742,8 @@ class Trajectory(DerivedParameterGroup, ResultGroup, ParameterGroup, ConfigGroup
         :raises: ValueError
 
         """
-        return self._return_item_dictionary(self._derived_parameters, fast_access, copy)
+        return self._return_item_dictionary(self._derived_parameters, fast_access, copy,
+                                            view_name='derived_parameters')
 
     def f_get_results(self, fast_access=False, copy=True):
         """ Returns a dictionary containing the full result names as keys and the corresponding
@@ -3771,6 +3930,22 @@ class Trajectory(DerivedParameterGroup, ResultGroup, ParameterGroup, ConfigGroup
                 A warning is issued if names listed in `load_except` are not part of the
                 items to load.
 
+            :param load_slice:
+
+                If you load a result, you can read only parts of its numpy arrays
+                and tables, e.g. `load_only='v', load_slice=np.s_[:, 1000:2000]`.
+                Either an index expression applied to all arrays and tables or
+                a dictionary mapping the names of data items to index expressions.
+                Only the requested hyperslabs are read from disk.
+
+            :param load_mode:
+
+                Overrides the `load_mode` of the storage service for the items.
+                `'lazy'` loads numpy arrays of results as
+                :class:`~pypet.storageservice.LazyArray` proxies that read only the
+                hyperslabs that are indexed, `'mmap'` returns memory maps of
+                contiguous arrays.
+
         """
 
         if not self._stored:
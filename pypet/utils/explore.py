@@ -1,12 +1,8 @@
 """Module containing factory functions for parameter exploration"""
 
 import logging
-import sys
+import numbers
 import itertools as itools
-if sys.version_info < (2, 7, 0):
-    from ordereddict import OrderedDict
-else:
-    from collections import OrderedDict
 
 try:
     from future_builtins import zip
@@ -15,7 +11,10 @@ except ImportError:  # not 2.6+ or is 3.x
         from itertools import izip as zip  # < 2.5 or 3.x
     except ImportError:
         pass
+import numpy as np
+
 import pypet.compat as compat
+from pypet.utils.helpful_functions import make_hashable
 
 
 def cartesian_product(parameter_dict, combined_parameters=()):
@@ -75,10 +74,38 @@ def cartesian_product(parameter_dict, combined_parameters=()):
     return result_dict
 
 
+def _range_codes(param_range):
+    """Maps the entries of an exploration range to integer codes.
+
+    Equal entries share the same code. Ranges of numeric scalars are handled vectorized
+    via `np.unique`, all other ranges are hashed with
+    :func:`~pypet.utils.helpful_functions.make_hashable`.
+
+    :return: Numpy integer array of codes
+
+    :raises: TypeError if entries of the range cannot be hashed
+
+    """
+    first = param_range[0]
+    if isinstance(first, (numbers.Number, np.number, np.bool_)):
+        array = np.asarray(param_range)
+        if array.ndim == 1 and array.dtype.kind in 'biufc':
+            _, codes = np.unique(array, return_inverse=True)
+            return codes.ravel()
+
+    codes = np.empty(len(param_range), dtype=np.intp)
+    code_dict = {}
+    for idx, val in enumerate(param_range):
+        codes[idx] = code_dict.setdefault(make_hashable(val), len(code_dict))
+    return codes
+
+
 def find_unique_points(explored_parameters):
     """Takes a list of explored parameters and finds unique parameter combinations.
 
-    If parameter ranges are hashable operates in O(N), otherwise O(N**2).
+    Ranges of numeric scalars are compared vectorized, all other ranges are hashed
+    (numpy arrays and sparse matrices via their data), so this operates in O(N log N).
+    Only if parameter ranges cannot be hashed, it falls back to O(N**2).
 
     :param explored_parameters:
 
@@ -88,35 +115,55 @@ def find_unique_points(explored_parameters):
 
         List of tuples, first entry being the parameter values, second entry a list
         containing the run position of the unique combination.
+        The list is ordered by the first occurrence of each combination.
 
     """
     ranges = [param.f_get_range(copy=False) for param in explored_parameters]
-    zipped_tuples = list(zip(*ranges))
+    if len(ranges) == 0:
+        return []
     try:
-        unique_elements = OrderedDict()
-        for idx, val_tuple in enumerate(zipped_tuples):
-            if val_tuple not in unique_elements:
-                unique_elements[val_tuple] = []
-            unique_elements[val_tuple].append(idx)
-        return compat.listitems(unique_elements)
+        codes = np.column_stack([_range_codes(param_range) for param_range in ranges])
     except TypeError:
         logger = logging.getLogger('pypet.find_unique')
         logger.error('Your parameter entries could not be hashed, '
                      'now I am sorting slowly in O(N**2).')
-        unique_elements = []
-        for idx, val_tuple in enumerate(zipped_tuples):
-            matches = False
-            for added_tuple, pos_list in unique_elements:
-                matches = True
-                for idx2, val in enumerate(added_tuple):
-                    if not explored_parameters[idx2]._equal_values(val_tuple[idx2], val):
-                        matches = False
-                        break
-                if matches:
-                    pos_list.append(idx)
+        return _find_unique_points_slow(explored_parameters, ranges)
+
+    # Rows are compared as raw bytes because `np.unique` supports `axis` only
+    # for numpy 1.13 and newer
+    codes = np.ascontiguousarray(codes)
+    rows = codes.view(np.dtype((np.void, codes.dtype.itemsize * codes.shape[1]))).ravel()
+    _, first_idx, inverse = np.unique(rows, return_index=True, return_inverse=True)
+    # `np.unique` sorts the combinations, we relabel them by their first occurrence
+    rank = np.empty(len(first_idx), dtype=np.intp)
+    rank[np.argsort(first_idx)] = np.arange(len(first_idx))
+    labels = rank[inverse.ravel()]
+    positions = np.argsort(labels, kind='mergesort')
+    splits = np.cumsum(np.bincount(labels))[:-1]
+
+    unique_elements = []
+    for pos_array in np.split(positions, splits):
+        pos_list = pos_array.tolist()
+        first = pos_list[0]
+        val_tuple = tuple(param_range[first] for param_range in ranges)
+        unique_elements.append((val_tuple, pos_list))
+    return unique_elements
+
+
+def _find_unique_points_slow(explored_parameters, ranges):
+    """Finds unique parameter combinations by pairwise comparison in O(N**2)"""
+    unique_elements = []
+    for idx, val_tuple in enumerate(zip(*ranges)):
+        matches = False
+        for added_tuple, pos_list in unique_elements:
+            matches = True
+            for idx2, val in enumerate(added_tuple):
+                if not explored_parameters[idx2]._equal_values(val_tuple[idx2], val):
+                    matches = False
                     break
-            if not matches:
-                unique_elements.append((val_tuple, [idx]))
-        return unique_elements
-
-
+            if matches:
+                pos_list.append(idx)
+                break
+        if not matches:
+            unique_elements.append((val_tuple, [idx]))
+    return unique_elements
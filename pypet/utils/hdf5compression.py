@@ -1,21 +1,132 @@
-"""Module to allow hdf5 compression via ptrepack directly within python scripts"""
+"""Module to compact and (re-)compress hdf5 files directly within python scripts"""
 
 __author__ = 'Robert Meyer'
 
 import os
-import subprocess
+import time
+import traceback
+import multiprocessing as multip
+
+import tables as pt
 
 from pypet.trajectory import load_trajectory
+from pypet.storageservice import HDF5StorageService
 from pypet import pypetconstants
+import pypet.utils.ptcompat as ptcompat
+
+
+BLOCK_SIZE = 2 ** 24
+''' Bytes of the blocks of rows read in parallel'''
+
+PARALLEL_SIZE = 2 ** 26
+''' Leaves with more bytes than this are copied in parallel if `ncores > 1`'''
+
+
+_reader_file = None  # Read-only file handle of a reader process
+
 
+def _open_reader_file(filename):
+    """Opens the file to compact within a reader process"""
+    global _reader_file
+    _reader_file = ptcompat.open_file(filename, mode='r')
 
-def compact_hdf5_file(filename, name=None, index=None, keep_backup=True):
+
+def _read_block(args):
+    """Reads rows `start` to `stop` of the leaf at `path` within a reader process"""
+    path, start, stop = args
+    leaf = ptcompat.get_node(_reader_file, path)
+    return start, leaf.read(start, stop)
+
+
+def _is_parallel_leaf(leaf, ncores):
+    """Checks if a leaf can be copied block by block by several reader processes"""
+    if ncores <= 1 or leaf.size_in_memory < PARALLEL_SIZE or leaf.nrows < 2:
+        return False
+    if type(leaf) is pt.CArray:
+        return True
+    if type(leaf) is pt.EArray:
+        return leaf.extdim == 0
+    if type(leaf) is pt.Table:
+        return not leaf.indexed
+    return False
+
+
+def _copy_parallel(leaf, new_group, filters, pool):
+    """Creates an empty copy of `leaf` and fills it with blocks read by the `pool`"""
+    new_file = new_group._v_file
+    name = leaf._v_name
+    if type(leaf) is pt.Table:
+        new_leaf = ptcompat.create_table(new_file, where=new_group, name=name,
+                                         description=leaf.description, title=leaf.title,
+                                         filters=filters, expectedrows=leaf.nrows,
+                                         chunkshape=leaf.chunkshape)
+    elif type(leaf) is pt.EArray:
+        new_leaf = ptcompat.create_earray(new_file, where=new_group, name=name,
+                                          atom=leaf.atom, shape=(0,) + leaf.shape[1:],
+                                          title=leaf.title, filters=filters,
+                                          expectedrows=leaf.nrows,
+                                          chunkshape=leaf.chunkshape)
+    else:
+        new_leaf = ptcompat.create_carray(new_file, where=new_group, name=name,
+                                          atom=leaf.atom, shape=leaf.shape,
+                                          title=leaf.title, filters=filters,
+                                          chunkshape=leaf.chunkshape)
+    leaf._v_attrs._f_copy(new_leaf)
+
+    rows_per_block = max(BLOCK_SIZE // max(leaf.rowsize, 1), 1)
+    blocks = [(leaf._v_pathname, start, min(start + rows_per_block, leaf.nrows))
+              for start in range(0, leaf.nrows, rows_per_block)]
+    # Blocks are returned in order, so tables and earrays can simply be appended to
+    for start, data in pool.imap(_read_block, blocks):
+        if type(new_leaf) is pt.CArray:
+            new_leaf[start:start + len(data)] = data
+        else:
+            new_leaf.append(data)
+    new_leaf.flush()
+    return new_leaf
+
+
+def _copy_children(group, new_group, filters, pool, ncores, blobs, stats):
+    """Recursively copies all children of `group` into `new_group`"""
+    new_file = new_group._v_file
+    for node in ptcompat.iter_nodes(group):
+        name = node._v_name
+        if isinstance(node, pt.link.SoftLink):
+            ptcompat.create_soft_link(new_file, where=new_group, name=name, target=node.target)
+        elif isinstance(node, pt.link.ExternalLink):
+            new_file.create_external_link(new_group, name, node.target)
+        elif isinstance(node, pt.Group):
+            new_child = ptcompat.create_group(new_file, where=new_group, name=name,
+                                              title=node._v_title)
+            node._v_attrs._f_copy(new_child)
+            _copy_children(node, new_child, filters, pool, ncores, blobs, stats)
+        else:
+            # Pickle dumps in the blob store are hard linked, they are only copied once
+            blob_hash = getattr(node._v_attrs, HDF5StorageService.BLOB_HASH, None)
+            if blob_hash is not None and blob_hash in blobs:
+                ptcompat.create_hard_link(new_file, new_group, name, blobs[blob_hash])
+                continue
+            if _is_parallel_leaf(node, ncores):
+                new_leaf = _copy_parallel(node, new_group, filters, pool)
+            else:
+                new_leaf = node._f_copy(newparent=new_group, newname=name, filters=filters)
+            if blob_hash is not None:
+                blobs[blob_hash] = new_leaf
+            stats['bytes'] += node.size_in_memory
+            stats['leaves'] += 1
+
+
+def compact_hdf5_file(filename, name=None, index=None, keep_backup=True, complib=None,
+                      complevel=None, shuffle=None, fletcher32=None, ncores=1):
     """Can compress an HDF5 to reduce file size.
 
-    The properties on how to compress the new file are taken from a given
-    trajectory in the file.
-    Simply calls ``ptrepack`` from the command line.
-    (Se also https://pytables.github.io/usersguide/utilities.html#ptrepackdescr)
+    All nodes are copied into a new file that replaces the old one. Accordingly,
+    space of deleted nodes is freed. Unless specified otherwise, the properties on how to
+    compress the new file are taken from a given trajectory in the file.
+
+    With `ncores > 1` large arrays and tables are read and decompressed by a pool of
+    processes in parallel while the main process writes the data into the new file.
+    If the new file is compressed with *blosc*, blosc compresses with `ncores` threads, too.
 
     Currently only supported under Linux, no guarantee for Windows usage.
 
@@ -37,9 +148,29 @@ def compact_hdf5_file(filename, name=None, index=None, keep_backup=True):
         If a back up version of the original file should be kept.
         The backup file is named as the original but `_backup` is appended to the end.
 
+    :param complib:
+
+        Compression library of the new file, `None` to use the one of the trajectory
+
+    :param complevel:
+
+        Compression level of the new file, `None` to use the one of the trajectory
+
+    :param shuffle:
+
+        If the new file uses shuffling, `None` to use the setting of the trajectory
+
+    :param fletcher32:
+
+        If the new file uses checksums, `None` to use the setting of the trajectory
+
+    :param ncores:
+
+        Number of processes reading the old file
+
     :return:
 
-        The return/error code of ptrepack
+        0 if compacting was successful, 1 otherwise
 
     """
     if name is None and index is None:
@@ -48,32 +179,54 @@ def compact_hdf5_file(filename, name=None, index=None, keep_backup=True):
     tmp_traj = load_trajectory(name, index, as_new=False, load_all=pypetconstants.LOAD_NOTHING,
                                force=True, filename=filename)
     service = tmp_traj.v_storage_service
-    complevel = service.complevel
-    complib = service.complib
-    shuffle = service.shuffle
-    fletcher32 = service.fletcher32
+    filters = pt.Filters(complib=service.complib if complib is None else complib,
+                         complevel=service.complevel if complevel is None else complevel,
+                         shuffle=service.shuffle if shuffle is None else shuffle,
+                         fletcher32=service.fletcher32 if fletcher32 is None else fletcher32)
 
     name_wo_ext, ext = os.path.splitext(filename)
     tmp_filename = name_wo_ext + '_tmp' + ext
 
-    abs_filename = os.path.abspath(filename)
-    abs_tmp_filename = os.path.abspath(tmp_filename)
-
-    command = ['ptrepack', '-v',
-               '--complib', complib,
-               '--complevel', str(complevel),
-               '--shuffle', str(int(shuffle)),
-               '--fletcher32', str(int(fletcher32)),
-               abs_filename, abs_tmp_filename]
-    str_command = ' '.join(command)
-    print('Executing command `%s`' % str_command)
+    print('Compacting `%s` with %s' % (filename, str(filters)))
+
+    pool = None
+    old_blosc_threads = None
+    retcode = 0
+    start_time = time.time()
+    stats = dict(bytes=0, leaves=0)
+    try:
+        if ncores > 1:
+            # The pool is created first so no file handles are inherited by the readers
+            pool = multip.Pool(ncores, initializer=_open_reader_file,
+                               initargs=(os.path.abspath(filename),))
+            if filters.complib.startswith('blosc'):
+                old_blosc_threads = pt.set_blosc_max_threads(ncores)
+        with ptcompat.open_file(filename, mode='r') as old_file:
+            with ptcompat.open_file(tmp_filename, mode='w', title=old_file.title,
+                                    filters=filters) as new_file:
+                old_file.root._v_attrs._f_copy(new_file.root)
+                _copy_children(old_file.root, new_file.root, filters, pool, ncores,
+                               {}, stats)
+    except Exception:
+        traceback.print_exc()
+        retcode = 1
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+        if old_blosc_threads is not None:
+            pt.set_blosc_max_threads(old_blosc_threads)
 
-    retcode = subprocess.call(command)
     if retcode != 0:
-        print('#### ERROR: Compacting `%s` failed with errorcode %s! ####' %
-              (filename, str(retcode)))
+        print('#### ERROR: Compacting `%s` failed! ####' % filename)
+        if os.path.exists(tmp_filename):
+            os.remove(tmp_filename)
     else:
-        print('#### Compacting successful ####')
+        runtime = max(time.time() - start_time, 1e-9)
+        megabytes = stats['bytes'] / 1e6
+        print('#### Compacting successful, copied %d leaves with %.1f MB '
+              'in %.1fs (%.1f MB/s) ####' % (stats['leaves'], megabytes, runtime,
+                                              megabytes / runtime))
         print('Renaming files')
         if keep_backup:
             backup_file_name = name_wo_ext + '_backup' + ext
@@ -83,4 +236,4 @@ def compact_hdf5_file(filename, name=None, index=None, keep_backup=True):
         os.rename(tmp_filename, filename)
         print('### Compacting and Renaming finished ####')
 
-    return retcode
\ No newline at end of file
+    return retcode
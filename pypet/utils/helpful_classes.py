@@ -1,5 +1,9 @@
 __author__ = 'Robert Meyer'
 
+import os
+import time
+import struct
+import zlib
 import numpy as np
 import itertools as itools
 import hashlib
@@ -94,6 +98,29 @@ class ChainMap(object):
         return itools.chain(*iter_list)
 
 
+class EmptyDict(dict):
+    """Empty and read-only dictionary.
+
+    A single instance (`EMPTY_DICT`) is shared by all objects that
+    would otherwise carry an empty dictionary. Writing raises a TypeError, so users
+    need to replace the shared instance by a new dictionary first.
+
+    """
+    __slots__ = ()
+
+    def _read_only(self, *args, **kwargs):
+        raise TypeError('The shared empty dictionary cannot be changed.')
+
+    __setitem__ = __delitem__ = setdefault = update = pop = popitem = clear = _read_only
+
+    def __reduce__(self):
+        # Pickling and copying return the shared instance
+        return 'EMPTY_DICT'
+
+
+EMPTY_DICT = EmptyDict()
+
+
 class HashArray(object):
     """Hashable wrapper for numpy arrays"""
 
@@ -113,7 +140,9 @@ class HashArray(object):
             return False
 
     def __hash__(self):
-        return int(hashlib.sha1(self._ndarray.view(np.uint8)).hexdigest(), 16)
+        # Non contiguous arrays, like slices, cannot be viewed as a byte buffer
+        data = np.ascontiguousarray(self._ndarray)
+        return int(hashlib.sha1(data.view(np.uint8)).hexdigest(), 16)
 
 
 class TrajectoryMock(object):
@@ -130,3 +159,72 @@ class TrajectoryMock(object):
         self.v_crun_ = traj.v_crun_
         self.v_crun = traj.v_crun
         self.v_idx = traj.v_idx
+
+
+class Journal(object):
+    """Append-only file of length-prefixed binary records.
+
+    Every record is preceded by a magic number, its length, and crc32 checksum.
+    Records are flushed after every append and synced to disk at most every
+    `fsync_interval` seconds and on closing.
+
+    Reading stops at a torn tail, i.e. an incomplete or corrupted last record
+    left by a crash, and the tail is cut off so new records can be appended.
+    The magic number tells records apart from a zero-filled tail, which some
+    file systems leave behind after a crash.
+
+    """
+    MAGIC = b'PJRN'
+    HEADER = struct.Struct('<4sQI')
+
+    def __init__(self, filename, fsync_interval=1.0):
+        self.filename = filename
+        self.fsync_interval = fsync_interval
+        self._file = None
+        self._last_sync = None
+
+    def __iter__(self):
+        """Streams all complete records in order of appending"""
+        if not os.path.isfile(self.filename):
+            return
+        valid_size = 0
+        with open(self.filename, 'rb') as journal_file:
+            file_size = os.fstat(journal_file.fileno()).st_size
+            while True:
+                header = journal_file.read(self.HEADER.size)
+                if len(header) < self.HEADER.size:
+                    break
+                magic, length, checksum = self.HEADER.unpack(header)
+                # A corrupted length must not make us read more than the whole file
+                if magic != self.MAGIC or length > file_size - journal_file.tell():
+                    break
+                record = journal_file.read(length)
+                if len(record) < length or zlib.crc32(record) & 0xffffffff != checksum:
+                    break
+                valid_size += self.HEADER.size + length
+                yield record
+            torn = journal_file.tell() != valid_size or journal_file.read(1)
+        if torn:
+            with open(self.filename, 'r+b') as journal_file:
+                journal_file.truncate(valid_size)
+
+    def append(self, record):
+        """Appends a `record` of bytes"""
+        if self._file is None:
+            self._file = open(self.filename, 'ab')
+            self._last_sync = time.time()
+        self._file.write(self.HEADER.pack(self.MAGIC, len(record),
+                                          zlib.crc32(record) & 0xffffffff))
+        self._file.write(record)
+        self._file.flush()
+        if time.time() - self._last_sync >= self.fsync_interval:
+            os.fsync(self._file.fileno())
+            self._last_sync = time.time()
+
+    def close(self):
+        """Syncs and closes the journal"""
+        if self._file is not None:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._file.close()
+            self._file = None
@@ -5,7 +5,10 @@ __author__ = 'Robert Meyer'
 import sys
 import os
 import datetime
+import hashlib
+import pickle
 import numpy as np
+import scipy.sparse as spsp
 import inspect
 import logging
 import socket
@@ -17,6 +20,7 @@ except ImportError:
 import pypet.compat as compat
 from pypet.utils.decorators import deprecated
 from pypet.utils.comparisons import nested_equal as nested_equal_new
+from pypet.utils.helpful_classes import HashArray
 
 
 def is_debug():
@@ -304,6 +308,135 @@ def result_sort(result_list, start_index=0):
     return result_list
 
 
+def make_hashable(value, canonical=False):
+    """Returns a hashable key representing `value`.
+
+    Numpy arrays and matrices are represented by their shape, dtype and a
+    :class:`~pypet.utils.helpful_classes.HashArray` of their data. Scipy sparse matrices
+    are represented by their format, shape, and underlying arrays.
+    Lists and tuples are converted recursively into tuples.
+    All other data is returned unchanged. Accordingly, hashing the result raises
+    a TypeError if `value` contains other unhashable data.
+
+    :param canonical:
+
+        If values that are considered equal by
+        :func:`~pypet.utils.comparisons.nested_equal` should always share the same key.
+        In this case numeric arrays are compared regardless of their dtype and
+        negative zeros are replaced by positive ones. Sparse matrices are compared regardless
+        of their format and explicitly stored zeros. Different values may still share a key.
+
+    """
+    if isinstance(value, np.ndarray):
+        if value.dtype.hasobject:
+            # The buffer of object arrays contains only pointers
+            return (value.shape,) + tuple(make_hashable(x, canonical) for x in value.ravel())
+        if canonical:
+            value = np.asarray(value)
+            if value.dtype.kind in 'biuf':
+                # Adding zero turns negative into positive zeros
+                return (value.shape, HashArray(value.astype(np.float64) + 0.0))
+            elif value.dtype.kind == 'c':
+                return (value.shape, HashArray(value.astype(np.complex128) + 0.0))
+        return (value.shape, value.dtype.str, HashArray(value))
+    elif spsp.issparse(value):
+        if canonical:
+            csr = value.tocsr(copy=True)
+            csr.eliminate_zeros()
+            csr.sum_duplicates()
+            if csr.nnz == 0:
+                # All empty matrices are considered equal
+                return ('sparse',)
+            arrays = (csr.data, csr.indices, csr.indptr)
+            return (('sparse', csr.shape) +
+                    tuple(make_hashable(x, canonical) for x in arrays))
+        if value.format == 'dia':
+            arrays = (value.data, value.offsets)
+        elif value.format in ('csr', 'csc', 'bsr'):
+            arrays = (value.data, value.indices, value.indptr)
+        else:
+            csr = value.tocsr()
+            arrays = (csr.data, csr.indices, csr.indptr)
+        return (value.format, value.shape) + tuple(make_hashable(x) for x in arrays)
+    elif isinstance(value, (list, tuple)):
+        return tuple(make_hashable(x, canonical) for x in value)
+    else:
+        return value
+
+
+def make_digest(value):
+    """Returns a SHA-1 hex digest of `value` that is stable across processes and sessions.
+
+    In contrast to hashing the result of :func:`~pypet.utils.helpful_functions.make_hashable`,
+    the digest does not depend on the hash randomization of python.
+    Numpy arrays are digested via their shape, dtype, and data, sparse matrices via
+    their format, shape, and underlying arrays. Lists, tuples, dictionaries, and sets
+    are digested recursively, items of dictionaries and sets in the order of their
+    digests. Python and numpy scalars are digested via their type and value,
+    all other data via a pickle dump.
+
+    :raises: TypeError if `value` contains data that cannot be pickled
+
+    """
+    sha = hashlib.sha1()
+    _update_digest(sha, value)
+    return sha.hexdigest()
+
+
+_DIGEST_SCALAR_TYPES = frozenset([type(None), bool, int, compat.long_type, float, complex,
+                                  compat.unicode_type, compat.bytes_type])
+
+
+def _update_digest(sha, value):
+    """Recursively feeds `value` into `sha`"""
+    value_type = type(value)
+    if value_type in _DIGEST_SCALAR_TYPES:
+        # The representation of these types is exact
+        sha.update(compat.tobytes('%s:%r;' % (value_type.__name__, value)))
+    elif isinstance(value, (np.ndarray, np.generic)):
+        array = np.asarray(value)
+        sha.update(compat.tobytes('%s:%r:%s(' % (value_type.__name__, array.shape,
+                                                 array.dtype.str)))
+        if array.dtype.hasobject:
+            # The buffer of object arrays contains only pointers
+            for item in array.ravel():
+                _update_digest(sha, item)
+        else:
+            sha.update(np.ascontiguousarray(array).view(np.uint8))
+        sha.update(b')')
+    elif spsp.issparse(value):
+        _update_digest(sha, ('sparse', value.format, value.shape))
+        if value.format == 'dia':
+            arrays = (value.data, value.offsets)
+        elif value.format in ('csr', 'csc', 'bsr'):
+            arrays = (value.data, value.indices, value.indptr)
+        else:
+            csr = value.tocsr()
+            arrays = (csr.data, csr.indices, csr.indptr)
+        for array in arrays:
+            _update_digest(sha, array)
+    elif value_type in (list, tuple):
+        sha.update(compat.tobytes('%s(' % value_type.__name__))
+        for item in value:
+            _update_digest(sha, item)
+        sha.update(b')')
+    elif value_type in (dict, set, frozenset):
+        if value_type is dict:
+            items = [make_digest((key, item)) for key, item in value.items()]
+        else:
+            items = [make_digest(item) for item in value]
+        sha.update(compat.tobytes('%s(%s)' % (value_type.__name__, ','.join(sorted(items)))))
+    else:
+        try:
+            dump = pickle.dumps(value, protocol=2)
+        except Exception as exc:
+            raise TypeError('Cannot digest `%s` of type `%s`, it cannot be pickled: %s' %
+                            (repr(value), value_type.__name__, repr(exc)))
+        sha.update(compat.tobytes('%s:%d(' % (value_type.__name__, len(dump))))
+        sha.update(dump)
+        sha.update(b')')
+
+
 def format_time(timestamp):
     """Formats timestamp to human readable format"""
     format_string = '%Y_%m_%d_%Hh%Mm%Ss'
@@ -30,6 +30,7 @@ import os
 import socket
 
 import pypet.pypetconstants as pypetconstants
+import pypet.naturalnaming as nn
 from pypet.pypetlogging import HasLogger
 from pypet.utils.decorators import retry
 
@@ -703,6 +704,105 @@ class QueueStorageServiceSender(MultiprocWrapper, HasLogger):
         self._put_on_queue(('DONE', [], {}))
 
 
+class ThreadQueueStorageServiceSender(QueueStorageServiceSender):
+    """ For asynchronous storage within a single process, replaces the original
+        storage service.
+
+        The data to store is put on a queue that is handled by a
+        :class:`~pypet.utils.mpwrappers.QueueStorageServiceWriter` running in a background
+        thread. Accordingly, storing returns immediately.
+        If the queue is full storing blocks until the writer caught up.
+
+        Single runs do not hand over a copy of the trajectory but only references
+        to the nodes and links they added, which are stored as a list of items.
+        Hence, these must not be changed after storing.
+        Everything else is shallow copied before it is put on the queue.
+
+        Does not support loading of data!
+
+    """
+
+    def __init__(self, storage_service, queue_maxsize=0, gc_interval=None):
+        super(ThreadQueueStorageServiceSender, self).__init__(
+            queue.Queue(maxsize=queue_maxsize))
+        self._writer = QueueStorageServiceWriter(storage_service, self.queue, gc_interval)
+        self._thread = None
+        self._link_targets = set()  # Full names of unstored link targets put on the queue
+
+    def start(self):
+        """Starts the writer thread"""
+        self._thread = Thread(name='StorageThread', target=self._writer.run)
+        self._thread.daemon = True
+        self._thread.start()
+
+    def store(self, msg, stuff_to_store, *args, **kwargs):
+        """Puts the data to store on the queue"""
+        if msg == pypetconstants.SINGLE_RUN:
+            item_list = self._make_single_run_list(stuff_to_store, **kwargs)
+            self._put_on_queue(('STORE', (pypetconstants.LIST, item_list),
+                                {'trajectory_name': kwargs['trajectory_name']}))
+        else:
+            self._put_on_queue(('STORE', (msg, cp.copy(stuff_to_store)) + args, kwargs))
+
+    def _make_single_run_list(self, traj, trajectory_name, recursive=True,
+                              store_data=pypetconstants.STORE_DATA, max_depth=None):
+        """Turns the nodes and links added during a single run into a list of items to store.
+
+        The items refer to the nodes by their full names and not via the trajectory tree.
+        Thus, the tree can be cleaned up after the run while the items wait on the queue.
+
+        """
+        item_list = []
+        if store_data == pypetconstants.STORE_NOTHING:
+            return item_list
+        if max_depth is None:
+            max_depth = float('inf')
+        # New nodes are registered top-down, so parents are stored before their children
+        for parent_group, child_node in traj._new_nodes.values():
+            if child_node._stored or child_node.v_depth >= max_depth:
+                continue
+            if child_node.v_is_leaf:
+                item_list.append((pypetconstants.LEAF, child_node, (),
+                                  {'store_data': store_data}))
+            else:
+                item_list.append((pypetconstants.GROUP, child_node, (),
+                                  {'store_data': store_data, 'recursive': False}))
+        for name_pair in traj._new_links:
+            _, link = name_pair
+            parent_group, _ = traj._new_links[name_pair]
+            linked_node = parent_group._links[link]
+            if (not linked_node._stored and
+                    linked_node.v_full_name not in self._link_targets and
+                    (linked_node.v_location, linked_node.v_name) not in traj._new_nodes):
+                # The storage service needs the linked node on disk. Otherwise, it would
+                # store it from the trajectory tree which has changed in the meantime.
+                self._link_targets.add(linked_node.v_full_name)
+                if linked_node.v_is_leaf:
+                    item_list.append((pypetconstants.LEAF, cp.copy(linked_node), (),
+                                      {'store_data': pypetconstants.STORE_DATA_SKIPPING}))
+                else:
+                    item_list.append((pypetconstants.GROUP, linked_node, (),
+                                      {'store_data': pypetconstants.STORE_DATA_SKIPPING,
+                                       'recursive': False}))
+            # Links are removed from their parents after the run, so we hand over
+            # a detached group with the single link instead
+            link_group = nn.NNGroupNode(full_name=parent_group.v_full_name, trajectory=traj)
+            link_group._links = {link: linked_node}
+            item_list.append((pypetconstants.TREE, link_group, (link,),
+                              {'store_data': store_data,
+                               'with_links': True,
+                               'recursive': recursive,
+                               'max_depth': max_depth - parent_group.v_depth - 1}))
+        return item_list
+
+    def finalize(self):
+        """Waits until all data on the queue is stored and stops the writer thread"""
+        if self._thread is not None:
+            self.send_done()
+            self._thread.join()
+            self._thread = None
+
+
 class LockAcquisition(HasLogger):
     """Abstract class to allow lock acquisition and release.
 
@@ -137,6 +137,9 @@ if tables_version == 2:
     def create_soft_link(hdf5_file, *args, **kwargs): return hdf5_file.createSoftLink(*args,
                                                                                       **kwargs)
 
+    def create_hard_link(hdf5_file, *args, **kwargs): return hdf5_file.createHardLink(*args,
+                                                                                      **kwargs)
+
     def get_child(hdf5_node, *args, **kwargs): return hdf5_node._f_getChild(*args, **kwargs)
 
     def remove_rows(table, *args, **kwargs): return table.removeRows(*args, **kwargs)
@@ -175,6 +178,9 @@ elif tables_version == 3:
     def create_soft_link(hdf5_file, *args, **kwargs): return hdf5_file.create_soft_link(*args,
                                                                                      **kwargs)
 
+    def create_hard_link(hdf5_file, *args, **kwargs): return hdf5_file.create_hard_link(*args,
+                                                                                     **kwargs)
+
     def get_child(hdf5_node, *args, **kwargs): return hdf5_node._f_get_child(*args, **kwargs)
 
     def remove_rows(table, *args, **kwargs): return table.remove_rows(*args, **kwargs)
@@ -192,3 +198,44 @@ elif tables_version == 3:
 else:
     raise RuntimeError('You shall not pass! Your PyTables version is weird!')
 
+
+_H5DGET_OFFSET = []  # lazily resolved HDF5 C function, empty if not yet looked up
+HADDR_UNDEF = 2 ** 64 - 1
+
+
+def _get_h5dget_offset():
+    if not _H5DGET_OFFSET:
+        try:
+            import ctypes
+            import tables.hdf5extension
+            lib = ctypes.CDLL(tables.hdf5extension.__file__)
+            func = lib.H5Dget_offset
+            major, minor = [int(x) for x in hdf5_version.split('.')[:2]]
+            # Object ids became 64 bit wide with HDF5 1.10
+            hid_t = ctypes.c_int64 if (major, minor) >= (1, 10) else ctypes.c_int
+            func.argtypes = [hid_t]
+            func.restype = ctypes.c_uint64
+        except (ImportError, OSError, AttributeError, ValueError):
+            func = None
+        _H5DGET_OFFSET.append(func)
+    return _H5DGET_OFFSET[0]
+
+
+def get_data_offset(array):
+    """Returns the byte offset of the raw data of `array` within its file.
+
+    Returns `None` if the data is not stored contiguously (e.g. chunked or compressed)
+    or the offset cannot be determined with the present HDF5 library.
+
+    """
+    func = _get_h5dget_offset()
+    if func is None:
+        return None
+    try:
+        offset = func(get_objectid(array))
+    except Exception:
+        return None
+    if offset == HADDR_UNDEF:
+        return None
+    return int(offset)
+
@@ -0,0 +1,108 @@
+"""Module containing persistent caches of single runs shared among trajectories.
+
+A cache maps keys, i.e. SHA-1 digests of the parameter values of a run and a code version,
+to the pickled data computed by the run. Use :func:`~pypet.utils.runcache.make_run_cache`
+to create a cache from a path.
+
+"""
+
+__author__ = 'Robert Meyer'
+
+import os
+import sqlite3
+import tempfile
+
+
+SQLITE_EXTENSIONS = ('.db', '.sqlite', '.sqlite3')
+
+
+class DirectoryRunCache(object):
+    """Run cache storing every run in a separate file within a directory.
+
+    Files are written to a temporary file first and renamed afterwards.
+    Accordingly, several processes can safely add runs at the same time.
+
+    """
+    def __init__(self, path):
+        self.path = path
+
+    def get(self, key):
+        """Returns the data of the run with `key` or `None` if the run is not cached"""
+        try:
+            with open(os.path.join(self.path, key), 'rb') as cache_file:
+                return cache_file.read()
+        except IOError:
+            return None
+
+    def put(self, key, data):
+        """Adds `data` of the run with `key` to the cache"""
+        if not os.path.isdir(self.path):
+            try:
+                os.makedirs(self.path)
+            except OSError:
+                # Another process might have created the directory in the meantime
+                if not os.path.isdir(self.path):
+                    raise
+        fd, tmp_filename = tempfile.mkstemp(dir=self.path, suffix='.tmp')
+        with os.fdopen(fd, 'wb') as cache_file:
+            cache_file.write(data)
+        os.rename(tmp_filename, os.path.join(self.path, key))
+
+
+class SQLiteRunCache(object):
+    """Run cache storing all runs in a single SQLite file.
+
+    The connection is opened lazily and not pickled, so the cache can be
+    passed to other processes.
+
+    """
+    def __init__(self, path, timeout=60.0):
+        self.path = path
+        self.timeout = timeout
+        self._connection = None
+
+    def __getstate__(self):
+        result = self.__dict__.copy()
+        result['_connection'] = None
+        return result
+
+    def _connect(self):
+        if self._connection is None:
+            self._connection = sqlite3.connect(self.path, timeout=self.timeout)
+            self._connection.execute('CREATE TABLE IF NOT EXISTS runs '
+                                     '(key TEXT PRIMARY KEY, data BLOB)')
+            self._connection.commit()
+        return self._connection
+
+    def get(self, key):
+        """Returns the data of the run with `key` or `None` if the run is not cached"""
+        row = self._connect().execute('SELECT data FROM runs WHERE key = ?',
+                                      (key,)).fetchone()
+        if row is None:
+            return None
+        return bytes(row[0])
+
+    def put(self, key, data):
+        """Adds `data` of the run with `key` to the cache"""
+        connection = self._connect()
+        connection.execute('INSERT OR REPLACE INTO runs (key, data) VALUES (?, ?)',
+                           (key, sqlite3.Binary(data)))
+        connection.commit()
+
+    def close(self):
+        """Closes the connection to the database"""
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+
+def make_run_cache(path):
+    """Creates a run cache from `path`.
+
+    Paths ending with `.db`, `.sqlite`, or `.sqlite3` are considered to be SQLite files,
+    all other paths are used as directories.
+
+    """
+    if os.path.splitext(path)[1] in SQLITE_EXTENSIONS:
+        return SQLiteRunCache(path)
+    return DirectoryRunCache(path)